@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import (auth, admin, appointments, consultations, transactions, reviews, notifications, patients, doctors, medications, permissions, ai, symptoms, allergies, calories)
+from app.api.v1.endpoints import (auth, admin, appointments, consultations, transactions, reviews, notifications, patients, doctors, medications, permissions, ai, hospitals, symptoms, allergies, calories)
 
 api_router = APIRouter()
 api_router.include_router(auth.router, tags=["auth"])
@@ -24,6 +24,7 @@ api_router.include_router(notifications.router, prefix="/notifications", tags=["
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
 api_router.include_router(patients.router, prefix="/patients", tags=["patients"])
 api_router.include_router(doctors.router, prefix="/doctors", tags=["doctors"])
+api_router.include_router(hospitals.router, prefix="/hospitals", tags=["hospitals"])
 api_router.include_router(medications.router, prefix="/medications", tags=["medications"])
 api_router.include_router(symptoms.router, prefix="/symptoms", tags=["symptoms"])
 api_router.include_router(allergies.router, prefix="/allergies", tags=["allergies"])
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Query, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Literal
+import asyncio
 import io
-import pandas as pd
+import time
 from fastapi.responses import StreamingResponse
 
 from app.api.v1 import deps
@@ -12,28 +13,56 @@ from app.schemas.hospital import Hospital, HospitalCreate, HospitalUpdate
 from app.schemas.doctor import DoctorWithVerificationInfo
 from app.schemas.user import User, UserUpdate
 from app.schemas.medication import Medication, MedicationCreate, MedicationUpdate
-from app.schemas.notification import NotificationBroadcast, NotificationCreate
+from app.schemas.notification import NotificationBroadcast, Broadcast
+from app.schemas.import_job import ImportJob, ImportJobCreate
+from app.crud.crud_base import CountMode
 from app.crud.crud_user import crud_user
 from app.crud.crud_hospital import crud_hospital
+from app.crud.crud_import_job import crud_import_job
 from app.crud.crud_medication import crud_medication
-from app.crud.crud_notification import crud_notification
+from app.crud.crud_broadcast import crud_broadcast
 from app.crud.crud_transaction import crud_transaction
 from app.crud.crud_doctor import crud_doctor
 from app.crud.crud_doctor_verification_document import crud_doctor_verification_document
 from app.core.security import get_current_active_admin
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.config import get_settings
+from app.core.profiler import MAX_PROFILE_SECONDS, MIN_INTERVAL_SECONDS, ProfilerBusy, profiler
+from app.db.session import run_in_session
+from app.db.slow_queries import slow_query_log
+from app import hospital_import, exports
+from app.hospital_directory import hospital_directory
+
+settings = get_settings()
 
 router = APIRouter()
 
 @router.get("/hospitals", response_model=StandardResponse[List[Hospital]])
 async def get_hospitals(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    department: Optional[str] = None,
+    status: Optional[str] = None,
+    name: Optional[str] = Query(None, description="Case-insensitive name prefix."),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
-    Retrieve a list of hospitals.
-    """
-    hospitals = await crud_hospital.get_multi(db, skip=skip, limit=limit)
+    Retrieve a list of hospitals, optionally filtered by department, status and name prefix.
+    Served from the in-memory hospital directory; the ETag changes whenever it is rebuilt.
+    """
+    snapshot = hospital_directory.current()
+    if snapshot is None:
+        hospitals = await crud_hospital.get_multi_filtered(
+            db, department=department, status=status, name_prefix=name, skip=skip, limit=limit
+        )
+        return StandardResponse(data=hospitals)
+    etag = f'W/"hospitals-{snapshot.version}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    hospitals = snapshot.filter(department=department, status=status, name_prefix=name, skip=skip, limit=limit)
     return StandardResponse(data=hospitals)
 
 @router.post("/hospitals", response_model=StandardResponse[Hospital])
@@ -46,6 +75,7 @@ async def create_hospital(
     Create a new hospital.
     """
     hospital = await crud_hospital.create(db, obj_in=hospital_in)
+    await hospital_directory.refresh()
     return StandardResponse(data=hospital, message="Hospital created successfully")
 
 @router.put("/hospitals/{hospital_id}", response_model=StandardResponse[Hospital])
@@ -62,6 +92,7 @@ async def update_hospital(
     if not hospital:
         raise HTTPException(status_code=404, detail="Hospital not found")
     hospital = await crud_hospital.update(db, db_obj=hospital, obj_in=hospital_in)
+    await hospital_directory.refresh()
     return StandardResponse(data=hospital, message="Hospital updated successfully")
 
 @router.delete("/hospitals/{hospital_id}", response_model=StandardResponse[Hospital])
@@ -77,6 +108,7 @@ async def delete_hospital(
     if not hospital:
         raise HTTPException(status_code=404, detail="Hospital not found")
     hospital = await crud_hospital.remove(db, id=hospital_id)
+    await hospital_directory.refresh()
     return StandardResponse(data=hospital, message="Hospital deleted successfully")
 
 @router.get("/unverified-doctors", response_model=StandardResponse[List[DoctorWithVerificationInfo]])
@@ -117,19 +149,18 @@ async def verify_doctor(
 
 @router.get("/users", response_model=StandardResponse[Any])
 async def get_users(search: Optional[str] = None, role: Optional[str] = None, page: int = 1, size: int = 10,
-                    db: AsyncSession = Depends(deps.get_db),
+                    count_mode: CountMode = "exact", db: AsyncSession = Depends(deps.get_db),
                     current_user=Depends(get_current_active_admin)):
     """
     Retrieves a paginated list of all users, with filtering.
+    `search` matches email, full name and phone (substring, prefix or fuzzy), best matches first.
+    `count_mode` trades the accuracy of `total` for speed: `exact`, `estimated` or `none`.
     """
     skip = (page - 1) * size
-    if role:
-        users = await crud_user.get_users_by_role(db, role=role, skip=skip, limit=size)
-    else:
-        users = await crud_user.get_all_users(db, email=search, skip=skip, limit=size)
-
-    total_users = await crud_user.count(db)
-    data = {"total": total_users, "page": page, "size": size, "users": users}
+    search = search.strip() if search else None
+    users = await crud_user.search_users(db, search=search, role=role, skip=skip, limit=size)
+    total_users = await crud_user.count_users(db, search=search, role=role, count_mode=count_mode)
+    data = {"total": total_users, "count_mode": count_mode, "page": page, "size": size, "users": users}
     return StandardResponse(data=data, message="Users retrieved successfully.")
 
 
@@ -159,55 +190,63 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(deps.get_db),
     await crud_user.remove(db, id=user_id)
     return StandardResponse(message="User deleted successfully.")
 
-@router.post("/hospitals/import", response_model=StandardResponse[Any])
-async def import_hospitals(file: UploadFile = File(...), db: AsyncSession = Depends(deps.get_db),
+@router.post("/hospitals/import", response_model=StandardResponse[ImportJob])
+async def import_hospitals(background_tasks: BackgroundTasks, file: UploadFile = File(...),
+                           db: AsyncSession = Depends(deps.get_db),
                            current_user=Depends(get_current_active_admin)):
     """
     Handles multipart/form-data upload of a CSV/Excel file to bulk-add hospitals.
+    Returns immediately with an import id; parsing and validation run in a process pool.
+    Poll `/imports/{import_id}` for progress. Valid rows are loaded even when other rows fail,
+    and rows whose name and address already exist are skipped.
     """
+    if not file.filename.endswith(('.csv', '.xls', '.xlsx')):
+        return StandardResponse(success=False, message="Invalid file format. Please upload a CSV or Excel file.")
     contents = await file.read()
-    file_like_object = io.BytesIO(contents)
+    job = await crud_import_job.create(
+        db, obj_in=ImportJobCreate(kind="hospitals", filename=file.filename, created_by=current_user.id)
+    )
+    background_tasks.add_task(hospital_import.run_hospital_import, job.id, contents)
+    return StandardResponse(data=job, message="Hospital import started.")
 
-    try:
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(file_like_object)
-        elif file.filename.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(file_like_object)
-        else:
-            return StandardResponse(success=False, message="Invalid file format. Please upload a CSV or Excel file.")
-
-        hospitals_to_create = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            if 'departments' in row_dict:
-                departments = row_dict['departments']
-                if isinstance(departments, str):
-                    pass
-                elif isinstance(departments, list):
-                    row_dict['departments'] = ",".join(departments)
-            hospitals_to_create.append(HospitalCreate(**row_dict))
-
-        for hospital in hospitals_to_create:
-            await crud_hospital.create(db, obj_in=hospital)
-
-        return StandardResponse(data={"imported_count": len(hospitals_to_create)},
-                                message="Hospitals imported successfully.")
-
-    except Exception as e:
-        return StandardResponse(success=False, message=f"An error occurred during file processing: {e}")
+
+@router.get("/imports/{import_id}", response_model=StandardResponse[ImportJob])
+async def get_import_status(import_id: str, db: AsyncSession = Depends(deps.get_db),
+                            current_user=Depends(get_current_active_admin)):
+    """
+    Reports the status and progress of an import.
+    """
+    job = await crud_import_job.get(db, id=import_id)
+    if not job:
+        return StandardResponse(success=False, message="Import not found")
+    return StandardResponse(data=job, message="Import status retrieved successfully.")
+
+
+@router.get("/imports/{import_id}/errors")
+async def download_import_errors(import_id: str, db: AsyncSession = Depends(deps.get_db),
+                                 current_user=Depends(get_current_active_admin)):
+    """
+    Downloads the per-row error report of an import as CSV.
+    """
+    job = await crud_import_job.get(db, id=import_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    output = io.StringIO(job.error_report or "row,field,error\n")
+    return StreamingResponse(output, media_type="text/csv",
+                             headers={"Content-Disposition": f"attachment; filename=import_{import_id}_errors.csv"})
 
 
 @router.get("/medications", response_model=StandardResponse[Any])
 async def get_medications(search: Optional[str] = None, page: int = 1, size: int = 10,
-                          db: AsyncSession = Depends(deps.get_db),
+                          count_mode: CountMode = "exact", db: AsyncSession = Depends(deps.get_db),
                           current_user=Depends(get_current_active_admin)):
     """
     Lists all medications with pagination and search.
     """
     skip = (page - 1) * size
     medications = await crud_medication.get_multi(db, skip=skip, limit=size)
-    total_medications = await crud_medication.count(db)
-    data = {"total": total_medications, "page": page, "size": size, "medications": medications}
+    total_medications = await crud_medication.count(db, count_mode=count_mode)
+    data = {"total": total_medications, "count_mode": count_mode, "page": page, "size": size, "medications": medications}
     return StandardResponse(data=data, message="Medications retrieved successfully.")
 
 
@@ -240,7 +279,7 @@ async def delete_medication(medication_id: int, db: AsyncSession = Depends(deps.
     """
     Deletes a medication entry.
     """
-    medication = await crud_medication.get(db, id=.medication_id)
+    medication = await crud_medication.get(db, id=medication_id)
     if not medication:
         return StandardResponse(success=False, message="Medication not found")
     await crud_medication.remove(db, id=medication_id)
@@ -258,37 +297,48 @@ async def export_medications_template(current_user=Depends(get_current_active_ad
                              headers={"Content-Disposition": "attachment; filename=medication_template.csv"})
 
 
-@router.post("/broadcast-notification", response_model=StandardResponse[Any])
+@router.get("/export/{resource}")
+async def export_resource(resource: str, file_format: Literal["csv", "xlsx", "parquet"] = Query("csv", alias="format"),
+                          current_user=Depends(get_current_active_admin)):
+    """
+    Streams a full export of users, transactions, hospitals, medications or appointments.
+    Rows are read through a server-side cursor in batches, so memory use does not grow with table size.
+    """
+    if resource not in exports.EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    model, columns = exports.EXPORTS[resource]
+    return StreamingResponse(exports.STREAMERS[file_format](model, columns),
+                             media_type=exports.MEDIA_TYPES[file_format],
+                             headers={"Content-Disposition": f"attachment; filename={resource}.{file_format}"})
+
+
+@router.post("/broadcast-notification", response_model=StandardResponse[Broadcast])
 async def broadcast_notification(notification: NotificationBroadcast, db: AsyncSession = Depends(deps.get_db),
                                  current_user=Depends(get_current_active_admin)):
     """
     Sends a notification to a targeted group of users.
+    The broadcast is stored once and merged into each recipient's feed when they read it.
     """
-    users_to_notify = []
-    if notification.target_audience == "ALL":
-        users_to_notify = await crud_user.get_all_users(db, limit=None)
-    elif notification.target_audience == "ROLE" and notification.audience_role:
-        users_to_notify = await crud_user.get_users_by_role(db, role=notification.audience_role)
+    if notification.target_audience not in ("ALL", "ROLE"):
+        return StandardResponse(success=False, message="Invalid target audience. Use 'ALL' or 'ROLE'.")
+    if notification.target_audience == "ROLE" and not notification.audience_role:
+        return StandardResponse(success=False, message="An audience role is required for role broadcasts.")
 
-    if not users_to_notify:
-        return StandardResponse(success=False, message="No users found for the specified audience.")
-
-    for user in users_to_notify:
-        notification_obj = NotificationCreate(message=notification.message, user_id=user.id)
-        await crud_notification.create(db, obj_in=notification_obj)
-
-    return StandardResponse(message="Notification sent successfully.")
+    broadcast = await crud_broadcast.create(db, obj_in=notification)
+    return StandardResponse(data=broadcast, message="Notification sent successfully.")
 
 
 @router.get("/income/stats", response_model=StandardResponse[Any])
-async def get_income_stats(db: AsyncSession = Depends(deps.get_db), current_user=Depends(get_current_active_admin)):
+async def get_income_stats(realtime: bool = True, db: AsyncSession = Depends(deps.get_db),
+                           current_user=Depends(get_current_active_admin)):
     """
     Provides an overview of total revenue, monthly earnings, and processing fees.
+    Figures come from the daily revenue rollup; `realtime` adds transactions not yet rolled up.
     """
-    total_revenue = await crud_transaction.get_total_revenue(db)
+    total_revenue = await crud_transaction.get_total_revenue(db, realtime=realtime)
     # Assuming processing fees are a fixed percentage or value
     processing_fees = total_revenue * 0.05  # Example: 5% processing fee
-    monthly_earnings = await crud_transaction.get_revenue_by_month(db)
+    monthly_earnings = await crud_transaction.get_revenue_by_month(db, realtime=realtime)
 
     data = {
         "totalRevenue": total_revenue,
@@ -299,46 +349,55 @@ async def get_income_stats(db: AsyncSession = Depends(deps.get_db), current_user
 
 
 @router.get("/income/chart-data", response_model=StandardResponse[Any])
-async def get_income_chart_data(db: AsyncSession = Depends(deps.get_db),
+async def get_income_chart_data(realtime: bool = True, db: AsyncSession = Depends(deps.get_db),
                                 current_user=Depends(get_current_active_admin)):
     """
     Returns data formatted for graphical representation.
     """
-    chart_data = await crud_transaction.get_revenue_by_month(db)
+    chart_data = await crud_transaction.get_revenue_by_month(db, realtime=realtime)
     return StandardResponse(data=chart_data, message="Income chart data retrieved successfully.")
 
 
 @router.get("/income/transactions", response_model=StandardResponse[Any])
-async def get_income_transactions(page: int = 1, size: int = 10, db: AsyncSession = Depends(deps.get_db),
+async def get_income_transactions(page: int = 1, size: int = 10, count_mode: CountMode = "exact",
+                                  db: AsyncSession = Depends(deps.get_db),
                                   current_user=Depends(get_current_active_admin)):
     """
     Lists all transactions with filtering and pagination.
     """
     skip = (page - 1) * size
     transactions = await crud_transaction.get_transactions(db, skip=skip, limit=size)
-    total_transactions = await crud_transaction.count(db)
-    data = {"total": total_transactions, "page": page, "size": size, "transactions": transactions}
+    total_transactions = await crud_transaction.count(db, count_mode=count_mode)
+    data = {"total": total_transactions, "count_mode": count_mode, "page": page, "size": size, "transactions": transactions}
     return StandardResponse(data=data, message="Income transactions retrieved successfully.")
     
             
 
-@router.get("/dashboard-stats", response_model=StandardResponse[Any])
-async def get_dashboard_stats(
-        db: AsyncSession = Depends(deps.get_db),
-        current_user=Depends(get_current_active_admin)
-):
-    """
-    Fetches all key performance indicators (KPIs) and recent data needed for the main dashboard view.
-    """
-    total_users = await crud_user.count(db)
-    total_doctors = await crud_doctor.count(db)
-    pending_doctor_approvals = await crud_doctor.count_doctors_by_status(db, status="pending")
-    total_hospitals = await crud_hospital.count(db)
-    recent_doctor_applications = await crud_doctor.get_doctors_by_status(db, status="pending", limit=5)
-    total_revenue = await crud_transaction.get_total_revenue(db)
-    revenue_chart_data = await crud_transaction.get_revenue_by_month(db)
-
-    data = {
+dashboard_cache = StaleWhileRevalidateCache(
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS, stale_ttl=settings.DASHBOARD_CACHE_STALE_SECONDS
+)
+
+
+async def _load_dashboard_stats():
+    (
+        total_users,
+        total_doctors,
+        pending_doctor_approvals,
+        total_hospitals,
+        recent_doctor_applications,
+        total_revenue,
+        revenue_chart_data,
+    ) = await asyncio.gather(
+        run_in_session(crud_user.count),
+        run_in_session(crud_doctor.count),
+        run_in_session(crud_doctor.count_doctors_by_status, status="pending"),
+        run_in_session(crud_hospital.count),
+        run_in_session(crud_doctor.get_doctors_by_status, status="pending", limit=5),
+        run_in_session(crud_transaction.get_total_revenue),
+        run_in_session(crud_transaction.get_revenue_by_month),
+    )
+
+    return {
         "stats": {
             "totalUsers": total_users,
             "totalDoctors": total_doctors,
@@ -349,4 +408,44 @@ async def get_dashboard_stats(
         "revenueChartData": revenue_chart_data,
         "recentDoctorApplications": recent_doctor_applications
     }
+
+
+@router.get("/dashboard-stats", response_model=StandardResponse[Any])
+async def get_dashboard_stats(
+        current_user=Depends(get_current_active_admin)
+):
+    """
+    Fetches all key performance indicators (KPIs) and recent data needed for the main dashboard view.
+    The independent queries run concurrently, each on its own pooled connection, and the payload is
+    cached briefly and refreshed in the background once stale.
+    """
+    data = await dashboard_cache.get_or_load("dashboard-stats", _load_dashboard_stats)
     return StandardResponse(data=data, message="Dashboard stats retrieved successfully.")
+
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(10, ge=MIN_INTERVAL_SECONDS * 1000, le=1000),
+    current_user=Depends(get_current_active_admin),
+):
+    """
+    Samples the stacks of this worker's threads, event loop included, for `seconds` and
+    returns them in collapsed-stack format for flamegraph.pl or speedscope. Only the
+    worker serving the request is profiled.
+    """
+    try:
+        stacks = await profiler.profile(seconds, interval_ms / 1000)
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    return Response(stacks, media_type="text/plain",
+                    headers={"Content-Disposition": f"attachment; filename=profile_{int(time.time())}.collapsed"})
+
+
+@router.get("/slow-queries", response_model=StandardResponse[Any])
+async def get_slow_queries(limit: int = Query(50, ge=1, le=500), current_user=Depends(get_current_active_admin)):
+    """
+    Most recent statements over SLOW_QUERY_THRESHOLD_MS on this worker, newest first,
+    with bind-parameter shapes and, for sampled SELECTs, the EXPLAIN (ANALYZE, BUFFERS) plan.
+    """
+    return StandardResponse(data=slow_query_log.recent(limit), message="Slow queries retrieved successfully.")
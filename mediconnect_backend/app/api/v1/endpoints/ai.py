@@ -16,12 +16,14 @@ from app.api import deps
 from app.crud import crud_ai
 from typing import List
 from app.schemas.response import StandardResponse
+from app.core.metrics import observed_ai_call
 
 # Configure the Gemini API key
 
 router = APIRouter()
 
 
+@observed_ai_call("upload")
 def _upload_to_gemini(file_path: str, mime_type: str, display_name: str):
     """
     Uploads a file to Gemini using the NEW google.genai SDK
@@ -41,6 +43,11 @@ def _upload_to_gemini(file_path: str, mime_type: str, display_name: str):
     return file
 
 
+@observed_ai_call("generate_content")
+def _generate_content(*, model: str, contents: list):
+    return genai.Client().models.generate_content(model=model, contents=contents)
+
+
 @router.post("/generate-soap-note", response_model=StandardResponse[SoapNoteGenerationResponse])
 async def generate_soap_note(
     audio_file: UploadFile = File(...),
@@ -58,20 +65,18 @@ async def generate_soap_note(
             tmp.write(await audio_file.read())
             tmp_path = tmp.name
 
-        uploaded_file = _upload_to_gemini(
+        uploaded_file = await _upload_to_gemini(
             file_path=tmp_path,
             mime_type=audio_file.content_type,
             display_name=audio_file.filename,
         )
 
-        client = genai.Client()
-
         prompt = (
             "Please transcribe the following audio and generate a SOAP note. "
             f"Context: {context}"
         )
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model="gemini-1.5-pro",
             contents=[prompt, uploaded_file],
         )
@@ -92,8 +97,6 @@ async def generate_soap_note(
 @router.post("/report/text-analysis", response_model=StandardResponse[ReportSummary])
 async def analyze_text_report(reports: List[Report]):
     try:
-        client = genai.Client()
-
         compiled_report = "\n\n".join(
             f"""
             Report Title: {r.title}
@@ -111,7 +114,7 @@ async def analyze_text_report(reports: List[Report]):
             f"{compiled_report}"
         )
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model="gemini-1.5-flash",
             contents=[prompt],
         )
@@ -138,7 +141,6 @@ async def analyze_file_report(
     tmp_paths = []
 
     try:
-        client = genai.Client()
         uploaded_files = []
 
         # 1️⃣ Save + upload each image
@@ -149,7 +151,7 @@ async def analyze_file_report(
                 tmp.write(await image.read())
                 tmp_paths.append(tmp.name)
 
-            uploaded = _upload_to_gemini(
+            uploaded = await _upload_to_gemini(
                 file_path=tmp.name,
                 mime_type=image.content_type,
                 display_name=image.filename,
@@ -164,7 +166,7 @@ async def analyze_file_report(
         contents.extend(uploaded_files)
 
         # 3️⃣ Gemini call
-        response = client.models.generate_content(
+        response = await _generate_content(
             model="gemini-1.5-pro",
             contents=contents,
         )
@@ -194,15 +196,13 @@ async def analyze_file_report(
 @router.post("/symptom-checker", response_model=StandardResponse[SymptomCheckerResponse])
 async def symptom_checker(request: SymptomCheckerRequest):
     try:
-        client = genai.Client()
-
         prompt = (
             "Analyze the following symptoms and return JSON with keys "
             "'assessment' and 'recommended_action'.\n\n"
             f"Symptoms: {request.symptoms}"
         )
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model="gemini-1.5-pro",
             contents=[prompt],
         )
@@ -224,8 +224,6 @@ async def symptom_checker(request: SymptomCheckerRequest):
 @router.post("/allergy-checker", response_model=StandardResponse[AllergyCheckerResponse])
 async def allergy_checker(request: AllergyCheckerRequest):
     try:
-        client = genai.Client()
-
         prompt = (
             "Determine if the following could be an allergic reaction. "
             "Return JSON with keys: is_allergy, confidence, potential_allergens.\n\n"
@@ -233,7 +231,7 @@ async def allergy_checker(request: AllergyCheckerRequest):
             f"Medical History: {', '.join(request.medical_history)}"
         )
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model="gemini-1.5-pro",
             contents=[prompt],
         )
@@ -256,14 +254,12 @@ async def allergy_checker(request: AllergyCheckerRequest):
 @router.post("/calorie-checker", response_model=StandardResponse[CalorieCheckerResponse])
 async def calorie_checker(request: CalorieCheckerRequest):
     try:
-        client = genai.Client()
-
         prompt = (
             "Provide calorie count and macronutrient breakdown in JSON.\n\n"
             f"Food item: {request.meal_description}"
         )
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model="gemini-1.5-flash",
             contents=[prompt],
         )
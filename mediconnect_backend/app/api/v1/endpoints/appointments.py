@@ -1,16 +1,35 @@
 from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app.api.v1 import deps
 from app.crud import crud_appointment
-from app.schemas.appointment import Appointment, AppointmentCreate, AppointmentUpdate
+from app.schemas.appointment import Appointment, AppointmentBase, AppointmentCreate, AppointmentUpdate
 from app.models.user import User
 from app.schemas.consultation import ConsultationCreate
 from app.schemas.response import StandardResponse
+from app.availability import slot_cache, nearest_free_slots
 
 router = APIRouter()
 
+
+async def slot_taken_response(db: AsyncSession, appointment_in: AppointmentBase) -> JSONResponse:
+    """
+    409 for a booking whose slot is already held, offering the nearest free slots instead.
+    """
+    suggestions = await nearest_free_slots(
+        db, doctor_id=appointment_in.doctor_id, day=appointment_in.date, at=appointment_in.time
+    )
+    content = StandardResponse(
+        success=False,
+        data={"suggested_slots": suggestions},
+        message="This slot is no longer available. Please choose another time.",
+    )
+    return JSONResponse(status_code=409, content=jsonable_encoder(content))
+
 @router.get("/patients/me/appointments", response_model=StandardResponse[List[Appointment]])
 async def read_patient_appointments(
     db: AsyncSession = Depends(deps.get_db),
@@ -39,6 +58,9 @@ async def create_patient_appointment(
     if current_user.role != 5:
         return StandardResponse(success=False, message="Not authorized to perform this action")
     appointment = await crud_appointment.appointment.create_with_patient(db, obj_in=appointment_in, patient_id=current_user.id)
+    if appointment is None:
+        return await slot_taken_response(db, appointment_in)
+    slot_cache.invalidate(appointment_in.doctor_id, appointment_in.date)
     return StandardResponse(data=appointment, message="Appointment created successfully.")
 
 
@@ -51,7 +73,7 @@ async def read_patient_appointment(
     """
     Get a specific appointment for the current patient.
     """
-    appointment = await crud_appointment.appointment.get(db, id=appointment_id)
+    appointment = await crud_appointment.appointment.get(db, id=appointment_id, profile="detail")
     if not appointment or appointment.patient_id != current_user.id:
         return StandardResponse(success=False, message="Appointment not found")
     return StandardResponse(data=appointment, message="Appointment retrieved successfully.")
@@ -72,6 +94,8 @@ async def cancel_patient_appointment(
 
     update_data = {"status": "CANCELLED"}
     updated_appointment = await crud_appointment.appointment.update(db, db_obj=appointment, obj_in=update_data)
+    slot_cache.invalidate(updated_appointment.doctor_id, updated_appointment.date)
+    updated_appointment = await crud_appointment.appointment.get(db, id=appointment_id, profile="detail")
     return StandardResponse(data=updated_appointment, message="Appointment cancelled successfully.")
 
 
@@ -105,7 +129,7 @@ async def read_doctor_appointment(
     """
     Get a specific appointment for the current doctor.
     """
-    appointment = await crud_appointment.appointment.get(db, id=appointment_id)
+    appointment = await crud_appointment.appointment.get(db, id=appointment_id, profile="detail")
     if not appointment or appointment.doctor_id != current_user.id:
         return StandardResponse(success=False, message="Appointment not found")
     return StandardResponse(data=appointment, message="Appointment retrieved successfully.")
@@ -125,7 +149,14 @@ async def update_doctor_appointment(
     if not appointment or appointment.doctor_id != current_user.id:
         return StandardResponse(success=False, message="Appointment not found")
 
-    updated_appointment = await crud_appointment.appointment.update(db, db_obj=appointment, obj_in=appointment_in)
+    try:
+        updated_appointment = await crud_appointment.appointment.update(db, db_obj=appointment, obj_in=appointment_in)
+    except IntegrityError:
+        await db.rollback()
+        return await slot_taken_response(db, appointment_in)
+    # date, time or status may have changed; drop all of the doctor's cached days
+    slot_cache.invalidate(current_user.id)
+    updated_appointment = await crud_appointment.appointment.get(db, id=appointment_id, profile="detail")
     return StandardResponse(data=updated_appointment, message="Appointment updated successfully.")
 
 
@@ -149,7 +180,8 @@ async def create_consultation_for_appointment(
     # This is a placeholder for where you'd create the consultation and link it to the appointment
     # For now, we'll just update the appointment status
     update_data = {"status": "COMPLETED"}
-    updated_appointment = await crud_appointment.appointment.update(db, db_obj=appointment, obj_in=update_data)
+    await crud_appointment.appointment.update(db, db_obj=appointment, obj_in=update_data)
+    updated_appointment = await crud_appointment.appointment.get(db, id=appointment_id, profile="detail")
     return StandardResponse(data=updated_appointment, message="Consultation created and appointment status updated successfully.")
 
 @router.post("/doctors/me/appointments/follow-up", response_model=StandardResponse[Appointment])
@@ -167,4 +199,7 @@ async def create_follow_up_appointment(
     # The doctor creates an appointment on behalf of a patient.
     # The `appointment_in` schema should contain the patient_id.
     appointment = await crud_appointment.appointment.create(db, obj_in=appointment_in)
+    if appointment is None:
+        return await slot_taken_response(db, appointment_in)
+    slot_cache.invalidate(appointment_in.doctor_id, appointment_in.date)
     return StandardResponse(data=appointment, message="Follow-up appointment created successfully.")
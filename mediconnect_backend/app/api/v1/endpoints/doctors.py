@@ -1,11 +1,18 @@
 import os
 import uuid
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from datetime import datetime, date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1 import deps
 from app import crud
+from app.crud.crud_doctor_search import crud_doctor_search, encode_cursor, decode_cursor
 from app.schemas.response import StandardResponse
-from app.schemas.doctor import DoctorVerificationDocument
+from app.schemas.doctor import DoctorVerificationDocument, DoctorSearchPage
+from app.schemas.schedule import DayAvailability
+from app.availability import get_availability
+
+MAX_AVAILABILITY_DAYS = 31
 
 router = APIRouter()
 
@@ -14,6 +21,49 @@ UPLOAD_DIRECTORY = "./verification_documents"
 if not os.path.exists(UPLOAD_DIRECTORY):
     os.makedirs(UPLOAD_DIRECTORY)
 
+@router.get("/search", response_model=StandardResponse[DoctorSearchPage])
+async def search_doctors(
+    db: AsyncSession = Depends(deps.get_db),
+    specialty: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Matches doctor name or specialty."),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    available_before: Optional[datetime] = Query(None, description="Only doctors with a free slot before this time."),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search active doctors, best rated first. Pass `next_cursor` from a response as
+    `cursor` to fetch the following page.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    doctors = await crud_doctor_search.search(
+        db, specialty=specialty, q=q, min_rating=min_rating,
+        available_before=available_before, after=after, limit=limit,
+    )
+    next_cursor = encode_cursor(doctors[-1]) if len(doctors) == limit else None
+    return StandardResponse(data=DoctorSearchPage(items=doctors, next_cursor=next_cursor))
+
+@router.get("/{doctor_id}/availability", response_model=StandardResponse[List[DayAvailability]])
+async def read_doctor_availability(
+    doctor_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    start: date = Query(..., alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+):
+    """
+    Bookable appointment slots of a doctor per day between `from` and `to` (inclusive,
+    at most 31 days; defaults to `from` only).
+    """
+    end = end or start
+    if end < start or (end - start).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"'to' must be within {MAX_AVAILABILITY_DAYS} days after 'from'")
+    availability = await get_availability(db, doctor_id=doctor_id, start=start, end=end)
+    data = [DayAvailability(date=day, slots=slots) for day, slots in availability]
+    return StandardResponse(data=data)
+
 @router.post("/upload-verification-document", response_model=StandardResponse[DoctorVerificationDocument])
 async def upload_verification_document(
     db: AsyncSession = Depends(deps.get_db),
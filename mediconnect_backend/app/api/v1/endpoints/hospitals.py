@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1 import deps
+from app.models.user import User
+from app.schemas.hospital import Hospital, HospitalNearby
+from app.schemas.response import StandardResponse
+from app.hospital_directory import find_nearby_hospitals
+
+router = APIRouter()
+
+@router.get("/nearby", response_model=StandardResponse[List[HospitalNearby]])
+async def read_nearby_hospitals(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(10, gt=0, le=500, description="Search radius in km."),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Hospitals within `radius` km of (`lat`, `lng`), closest first, with their distance.
+    """
+    nearby = await find_nearby_hospitals(db, lat=lat, lng=lng, radius_km=radius, limit=limit)
+    data = [
+        HospitalNearby(**Hospital.model_validate(hospital).model_dump(), distance_km=round(distance, 3))
+        for hospital, distance in nearby
+    ]
+    return StandardResponse(data=data, message="Nearby hospitals retrieved successfully.")
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends
-from typing import List
+from typing import List, Any, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1 import deps
 from app.crud.crud_notification import crud_notification
-from app.schemas.notification import NotificationCreate, NotificationUpdate, Notification
+from app.crud.crud_broadcast import crud_broadcast
+from app.schemas.notification import NotificationCreate, NotificationUpdate, Notification, NotificationFeedItem, NotificationIds, NotificationBulkResult
 from app.db.base import User
 from app.schemas.response import StandardResponse
 
@@ -19,6 +21,72 @@ async def create_notification(
     notification = await crud_notification.create(db, obj_in=notification_in)
     return StandardResponse(data=notification, message="Notification created successfully.")
 
+@router.get("/notifications", response_model=StandardResponse[List[NotificationFeedItem]])
+async def get_all_notifications(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+    skip: int = 0,
+    limit: int = 100,
+):
+    """
+    The current user's notifications, including broadcasts addressed to them, newest first.
+    """
+    notifications = await crud_notification.get_feed(db, user_id=current_user.id, skip=skip, limit=limit)
+    return StandardResponse(data=notifications, message="Notifications retrieved successfully.")
+
+@router.get("/notifications/unread-count", response_model=StandardResponse[int])
+async def get_unread_count(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    unread_count = await crud_notification.get_unread_count(db, user_id=current_user.id)
+    return StandardResponse(data=unread_count, message="Unread count retrieved successfully.")
+
+@router.put("/notifications/broadcasts/{id}/read", response_model=StandardResponse[Any])
+async def mark_broadcast_as_read(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    broadcast = await crud_broadcast.get_for_user(db, broadcast_id=id, user_id=current_user.id)
+    if not broadcast:
+        return StandardResponse(success=False, message="Notification not found")
+    await crud_broadcast.mark_as_read(db, broadcast_id=id, user_id=current_user.id)
+    return StandardResponse(message="Notification marked as read.")
+
+@router.post("/notifications/read-all", response_model=StandardResponse[NotificationBulkResult])
+async def mark_all_notifications_as_read(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+    before: Optional[datetime] = None,
+):
+    """
+    Mark every notification of the current user, optionally only those created up to `before`, as read.
+    """
+    affected = await crud_notification.mark_all_read(db, user_id=current_user.id, before=before)
+    return StandardResponse(data=NotificationBulkResult(affected=affected), message="Notifications marked as read.")
+
+@router.post("/notifications/read", response_model=StandardResponse[NotificationBulkResult])
+async def mark_notifications_as_read(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    notifications_in: NotificationIds,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    affected = await crud_notification.mark_read(db, ids=notifications_in.ids, user_id=current_user.id)
+    return StandardResponse(data=NotificationBulkResult(affected=affected), message="Notifications marked as read.")
+
+@router.post("/notifications/bulk-delete", response_model=StandardResponse[NotificationBulkResult])
+async def delete_notifications(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    notifications_in: NotificationIds,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    affected = await crud_notification.remove_many(db, ids=notifications_in.ids, user_id=current_user.id)
+    return StandardResponse(data=NotificationBulkResult(affected=affected), message="Notifications deleted successfully.")
+
 @router.get("/notifications/{id}", response_model=StandardResponse[Notification])
 async def get_notification(
     *,
@@ -30,14 +98,6 @@ async def get_notification(
         return StandardResponse(success=False, message="Notification not found")
     return StandardResponse(data=notification, message="Notification retrieved successfully.")
 
-@router.get("/notifications", response_model=StandardResponse[List[Notification]])
-async def get_all_notifications(
-    db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user)
-):
-    notifications = await crud_notification.get_multi(db, user_id=current_user.id)
-    return StandardResponse(data=notifications, message="Notifications retrieved successfully.")
-
 @router.put("/notifications/{id}", response_model=StandardResponse[Notification])
 async def update_notification(
     *,
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1 import deps
 from app.crud.crud_review import crud_review
+from app.crud.crud_doctor_search import crud_doctor_search
 from app.schemas.review import Review, ReviewCreate, ReviewUpdate
 from app.models.user import User
 from app.schemas.response import StandardResponse
@@ -23,6 +24,9 @@ async def create_review(
     Create new review.
     """
     review = await crud_review.create_with_owner(db=db, obj_in=review_in, owner_id=current_user.id)
+    if review is None:
+        return StandardResponse(success=False, message="Only patients can leave reviews")
+    await crud_doctor_search.refresh(db, doctor_ids=[review.doctor_id])
     return StandardResponse(data=review, message="Review created successfully.")
 
 
@@ -72,6 +76,7 @@ async def update_review(
     if review.user_id != current_user.id and not crud.crud_user.is_superuser(current_user):
         return StandardResponse(success=False, message="Not enough permissions")
     review = await crud_review.update(db=db, db_obj=review, obj_in=review_in)
+    await crud_doctor_search.refresh(db, doctor_ids=[review.doctor_id])
     return StandardResponse(data=review, message="Review updated successfully.")
 
 
@@ -87,5 +92,9 @@ async def delete_review(
     review = await crud_review.get(db, id=review_id)
     if not review:
         return StandardResponse(success=False, message="Review not found")
+    doctor_id = review.doctor_id
     review = await crud_review.remove(db, id=review_id)
+    if not review:
+        return StandardResponse(success=False, message="Review not found")
+    await crud_doctor_search.refresh(db, doctor_ids=[doctor_id])
     return StandardResponse(data=review, message="Review deleted successfully.")
@@ -43,23 +43,25 @@ async def read_transactions_by_user(
 
 @router.get("/revenue", response_model=StandardResponse[float])
 async def get_total_revenue(
+    realtime: bool = True,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_admin),
 ) -> Any:
     """
     Get total revenue.
     """
-    total_revenue = await crud_transaction.get_total_revenue(db)
+    total_revenue = await crud_transaction.get_total_revenue(db, realtime=realtime)
     return StandardResponse(data=total_revenue, message="Total revenue retrieved successfully.")
 
 
 @router.get("/revenue/by-month", response_model=StandardResponse[List[dict]])
 async def get_revenue_by_month(
+    realtime: bool = True,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_admin),
 ) -> Any:
     """
     Get revenue by month.
     """
-    revenue_by_month = await crud_transaction.get_revenue_by_month(db)
+    revenue_by_month = await crud_transaction.get_revenue_by_month(db, realtime=realtime)
     return StandardResponse(data=revenue_by_month, message="Revenue by month retrieved successfully.")
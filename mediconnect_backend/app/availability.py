@@ -0,0 +1,202 @@
+import time as monotonic_time
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.crud.crud_appointment import appointment as crud_appointment
+from app.crud.crud_schedule import crud_schedule
+
+settings = get_settings()
+
+MINUTES_PER_DAY = 24 * 60
+SUGGESTION_DAYS = 7
+NEXT_SLOT_DAYS = 28  # how far ahead doctor search looks for a doctor's next free slot
+
+
+def minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def day_bitmap(
+    windows: Iterable[Tuple[time, time]], booked: Iterable[time], slot_minutes: int
+) -> np.ndarray:
+    """
+    Free slots of one day as a boolean array over the day's fixed slot grid (slot `i`
+    starts at `i * slot_minutes`). A slot is free when it lies entirely inside a
+    schedule window and overlaps no booked appointment of the same length.
+    """
+    slots = MINUTES_PER_DAY // slot_minutes
+    window_bounds = np.array([(minutes(s), minutes(e)) for s, e in windows], dtype=np.int64).reshape(-1, 2)
+    booked_starts = np.sort(np.array([minutes(t) for t in booked], dtype=np.int64))
+
+    # +1/-1 at interval edges, then a running sum: a slot is covered where the sum is positive
+    covered = np.zeros(slots + 1, dtype=np.int64)
+    first = -(-window_bounds[:, 0] // slot_minutes)  # first slot starting at or after the window start
+    last = window_bounds[:, 1] // slot_minutes  # slots must end by the window end
+    keep = first < last
+    np.add.at(covered, first[keep], 1)
+    np.add.at(covered, last[keep], -1)
+
+    taken = np.zeros(slots + 1, dtype=np.int64)
+    np.add.at(taken, booked_starts // slot_minutes, 1)
+    np.add.at(taken, np.minimum(-(-(booked_starts + slot_minutes) // slot_minutes), slots), -1)
+
+    return (np.cumsum(covered)[:slots] > 0) & (np.cumsum(taken)[:slots] == 0)
+
+
+def bitmap_times(bitmap: np.ndarray, slot_minutes: int, *, not_before: Optional[int] = None) -> List[time]:
+    starts = np.flatnonzero(bitmap) * slot_minutes
+    if not_before is not None:
+        starts = starts[starts >= not_before]
+    return [time(int(m) // 60, int(m) % 60) for m in starts]
+
+
+def first_free_slot(
+    windows: Dict[date, List[Tuple[time, time]]], booked: Dict[date, List[time]], slot_minutes: int, now: datetime
+) -> Optional[datetime]:
+    """
+    The earliest free slot starting at or after `now` across the days in `windows`.
+    """
+    for day in sorted(windows):
+        if day < now.date():
+            continue
+        not_before = now.hour * 60 + now.minute if day == now.date() else None
+        times = bitmap_times(day_bitmap(windows[day], booked.get(day, []), slot_minutes), slot_minutes, not_before=not_before)
+        if times:
+            return datetime.combine(day, times[0])
+    return None
+
+
+class SlotBitmapCache:
+    """
+    Per-(doctor, day) free-slot bitmaps, packed to bits. Entries are dropped when a
+    booking changes and expire after `ttl` seconds to pick up schedule edits and
+    bookings made by other processes.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, date], Tuple[float, np.ndarray]]" = OrderedDict()
+
+    def get(self, doctor_id: int, day: date, slots: int) -> Optional[np.ndarray]:
+        entry = self._entries.get((doctor_id, day))
+        if entry is None or monotonic_time.monotonic() - entry[0] >= self.ttl:
+            return None
+        self._entries.move_to_end((doctor_id, day))
+        return np.unpackbits(entry[1], count=slots).astype(bool)
+
+    def put(self, doctor_id: int, day: date, bitmap: np.ndarray) -> None:
+        self._entries[(doctor_id, day)] = (monotonic_time.monotonic(), np.packbits(bitmap))
+        self._entries.move_to_end((doctor_id, day))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, doctor_id: int, day: Optional[date] = None) -> None:
+        if day is not None:
+            self._entries.pop((doctor_id, day), None)
+            return
+        for key in [key for key in self._entries if key[0] == doctor_id]:
+            del self._entries[key]
+
+
+slot_cache = SlotBitmapCache(
+    ttl=settings.AVAILABILITY_CACHE_TTL_SECONDS, max_entries=settings.AVAILABILITY_CACHE_MAX_ENTRIES
+)
+
+
+async def get_day_bitmaps(db: AsyncSession, *, doctor_id: int, start: date, end: date) -> Dict[date, np.ndarray]:
+    """
+    Free-slot bitmaps for every day in [start, end], loading uncached days with one
+    schedule query and one appointment query.
+    """
+    slot_minutes = settings.APPOINTMENT_SLOT_MINUTES
+    slots = MINUTES_PER_DAY // slot_minutes
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    bitmaps = {day: slot_cache.get(doctor_id, day, slots) for day in days}
+    missing = [day for day, bitmap in bitmaps.items() if bitmap is None]
+    if missing:
+        windows: Dict[date, List[Tuple[time, time]]] = defaultdict(list)
+        for schedule in await crud_schedule.get_available_windows(db, doctor_id=doctor_id, start=missing[0], end=missing[-1]):
+            windows[schedule.date].append((schedule.start_time, schedule.end_time))
+        booked: Dict[date, List[time]] = defaultdict(list)
+        for day, start_time in await crud_appointment.get_booked_times(db, doctor_id=doctor_id, start=missing[0], end=missing[-1]):
+            booked[day].append(start_time)
+        for day in missing:
+            bitmaps[day] = day_bitmap(windows[day], booked[day], slot_minutes)
+            slot_cache.put(doctor_id, day, bitmaps[day])
+    return bitmaps
+
+
+async def get_availability(db: AsyncSession, *, doctor_id: int, start: date, end: date) -> List[Tuple[date, List[time]]]:
+    """
+    Bookable slot start times per day in [start, end]; slots already in the past are left out.
+    """
+    slot_minutes = settings.APPOINTMENT_SLOT_MINUTES
+    now = datetime.utcnow()
+    bitmaps = await get_day_bitmaps(db, doctor_id=doctor_id, start=start, end=end)
+    availability = []
+    for day in sorted(bitmaps):
+        if day < now.date():
+            continue
+        not_before = now.hour * 60 + now.minute if day == now.date() else None
+        times = bitmap_times(bitmaps[day], slot_minutes, not_before=not_before)
+        if times:
+            availability.append((day, times))
+    return availability
+
+
+async def nearest_free_slots(
+    db: AsyncSession, *, doctor_id: int, day: date, at: time, count: int = 3
+) -> List[datetime]:
+    """
+    The `count` free slots closest in time to `day` `at`, within SUGGESTION_DAYS either
+    side. Used to offer alternatives when a booking loses the race for its slot.
+    """
+    slot_cache.invalidate(doctor_id, day)
+    requested = datetime.combine(day, at)
+    today = datetime.utcnow().date()
+    start = max(day - timedelta(days=SUGGESTION_DAYS), today)
+    end = max(day, today) + timedelta(days=SUGGESTION_DAYS)
+    availability = await get_availability(db, doctor_id=doctor_id, start=start, end=end)
+    candidates = [datetime.combine(slot_day, slot) for slot_day, slots in availability for slot in slots]
+    return sorted(candidates, key=lambda slot: (abs(slot - requested), slot))[:count]
+
+
+async def next_free_slots(db: AsyncSession, *, doctor_ids: Optional[List[int]] = None) -> Dict[int, datetime]:
+    """
+    Each doctor's earliest bookable slot (free of appointments, not in the past) within
+    NEXT_SLOT_DAYS, for `doctor_ids` or every doctor if None. Doctors without one are
+    left out. Days are loaded a week at a time; doctors already placed are skipped.
+    """
+    slot_minutes = settings.APPOINTMENT_SLOT_MINUTES
+    now = datetime.utcnow()
+    found: Dict[int, datetime] = {}
+    for offset in range(0, NEXT_SLOT_DAYS, 7):
+        start = now.date() + timedelta(days=offset)
+        end = now.date() + timedelta(days=min(offset + 7, NEXT_SLOT_DAYS) - 1)
+        pending = None if doctor_ids is None else [doctor_id for doctor_id in doctor_ids if doctor_id not in found]
+        if pending == []:
+            break
+        windows: Dict[int, Dict[date, List[Tuple[time, time]]]] = defaultdict(lambda: defaultdict(list))
+        for doctor_id, day, start_time, end_time in await crud_schedule.get_windows_by_doctor(
+            db, start=start, end=end, doctor_ids=pending
+        ):
+            if doctor_id not in found:
+                windows[doctor_id][day].append((start_time, end_time))
+        if not windows:
+            continue
+        booked: Dict[int, Dict[date, List[time]]] = defaultdict(lambda: defaultdict(list))
+        for doctor_id, day, start_time in await crud_appointment.get_booked_times_by_doctor(
+            db, start=start, end=end, doctor_ids=pending
+        ):
+            booked[doctor_id][day].append(start_time)
+        for doctor_id, days in windows.items():
+            slot = first_free_slot(days, booked[doctor_id], slot_minutes, now)
+            if slot is not None:
+                found[doctor_id] = slot
+    return found
@@ -1,10 +1,10 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
+from collections import Counter
 from datetime import datetime, timedelta
 from sqlalchemy import delete
 
-from app.db.base import Appointment, Notification
+from app.db.base import Appointment, Notification, Broadcast
 from app.db.session import SessionLocal
+from app.crud.crud_notification import crud_notification
 
 async def cleanup_old_appointments():
     """
@@ -23,10 +23,18 @@ async def cleanup_old_appointments():
 
 async def cleanup_old_notifications():
     """
-    Deletes notifications that are older than 90 days.
+    Deletes notifications and broadcasts that are older than 90 days.
     """
     async with SessionLocal() as db:
         ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        stmt = delete(Notification).where(Notification.created_at < ninety_days_ago)
-        await db.execute(stmt)
+        # counters follow the rows this DELETE actually removed, not an earlier count
+        deleted = await db.execute(
+            delete(Notification)
+            .where(Notification.created_at < ninety_days_ago)
+            .returning(Notification.user_id, Notification.is_read)
+            .execution_options(synchronize_session=False)
+        )
+        unread = Counter(user_id for user_id, is_read in deleted.all() if not is_read)
+        await crud_notification.adjust_unread_counts(db, {user_id: -count for user_id, count in unread.items()})
+        await db.execute(delete(Broadcast).where(Broadcast.created_at < ninety_days_ago))
         await db.commit()
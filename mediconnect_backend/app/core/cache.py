@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache for expensive, read-only payloads.
+
+    Entries younger than `ttl` seconds are served as-is. Entries up to `ttl + stale_ttl`
+    seconds old are still served, while a single background task reloads them. Older or
+    missing entries are loaded inline; concurrent callers share the same load.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            loaded_at, value = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._refresh(key, loader)
+                return value
+        return await asyncio.shield(self._refresh(key, loader))
+
+    def peek(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """
+        Non-blocking read: returns the cached value, or None if there is no usable entry.
+        Missing or expired entries are (re)loaded in the background for later callers.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._refresh(key, loader)
+            return None
+        loaded_at, value = entry
+        age = time.monotonic() - loaded_at
+        if age >= self.ttl:
+            self._refresh(key, loader)
+        if age >= self.ttl + self.stale_ttl:
+            return None
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            task.add_done_callback(self._log_failure)
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+            self._entries[key] = (time.monotonic(), value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Cache refresh failed", exc_info=task.exception())
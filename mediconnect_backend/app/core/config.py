@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     PROJECT_NAME: str = "MediConnect"
+    ENVIRONMENT: str = "development"  # development, test, production
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
     POSTGRES_SERVER: str
     POSTGRES_USER: str
@@ -19,6 +20,25 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     TEST_DATABASE_URL: Optional[str] = None
     GEMINI_API_KEY: str
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    DASHBOARD_CACHE_STALE_SECONDS: int = 300
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    COUNT_CACHE_STALE_SECONDS: int = 3600
+    IMPORT_WORKERS: int = 2
+    HOSPITAL_DIRECTORY_TTL_SECONDS: int = 300
+    APPOINTMENT_SLOT_MINUTES: int = 30
+    AVAILABILITY_CACHE_TTL_SECONDS: int = 60
+    AVAILABILITY_CACHE_MAX_ENTRIES: int = 50000
+    SQL_QUERY_BUDGET: int = 30
+    SQL_REPEAT_THRESHOLD: int = 10
+    SQL_BUDGET_STRICT: bool = False
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.05
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.1
+    LOOP_WATCHDOG_STRICT: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_LOG_SIZE: int = 200
 
     @model_validator(mode='after')
     def set_test_database_url(self) -> 'Settings':
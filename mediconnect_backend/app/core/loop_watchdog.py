@@ -0,0 +1,139 @@
+"""
+Event-loop lag and blocking-call watchdog.
+
+A heartbeat task on the loop measures how late each of its wake-ups is. A monitor
+thread watches the heartbeat; when the loop has not ticked for `threshold` seconds it
+captures the loop thread's current stack, which is the code holding the loop.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EventLoopBlocked(Exception):
+    pass
+
+
+class BlockReport(NamedTuple):
+    location: str
+    stalled: float
+    stack: str
+
+
+def blocking_location(frame) -> str:
+    """
+    `file:function` of the innermost application frame, falling back to the innermost frame.
+    """
+    innermost = None
+    while frame is not None:
+        innermost = innermost or frame
+        if frame.f_code.co_filename.startswith(APP_DIR):
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    if frame is None:
+        return "<unknown>"
+    return f"{os.path.relpath(frame.f_code.co_filename, os.path.dirname(APP_DIR))}:{frame.f_code.co_name}"
+
+
+class LoopWatchdog:
+    def __init__(self, *, interval: float, threshold: float, max_reports: int = 100):
+        self.interval = interval
+        self.threshold = threshold
+        self.reports: "deque[BlockReport]" = deque(maxlen=max_reports)
+        self._last_tick = 0.0
+        self._loop_thread: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """
+        Starts watching the running loop. Must be called from a coroutine on that loop.
+        """
+        if self._heartbeat_task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._monitor_thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._monitor_thread.start()
+
+    async def stop(self) -> None:
+        if self._heartbeat_task is None:
+            return
+        self._stopped.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+        self._monitor_thread.join()
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(loop.time() - expected, 0.0))
+            self._last_tick = time.monotonic()
+
+    def _monitor(self) -> None:
+        reported_tick = None
+        while not self._stopped.wait(self.interval):
+            tick = self._last_tick
+            # ticks are `interval` apart even on an idle loop
+            stalled = time.monotonic() - tick - self.interval
+            # one report per stall: the stack is taken while the loop is still held
+            if stalled < self.threshold or tick == reported_tick:
+                continue
+            reported_tick = tick
+            frame = sys._current_frames().get(self._loop_thread)
+            self._report(BlockReport(
+                location=blocking_location(frame),
+                stalled=stalled,
+                stack="".join(traceback.format_stack(frame)) if frame is not None else "",
+            ))
+
+    def _report(self, report: BlockReport) -> None:
+        self.reports.append(report)
+        EVENT_LOOP_BLOCKS.labels(report.location).inc()
+        logger.warning(
+            f"Event loop blocked for at least {report.stalled * 1000:.0f} ms in {report.location}\n{report.stack}"
+        )
+
+    def drain(self) -> List[BlockReport]:
+        reports = list(self.reports)
+        self.reports.clear()
+        return reports
+
+    def raise_if_blocked(self) -> None:
+        """
+        Strict mode: raises with the stacks of every block seen since the last call.
+        """
+        reports = self.drain()
+        if reports:
+            raise EventLoopBlocked("\n\n".join(
+                f"blocked >= {r.stalled * 1000:.0f} ms in {r.location}\n{r.stack}" for r in reports
+            ))
+
+
+loop_watchdog = LoopWatchdog(
+    interval=settings.LOOP_WATCHDOG_INTERVAL_SECONDS, threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS
+)
@@ -0,0 +1,154 @@
+"""
+Prometheus metrics, exposed at /metrics.
+
+HTTP series are labelled by route template (`/api/v1/doctors/{doctor_id}`), never by
+raw path, so cardinality stays bounded by the number of routes.
+"""
+import functools
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY
+from starlette.concurrency import run_in_threadpool
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request to the end of the response body.", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size.", ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.", ["method"])
+
+JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds", "Scheduled job run time.", ["job", "outcome"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900),
+)
+AI_UPSTREAM_LATENCY = Histogram(
+    "ai_upstream_request_duration_seconds", "Latency of calls to the AI provider.", ["operation", "model", "outcome"],
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80),
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a scheduled wake-up.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocked_total", "Stalls of the event loop, by the code holding it.", ["location"]
+)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status, response size and in-flight requests.
+    The route is known once the router has matched it, so labels are applied at the end.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            HTTP_IN_FLIGHT.labels(method).dec()
+            route = route_template(scope)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+class PoolCollector:
+    """
+    Connection pool state of a SQLAlchemy engine, read at scrape time.
+    """
+
+    def __init__(self, engine):
+        self.pool = getattr(engine, "sync_engine", engine).pool
+
+    def collect(self):
+        family = GaugeMetricFamily("db_pool_connections", "Database pool connections by state.", labels=["state"])
+        for state, reading in (("size", "size"), ("checked_out", "checkedout"),
+                               ("checked_in", "checkedin"), ("overflow", "overflow")):
+            if hasattr(self.pool, reading):
+                # QueuePool reports overflow as negative until the pool is full
+                family.add_metric([state], max(getattr(self.pool, reading)(), 0))
+        yield family
+
+
+def register_pool(engine) -> None:
+    REGISTRY.register(PoolCollector(engine))
+
+
+def timed_job(job):
+    """
+    Wraps an async scheduler job so every run is recorded in JOB_DURATION.
+    """
+    @functools.wraps(job)
+    async def run(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await job(*args, **kwargs)
+            outcome = "success"
+            return result
+        finally:
+            JOB_DURATION.labels(job.__name__, outcome).observe(time.perf_counter() - started)
+    return run
+
+
+@contextmanager
+def observe_ai_call(operation: str, model: str = "") -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        AI_UPSTREAM_LATENCY.labels(operation, model, outcome).observe(time.perf_counter() - started)
+
+
+def observed_ai_call(operation: str):
+    """
+    Turns a blocking Gemini SDK call into a coroutine run in the threadpool, so the event
+    loop keeps serving while it waits, and records its latency under `operation`. A
+    `model` keyword argument labels the series.
+    """
+    def decorate(call):
+        @functools.wraps(call)
+        async def run(*args, **kwargs):
+            with observe_ai_call(operation, model=kwargs.get("model", "")):
+                return await run_in_threadpool(call, *args, **kwargs)
+        return run
+    return decorate
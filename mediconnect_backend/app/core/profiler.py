@@ -0,0 +1,99 @@
+"""
+Sampling profiler for a live worker.
+
+A background thread snapshots the stack of every other thread in the process at a
+fixed interval, the event loop thread included, and counts identical stacks. Nothing
+is traced between samples, so the overhead is the sampling itself and the worker is
+never paused. Output is in the collapsed-stack format read by flamegraph.pl,
+speedscope and similar tools: one `root;caller;callee count` line per distinct stack.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+MAX_PROFILE_SECONDS = 60
+MIN_INTERVAL_SECONDS = 0.005
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def sample(seconds: float, interval: float, thread_names: Dict[int, str], stop: threading.Event) -> Counter:
+    """
+    Samples every thread except the calling one for `seconds`, or until `stop` is set.
+    `thread_names` names threads that threading does not know about, such as the event
+    loop's.
+    """
+    own = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not stop.is_set():
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        names.update(thread_names)
+        for ident, frame in sys._current_frames().items():
+            if ident != own:
+                stacks[collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+        stop.wait(interval)
+    return stacks
+
+
+def render(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class Profiler:
+    """
+    Runs one profile at a time; a second request while one is running is refused.
+    """
+
+    def __init__(self):
+        self._running = False
+
+    async def profile(self, seconds: float, interval: float) -> str:
+        if self._running:
+            raise ProfilerBusy()
+        self._running = True
+        try:
+            loop = asyncio.get_running_loop()
+            done = loop.create_future()
+            loop_names = {threading.get_ident(): "event-loop"}
+
+            # a dedicated thread, so a saturated default executor cannot delay the samples
+            def run():
+                stacks = sample(min(seconds, MAX_PROFILE_SECONDS), max(interval, MIN_INTERVAL_SECONDS), loop_names, stop)
+                loop.call_soon_threadsafe(lambda: done.done() or done.set_result(stacks))
+
+            stop = threading.Event()
+            sampler = threading.Thread(target=run, name="profiler", daemon=True)
+            sampler.start()
+            try:
+                return render(await done)
+            finally:
+                # a cancelled request must not leave the sampler running behind a cleared flag;
+                # the stop event wakes it from its wait, so the join lasts one sample at most
+                stop.set()
+                sampler.join()
+        finally:
+            self._running = False
+
+
+profiler = Profiler()
@@ -2,11 +2,15 @@ from .crud_user import crud_user
 from .crud_patient import patient
 from .crud_doctor import doctor
 from .crud_appointment import appointment
+from .crud_schedule import crud_schedule
 from .crud_transaction import crud_transaction
 from .crud_review import crud_review
+from .crud_doctor_search import crud_doctor_search
 from .crud_notification import crud_notification
+from .crud_broadcast import crud_broadcast
 from .crud_medication import crud_medication
 from .crud_hospital import hospital
+from .crud_import_job import crud_import_job
 from .crud_consultation import crud_consultation
 from .crud_subscription import subscription
 from .crud_permissions import permission
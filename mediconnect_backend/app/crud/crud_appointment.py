@@ -1,32 +1,80 @@
-from typing import Any, Dict, Optional, List
-from sqlalchemy import select
+from typing import Any, Dict, Optional, List, Tuple
+from datetime import date, datetime, time
+from sqlalchemy import select, literal_column, false
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, noload, selectinload
 
-from app.crud.base import CRUDBase
+from app.crud.crud_base import CRUDBase
 from app.models.appointment import Appointment
+from app.models.patient import Patient
 from app.schemas.appointment import AppointmentCreate, AppointmentUpdate
 
+# The nested patient's own appointments and reviews are left empty: they would lead
+# back to the appointment being serialized.
+_PATIENT_COLLECTIONS = (noload(Patient.appointments), noload(Patient.reviews))
+
+
 class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate]):
-    async def create_with_patient(self, db: AsyncSession, *, obj_in: AppointmentCreate, patient_id: int) -> Appointment:
-        db_obj = self.model(**obj_in.dict(), patient_id=patient_id)
-        db.add(db_obj)
+    loader_profiles = {
+        # one extra query per relationship, however many rows are listed
+        "list": (
+            selectinload(Appointment.doctor),
+            selectinload(Appointment.patient).options(*_PATIENT_COLLECTIONS),
+            selectinload(Appointment.consultation_details),
+            selectinload(Appointment.review),
+        ),
+        # a single row: fetch it and its relationships in one round trip
+        "detail": (
+            joinedload(Appointment.doctor),
+            joinedload(Appointment.patient).options(*_PATIENT_COLLECTIONS),
+            joinedload(Appointment.consultation_details),
+            joinedload(Appointment.review),
+        ),
+    }
+
+    async def book(self, db: AsyncSession, *, values: Dict[str, Any]) -> Optional[Appointment]:
+        """
+        Inserts the appointment unless its doctor/date/time slot is already held by an
+        appointment that is not cancelled, in which case it returns None. The unique
+        index arbitrates concurrent bookings, so no rows or tables are locked up front.
+        """
+        result = await db.execute(
+            insert(self.model)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[self.model.doctor_id, self.model.date, self.model.time],
+                # inlined: a bound parameter here would stop Postgres matching the partial index
+                index_where=self.model.status != literal_column("'CANCELLED'"),
+            )
+            .returning(self.model.id)
+        )
+        appointment_id = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        if appointment_id is None:
+            return None
+        return await self.get(db, id=appointment_id, profile="detail")
 
-    async def get_multi_by_patient(
-        self, db: AsyncSession, *, patient_id: int, status: Optional[str] = None, skip: int = 0, limit: int = 100
-    ) -> List[Appointment]:
+    async def create(self, db: AsyncSession, *, obj_in: AppointmentCreate) -> Optional[Appointment]:
+        return await self.book(db, values=obj_in.model_dump())
+
+    async def create_with_patient(
+        self, db: AsyncSession, *, obj_in: AppointmentCreate, patient_id: int
+    ) -> Optional[Appointment]:
+        return await self.book(db, values={**obj_in.model_dump(), "patient_id": patient_id})
+
+    def by_patient_query(self, *, patient_id: int, status: Optional[str] = None) -> Select:
+        # served by ix_appointments_patient_status
         query = select(self.model).where(self.model.patient_id == patient_id)
         if status:
             query = query.where(self.model.status == status)
-        query = query.offset(skip).limit(limit)
-        result = await db.execute(query)
-        return result.scalars().all()
+        return query
 
-    async def get_multi_by_doctor(
-        self, db: AsyncSession, *, doctor_id: int, status: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, skip: int = 0, limit: int = 100
-    ) -> List[Appointment]:
+    def by_doctor_query(
+        self, *, doctor_id: int, status: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Select:
+        # served by ix_appointments_doctor_date_time
         query = select(self.model).where(self.model.doctor_id == doctor_id)
         if status:
             query = query.where(self.model.status == status)
@@ -34,8 +82,72 @@ class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate
             query = query.where(self.model.date >= start_date)
         if end_date:
             query = query.where(self.model.date <= end_date)
-        query = query.offset(skip).limit(limit)
-        result = await db.execute(query)
+        return query.order_by(self.model.date, self.model.time)
+
+    async def get_multi_by_patient(
+        self, db: AsyncSession, *, patient_id: int, status: Optional[str] = None, skip: int = 0, limit: int = 100,
+        profile: Optional[str] = "list",
+    ) -> List[Appointment]:
+        query = self.by_patient_query(patient_id=patient_id, status=status)
+        result = await db.execute(self.with_profile(query.offset(skip).limit(limit), profile))
         return result.scalars().all()
 
+    async def get_multi_by_doctor(
+        self, db: AsyncSession, *, doctor_id: int, status: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, skip: int = 0, limit: int = 100,
+        profile: Optional[str] = "list",
+    ) -> List[Appointment]:
+        query = self.by_doctor_query(doctor_id=doctor_id, status=status, start_date=start_date, end_date=end_date)
+        result = await db.execute(self.with_profile(query.offset(skip).limit(limit), profile))
+        return result.scalars().all()
+
+    async def get_booked_times(
+        self, db: AsyncSession, *, doctor_id: int, start: date, end: date
+    ) -> List[Tuple[date, time]]:
+        """
+        (date, time) of the doctor's appointments in [start, end] that still hold their slot.
+        """
+        result = await db.execute(
+            select(self.model.date, self.model.time)
+            .where(
+                self.model.doctor_id == doctor_id,
+                self.model.date >= start,
+                self.model.date <= end,
+                self.model.status != "CANCELLED",
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_booked_times_by_doctor(
+        self, db: AsyncSession, *, start: date, end: date, doctor_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, date, time]]:
+        """
+        (doctor_id, date, time) of the appointments in [start, end] that still hold their
+        slot, for `doctor_ids` or every doctor if None.
+        """
+        query = select(self.model.doctor_id, self.model.date, self.model.time).where(
+            self.model.date >= start,
+            self.model.date <= end,
+            self.model.status != "CANCELLED",
+        )
+        if doctor_ids is not None:
+            query = query.where(self.model.doctor_id.in_(doctor_ids))
+        result = await db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    def due_reminders_query(self, *, start: datetime, end: datetime) -> Select:
+        """
+        UPCOMING appointments between `start` and `end` that have not been reminded yet.
+        The status and reminder_sent tests are inlined so the partial index
+        ix_appointments_reminder_due still applies under prepared-statement plans.
+        """
+        starts_at = self.model.date + self.model.time
+        return select(self.model).where(
+            self.model.status == literal_column("'UPCOMING'"),
+            self.model.reminder_sent == false(),
+            self.model.date >= start.date(),
+            self.model.date <= end.date(),
+            starts_at >= start,
+            starts_at <= end,
+        )
+
 appointment = CRUDAppointment(Appointment)
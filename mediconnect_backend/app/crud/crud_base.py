@@ -1,11 +1,33 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Literal, Optional, Sequence, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func
+from sqlalchemy.sql import Select
 
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.config import get_settings
 from app.db.base import Base
+from app.db.explain import estimate_rows
+from app.db.session import run_in_session
+
+settings = get_settings()
+
+CountMode = Literal["exact", "estimated", "none"]
+
+# Exact whole-table counts, keyed by table name; served to `estimated` callers and
+# recomputed in the background so no request waits on a full count.
+table_counts = StaleWhileRevalidateCache(
+    ttl=settings.COUNT_CACHE_TTL_SECONDS, stale_ttl=settings.COUNT_CACHE_STALE_SECONDS
+)
+
+
+def escape_like(value: str) -> str:
+    """Escapes LIKE wildcards in user input; match with `escape="\\\\"`."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -13,6 +35,10 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Named sets of loader options, e.g. "list" and "detail". A profile eager-loads every
+    # relationship its response schema reads, so serializing never lazy-loads per row.
+    loader_profiles: Dict[str, Sequence[Any]] = {}
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -24,18 +50,48 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
-    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
-        result = await db.execute(select(self.model).filter(self.model.id == id))
+    def with_profile(self, query: Select, profile: Optional[str]) -> Select:
+        if profile is None:
+            return query
+        return query.options(*self.loader_profiles[profile])
+
+    async def get(self, db: AsyncSession, id: Any, *, profile: Optional[str] = None) -> Optional[ModelType]:
+        query = self.with_profile(select(self.model).filter(self.model.id == id), profile)
+        result = await db.execute(query)
         return result.scalars().first()
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, profile: Optional[str] = None
     ) -> List[ModelType]:
-        result = await db.execute(
-            select(self.model).offset(skip).limit(limit)
-        )
+        query = self.with_profile(select(self.model).offset(skip).limit(limit), profile)
+        result = await db.execute(query)
         return result.scalars().all()
 
+    async def count(self, db: AsyncSession, *, count_mode: CountMode = "exact") -> Optional[int]:
+        return await self.count_where(db, count_mode=count_mode)
+
+    async def count_where(self, db: AsyncSession, *filters: Any, count_mode: CountMode = "exact") -> Optional[int]:
+        """
+        Counts rows matching `filters`.
+
+        * `exact`: `count(*)`, which scans every matching row.
+        * `estimated`: the cached exact count for unfiltered tables, otherwise the
+          planner's row estimate. Never scans.
+        * `none`: skips counting and returns None.
+        """
+        if count_mode == "none":
+            return None
+        if count_mode == "estimated":
+            if not filters:
+                cached = table_counts.peek(
+                    self.model.__tablename__, lambda: run_in_session(self.count)
+                )
+                if cached is not None:
+                    return cached
+            return await estimate_rows(db, select(self.model).filter(*filters))
+        result = await db.execute(select(func.count()).select_from(self.model).filter(*filters))
+        return result.scalar_one()
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
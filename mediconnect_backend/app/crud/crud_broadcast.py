@@ -0,0 +1,103 @@
+from sqlalchemy.future import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func, and_, or_, literal
+from typing import List, Optional
+from datetime import datetime
+
+from app.crud.crud_base import CRUDBase
+from app.schemas.notification import NotificationBroadcast
+from app.db.base import Broadcast, BroadcastReceipt, User
+from app.models.role import Role
+
+class CRUDBroadcast(CRUDBase[Broadcast, NotificationBroadcast, NotificationBroadcast]):
+    def audience_filter(self, user_id: int):
+        """
+        Predicate matching the broadcasts addressed to `user_id`, resolved against
+        the user's current role so role changes apply to past broadcasts too. Broadcasts
+        sent before the user signed up are not theirs; accounts without a sign-up time
+        predate broadcasts and match all of them.
+        """
+        user_role = (
+            select(Role.role)
+            .join(User, User.role_id == Role.id)
+            .where(User.id == user_id)
+            .scalar_subquery()
+        )
+        signed_up = select(User.created_at).where(User.id == user_id).scalar_subquery()
+        return and_(
+            or_(
+                self.model.target_audience == "ALL",
+                and_(self.model.target_audience == "ROLE", self.model.audience_role == user_role),
+            ),
+            or_(signed_up.is_(None), self.model.created_at >= signed_up),
+        )
+
+    async def get_multi_for_user(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[tuple]:
+        """
+        Returns `(broadcast, read_at)` pairs, newest first; `read_at` is None when unread.
+        """
+        result = await db.execute(
+            select(self.model, BroadcastReceipt.read_at)
+            .outerjoin(
+                BroadcastReceipt,
+                and_(BroadcastReceipt.broadcast_id == self.model.id, BroadcastReceipt.user_id == user_id),
+            )
+            .filter(self.audience_filter(user_id))
+            .order_by(self.model.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_unread_count(self, db: AsyncSession, *, user_id: int) -> int:
+        receipt_exists = (
+            select(BroadcastReceipt.id)
+            .where(BroadcastReceipt.broadcast_id == self.model.id, BroadcastReceipt.user_id == user_id)
+            .exists()
+        )
+        result = await db.execute(
+            select(func.count(self.model.id))
+            .filter(self.audience_filter(user_id), ~receipt_exists)
+        )
+        return result.scalar_one()
+
+    async def get_for_user(self, db: AsyncSession, *, broadcast_id: int, user_id: int) -> Optional[Broadcast]:
+        result = await db.execute(
+            select(self.model).filter(self.model.id == broadcast_id, self.audience_filter(user_id))
+        )
+        return result.scalars().first()
+
+    async def mark_as_read(self, db: AsyncSession, *, broadcast_id: int, user_id: int) -> bool:
+        """
+        Records a read receipt; returns False if the user had already read the broadcast.
+        """
+        result = await db.execute(
+            insert(BroadcastReceipt)
+            .values(broadcast_id=broadcast_id, user_id=user_id)
+            .on_conflict_do_nothing(constraint="uq_broadcast_receipt_user")
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    async def mark_all_read(self, db: AsyncSession, *, user_id: int, before: Optional[datetime] = None) -> int:
+        """
+        Adds receipts for every unread broadcast addressed to the user in one INSERT ... SELECT.
+        Does not commit. Returns the number of broadcasts marked as read.
+        """
+        unread = (
+            select(self.model.id, literal(user_id))
+            .filter(self.audience_filter(user_id))
+        )
+        if before is not None:
+            unread = unread.filter(self.model.created_at <= before)
+        result = await db.execute(
+            insert(BroadcastReceipt)
+            .from_select(["broadcast_id", "user_id"], unread)
+            .on_conflict_do_nothing(constraint="uq_broadcast_receipt_user")
+        )
+        return result.rowcount
+
+crud_broadcast = CRUDBroadcast(Broadcast)
@@ -3,7 +3,7 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy import func
 
-from app.crud.base import CRUDBase
+from app.crud.crud_base import CRUDBase
 from app.models import Doctor, User
 from app.schemas.doctor import DoctorCreate, DoctorUpdate
 
@@ -0,0 +1,118 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Float, Integer, and_, bindparam, case, cast, func, literal, null, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_base import escape_like
+from app.models import Doctor, DoctorSearchDocument
+
+DOCUMENT_COLUMNS = [
+    "doctor_id", "name", "specialty", "specialty_key", "photo_url", "search_text",
+    "avg_rating", "review_count", "next_available_at", "is_active", "updated_at",
+]
+
+
+def encode_cursor(document: DoctorSearchDocument) -> str:
+    payload = json.dumps([document.avg_rating, document.doctor_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Raises ValueError for cursors that were not produced by `encode_cursor`.
+    """
+    try:
+        rating, doctor_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rating), int(doctor_id)
+    except (TypeError, json.JSONDecodeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class CRUDDoctorSearch:
+    def __init__(self, model):
+        self.model = model
+
+    async def refresh(
+        self, db: AsyncSession, *, doctor_ids: Optional[List[int]] = None,
+        next_available: Optional[Dict[int, datetime]] = None
+    ) -> None:
+        """
+        Rebuilds the search documents of `doctor_ids` (all doctors if None) with one
+        INSERT ... SELECT ... ON CONFLICT, then commits. `next_available` maps doctors to
+        their next free slot, from `app.availability.next_free_slots`; doctors missing from
+        it have none. If it is None, existing documents keep their next_available_at.
+        """
+        now = datetime.utcnow()
+        # two parallel arrays, so any number of doctors binds as two parameters
+        next_slots = select(
+            func.unnest(bindparam("next_doctor_ids", list(next_available or {}), type_=ARRAY(Integer)))
+            .label("doctor_id"),
+            func.unnest(bindparam("next_slots", list((next_available or {}).values()), type_=ARRAY(DateTime)))
+            .label("next_available_at"),
+        ).subquery()
+        source = (
+            select(
+                Doctor.id,
+                Doctor.name,
+                Doctor.specialty,
+                func.lower(func.btrim(Doctor.specialty)),
+                Doctor.photo_url,
+                func.lower(func.concat_ws(" ", Doctor.name, Doctor.specialty)),
+                case((Doctor.rating_count > 0, cast(Doctor.rating_sum, Float) / Doctor.rating_count), else_=0.0),
+                Doctor.rating_count,
+                next_slots.c.next_available_at if next_available is not None else null(),
+                func.coalesce(Doctor.is_active, True),
+                literal(now),
+            )
+        )
+        if next_available is not None:
+            source = source.outerjoin(next_slots, next_slots.c.doctor_id == Doctor.id)
+        if doctor_ids is not None:
+            source = source.filter(Doctor.id.in_(doctor_ids))
+        stmt = insert(self.model).from_select(DOCUMENT_COLUMNS, source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.doctor_id],
+            set_={
+                name: stmt.excluded[name] for name in DOCUMENT_COLUMNS[1:]
+                if next_available is not None or name != "next_available_at"
+            },
+        )
+        await db.execute(stmt)
+        await db.commit()
+
+    async def search(
+        self, db: AsyncSession, *, specialty: Optional[str] = None, q: Optional[str] = None,
+        min_rating: Optional[float] = None, available_before: Optional[datetime] = None,
+        after: Optional[Tuple[float, int]] = None, limit: int = 20
+    ) -> List[DoctorSearchDocument]:
+        """
+        Active doctors matching every given filter, best rated first. `after` is the
+        (avg_rating, doctor_id) of the last row of the previous page.
+        """
+        document = self.model
+        query = select(document).filter(document.is_active == True)
+        if specialty:
+            query = query.filter(document.specialty_key == specialty.strip().lower())
+        if q:
+            query = query.filter(document.search_text.like(f"%{escape_like(q.strip().lower())}%", escape="\\"))
+        if min_rating is not None:
+            query = query.filter(document.avg_rating >= min_rating)
+        if available_before is not None:
+            query = query.filter(document.next_available_at <= available_before)
+        if after is not None:
+            rating, doctor_id = after
+            query = query.filter(or_(
+                document.avg_rating < rating,
+                and_(document.avg_rating == rating, document.doctor_id > doctor_id),
+            ))
+        query = query.order_by(document.avg_rating.desc(), document.doctor_id).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+
+crud_doctor_search = CRUDDoctorSearch(DoctorSearchDocument)
@@ -1,10 +1,102 @@
-from app.crud.crud_base import CRUDBase
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, table, column, insert, func, select
+from typing import List, Optional, Tuple
+
+from app.crud.crud_base import CRUDBase, escape_like
 from app.db.base import Hospital
 from app.schemas.hospital import HospitalCreate, HospitalUpdate
 
+STAGING_TABLE = "hospital_import_staging"
+INSERT_CHUNK_SIZE = 1000
+
 
 class CRUDHospital(CRUDBase[Hospital, HospitalCreate, HospitalUpdate]):
-    pass
+    async def get_directory_rows(self, db: AsyncSession) -> List[Tuple[Hospital, List[str]]]:
+        """
+        Every hospital with its normalized department list, ordered by id.
+        """
+        result = await db.execute(select(Hospital, Hospital.department_list).order_by(Hospital.id))
+        return [tuple(row) for row in result.all()]
+
+    async def get_multi_filtered(
+        self, db: AsyncSession, *, department: Optional[str] = None, status: Optional[str] = None,
+        name_prefix: Optional[str] = None, skip: int = 0, limit: int = 100
+    ) -> List[Hospital]:
+        """
+        Database counterpart of the hospital directory filters; `department` is served by
+        the GIN index on `department_list`.
+        """
+        query = select(Hospital)
+        if department:
+            query = query.filter(Hospital.department_list.contains([department.strip().lower()]))
+        if status:
+            query = query.filter(func.lower(func.btrim(Hospital.current_status)) == status.strip().lower())
+        if name_prefix:
+            query = query.filter(Hospital.name.ilike(f"{escape_like(name_prefix.strip())}%", escape="\\"))
+        result = await db.execute(query.order_by(Hospital.id).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    async def has_extension(self, db: AsyncSession, *, name: str) -> bool:
+        result = await db.execute(text("SELECT 1 FROM pg_extension WHERE extname = :name"), {"name": name})
+        return result.first() is not None
+
+    async def get_in_earth_box(
+        self, db: AsyncSession, *, lat: float, lng: float, angle: float, limit: int
+    ) -> List[Hospital]:
+        """
+        Hospitals inside the earthdistance box bounding a great-circle `angle` (radians)
+        around (lat, lng), closest first. The box test is served by the GiST index on
+        ll_to_earth(latitude, longitude); callers trim the corners by exact distance.
+        """
+        origin = func.ll_to_earth(lat, lng)
+        location = func.ll_to_earth(Hospital.latitude, Hospital.longitude)
+        result = await db.execute(
+            select(Hospital)
+            .filter(func.earth_box(origin, angle * func.earth()).op("@>")(location))
+            .order_by(func.earth_distance(origin, location))
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def create_staging_table(self, db: AsyncSession, *, columns: List[str]) -> None:
+        """
+        Creates an empty temporary table with the given hospital columns; it is dropped on commit.
+        """
+        await db.execute(text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} FROM {self.model.__tablename__} WITH NO DATA"
+        ))
+
+    async def stage(self, db: AsyncSession, *, columns: List[str], records: List[tuple]) -> None:
+        """
+        Loads records into the staging table with COPY on asyncpg, or chunked multi-row INSERTs otherwise.
+        """
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if hasattr(driver_connection, "copy_records_to_table"):
+            await driver_connection.copy_records_to_table(STAGING_TABLE, records=records, columns=columns)
+            return
+        staging = table(STAGING_TABLE, *[column(name) for name in columns])
+        for start in range(0, len(records), INSERT_CHUNK_SIZE):
+            chunk = records[start:start + INSERT_CHUNK_SIZE]
+            await db.execute(insert(staging).values([dict(zip(columns, record)) for record in chunk]))
+
+    async def merge_staged(self, db: AsyncSession, *, columns: List[str]) -> List[Tuple[str, str]]:
+        """
+        Inserts the staged rows whose (name, address) is not already present with a single
+        INSERT ... SELECT, without committing. Returns the (name, address) pairs inserted.
+        """
+        result = await db.execute(text(
+            f"INSERT INTO {self.model.__tablename__} ({', '.join(columns)}) "
+            f"SELECT DISTINCT ON (s.name, s.address) {', '.join('s.' + name for name in columns)} "
+            f"FROM {STAGING_TABLE} s "
+            f"WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {self.model.__tablename__} h WHERE h.name = s.name AND h.address = s.address"
+            f") RETURNING name, address"
+        ))
+        return [tuple(row) for row in result.all()]
 
 
-hospital = CRUDHospital(Hospital)
+crud_hospital = CRUDHospital(Hospital)
+hospital = crud_hospital
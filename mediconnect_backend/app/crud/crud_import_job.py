@@ -0,0 +1,8 @@
+from app.crud.crud_base import CRUDBase
+from app.schemas.import_job import ImportJobCreate, ImportJobUpdate
+from app.db.base import ImportJob
+
+class CRUDImportJob(CRUDBase[ImportJob, ImportJobCreate, ImportJobUpdate]):
+    pass
+
+crud_import_job = CRUDImportJob(ImportJob)
@@ -1,12 +1,45 @@
+import heapq
+from itertools import islice
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Dict, List, Optional, Union
 from app.crud.crud_base import CRUDBase
-from app.schemas.notification import NotificationCreate, NotificationUpdate
-from app.db.base import Notification
-from sqlalchemy import func
+from app.crud.crud_broadcast import crud_broadcast
+from app.schemas.notification import NotificationCreate, NotificationUpdate, NotificationFeedItem
+from app.db.base import Notification, NotificationCounter
+from sqlalchemy import func, update, delete, exists
+from datetime import datetime
 
 class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUpdate]):
+    async def create(self, db: AsyncSession, *, obj_in: NotificationCreate) -> Notification:
+        db_obj = self.model(**jsonable_encoder(obj_in))
+        db.add(db_obj)
+        await self.adjust_unread_counts(db, {db_obj.user_id: 1})
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: Notification, obj_in: Union[NotificationUpdate, Dict[str, Any]]
+    ) -> Notification:
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        if "is_read" in update_data and bool(update_data["is_read"]) != db_obj.is_read:
+            await self.adjust_unread_counts(db, {db_obj.user_id: -1 if update_data["is_read"] else 1})
+        return await super().update(db, db_obj=db_obj, obj_in=obj_in)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Notification]:
+        result = await db.execute(select(self.model).filter(self.model.id == id))
+        obj = result.scalars().first()
+        if obj is None:
+            return None
+        if not obj.is_read:
+            await self.adjust_unread_counts(db, {obj.user_id: -1})
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
     async def get_multi_by_user(
         self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
     ) -> List[Notification]:
@@ -19,20 +52,156 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         )
         return result.scalars().all()
 
+    async def get_feed(
+        self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[NotificationFeedItem]:
+        """
+        The user's own notifications merged with the broadcasts addressed to them, newest first.
+        Both sources are read already sorted, so only the first `skip + limit` rows of each are needed.
+        """
+        window = skip + limit
+        direct = await self.get_multi_by_user(db, user_id=user_id, limit=window)
+        broadcasts = await crud_broadcast.get_multi_for_user(db, user_id=user_id, limit=window)
+
+        direct_items = (
+            NotificationFeedItem(
+                id=n.id, message=n.message, created_at=n.created_at, is_read=n.is_read, source="direct"
+            )
+            for n in direct
+        )
+        broadcast_items = (
+            NotificationFeedItem(
+                id=b.id, message=b.message, created_at=b.created_at, is_read=read_at is not None, source="broadcast"
+            )
+            for b, read_at in broadcasts
+        )
+        merged = heapq.merge(direct_items, broadcast_items, key=lambda item: item.created_at, reverse=True)
+        return list(islice(merged, skip, window))
+
     async def get_unread_count(self, db: AsyncSession, *, user_id: int) -> int:
+        """
+        Reads the materialized counter for direct notifications; broadcasts are counted at read time.
+        """
         result = await db.execute(
-            select(func.count(self.model.id))
-            .filter(self.model.user_id == user_id, self.model.is_read == False)
+            select(NotificationCounter.unread_count).filter(NotificationCounter.user_id == user_id)
         )
-        return result.scalar_one()
+        unread_count = result.scalar_one_or_none() or 0
+        return unread_count + await crud_broadcast.get_unread_count(db, user_id=user_id)
 
     async def mark_as_read(self, db: AsyncSession, *, notification_id: int, user_id: int) -> Optional[Notification]:
+        """
+        Marks one of the user's notifications as read. The UPDATE only matches an unread row,
+        so of two concurrent calls just one gets a row back and decrements the counter.
+        """
+        flipped = await db.execute(
+            update(self.model)
+            .where(self.model.id == notification_id, self.model.user_id == user_id, self.model.is_read == False)
+            .values(is_read=True)
+            .returning(self.model.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        owner = flipped.scalar_one_or_none()
+        if owner is not None:
+            await self.adjust_unread_counts(db, {owner: -1})
+        await db.commit()
         result = await db.execute(select(self.model).filter(self.model.id == notification_id, self.model.user_id == user_id))
-        notification = result.scalars().first()
-        if notification:
-            notification.is_read = True
-            await db.commit()
-            await db.refresh(notification)
-        return notification
-
-crud_notification = CRUDNotification(Notification)
\ No newline at end of file
+        return result.scalars().first()
+
+    async def mark_all_read(self, db: AsyncSession, *, user_id: int, before: Optional[datetime] = None) -> int:
+        """
+        Marks all of the user's notifications, optionally only those created up to `before`,
+        as read with one UPDATE, and records receipts for matching broadcasts.
+        Returns the number of notifications affected.
+        """
+        stmt = update(self.model).where(self.model.user_id == user_id, self.model.is_read == False)
+        if before is not None:
+            stmt = stmt.where(self.model.created_at <= before)
+        result = await db.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+        await self.adjust_unread_counts(db, {user_id: -result.rowcount})
+        broadcasts_read = await crud_broadcast.mark_all_read(db, user_id=user_id, before=before)
+        await db.commit()
+        return result.rowcount + broadcasts_read
+
+    async def mark_read(self, db: AsyncSession, *, ids: List[int], user_id: int) -> int:
+        """
+        Marks the given notifications of the user as read with one UPDATE; returns the number affected.
+        """
+        if not ids:
+            return 0
+        result = await db.execute(
+            update(self.model)
+            .where(self.model.id.in_(ids), self.model.user_id == user_id, self.model.is_read == False)
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        await self.adjust_unread_counts(db, {user_id: -result.rowcount})
+        await db.commit()
+        return result.rowcount
+
+    async def remove_many(self, db: AsyncSession, *, ids: List[int], user_id: int) -> int:
+        """
+        Deletes the given notifications of the user with one DELETE; returns the number deleted.
+        """
+        if not ids:
+            return 0
+        result = await db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids), self.model.user_id == user_id)
+            .returning(self.model.is_read)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.scalars().all()
+        await self.adjust_unread_counts(db, {user_id: -deleted.count(False)})
+        await db.commit()
+        return len(deleted)
+
+    async def adjust_unread_counts(self, db: AsyncSession, deltas: Dict[int, int]) -> None:
+        """
+        Applies per-user unread deltas as a single atomic upsert. Does not commit, so the
+        change lands in the same transaction as the notification write that caused it.
+        """
+        rows = [
+            {"user_id": user_id, "unread_count": delta}
+            for user_id, delta in deltas.items()
+            if user_id is not None and delta
+        ]
+        if not rows:
+            return
+        stmt = insert(NotificationCounter).values(rows)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={"unread_count": func.greatest(NotificationCounter.unread_count + stmt.excluded.unread_count, 0)},
+            )
+        )
+
+    async def reconcile_unread_counts(self, db: AsyncSession) -> int:
+        """
+        Recomputes every counter from `notifications` and overwrites the ones that drifted.
+        Returns the number of counters repaired.
+        """
+        actual = (
+            select(self.model.user_id, func.count(self.model.id))
+            .filter(self.model.is_read == False, self.model.user_id.isnot(None))
+            .group_by(self.model.user_id)
+        )
+        stmt = insert(NotificationCounter).from_select(["user_id", "unread_count"], actual)
+        upserted = await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={"unread_count": stmt.excluded.unread_count},
+                where=NotificationCounter.unread_count != stmt.excluded.unread_count,
+            )
+        )
+        has_unread = exists().where(
+            self.model.user_id == NotificationCounter.user_id, self.model.is_read == False
+        )
+        zeroed = await db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.unread_count != 0, ~has_unread)
+            .values(unread_count=0)
+        )
+        await db.commit()
+        return upserted.rowcount + zeroed.rowcount
+
+crud_notification = CRUDNotification(Notification)
@@ -1,13 +1,77 @@
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from sqlalchemy import func
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import func, update
+from fastapi.encoders import jsonable_encoder
 
 from app.crud.crud_base import CRUDBase
 from app.schemas.review import ReviewCreate, ReviewUpdate
-from app.db.base import Review
+from app.db.base import Review, Doctor, Patient
 
 class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
+    async def _adjust_doctor_rating(
+        self, db: AsyncSession, *, doctor_id: int, rating_delta: int, count_delta: int
+    ) -> None:
+        """
+        Applies a review change to the doctor's rating totals without committing.
+        """
+        await db.execute(
+            update(Doctor)
+            .where(Doctor.id == doctor_id)
+            .values(
+                rating_sum=Doctor.rating_sum + rating_delta,
+                rating_count=Doctor.rating_count + count_delta,
+            )
+        )
+
+    async def create(self, db: AsyncSession, *, obj_in: ReviewCreate) -> Review:
+        db_obj = self.model(**jsonable_encoder(obj_in))
+        db.add(db_obj)
+        await self._adjust_doctor_rating(db, doctor_id=db_obj.doctor_id, rating_delta=db_obj.rating, count_delta=1)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def create_with_owner(self, db: AsyncSession, *, obj_in: ReviewCreate, owner_id: int) -> Optional[Review]:
+        """
+        Creates a review on behalf of the user `owner_id`, attributed to their patient profile.
+        Returns None when the user has no patient profile.
+        """
+        result = await db.execute(select(Patient.id).filter(Patient.user_id == owner_id))
+        patient_id = result.scalar_one_or_none()
+        if patient_id is None:
+            return None
+        obj_in = obj_in.model_copy(update={"patient_id": patient_id})
+        return await self.create(db, obj_in=obj_in)
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: Review, obj_in: Union[ReviewUpdate, Dict[str, Any]]
+    ) -> Review:
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        # an explicit null rating or doctor means "unchanged", not "clear it"
+        update_data = {
+            k: v for k, v in update_data.items() if not (k in ("rating", "doctor_id") and v is None)
+        }
+        old_doctor_id, old_rating = db_obj.doctor_id, db_obj.rating
+        new_doctor_id = update_data.get("doctor_id", old_doctor_id)
+        new_rating = update_data.get("rating", old_rating)
+        if new_doctor_id != old_doctor_id:
+            await self._adjust_doctor_rating(db, doctor_id=old_doctor_id, rating_delta=-old_rating, count_delta=-1)
+            await self._adjust_doctor_rating(db, doctor_id=new_doctor_id, rating_delta=new_rating, count_delta=1)
+        elif new_rating != old_rating:
+            await self._adjust_doctor_rating(db, doctor_id=old_doctor_id, rating_delta=new_rating - old_rating, count_delta=0)
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Review]:
+        result = await db.execute(select(self.model).filter(self.model.id == id))
+        obj = result.scalars().first()
+        if obj is None:
+            return None
+        await self._adjust_doctor_rating(db, doctor_id=obj.doctor_id, rating_delta=-obj.rating, count_delta=-1)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
     async def get_multi_by_doctor(
         self, db: AsyncSession, *, doctor_id: int, skip: int = 0, limit: int = 100
     ) -> List[Review]:
@@ -30,14 +94,6 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
         )
         return result.scalars().all()
 
-    async def get_doctor_average_rating(self, db: AsyncSession, *, doctor_id: int) -> float:
-        result = await db.execute(
-            select(func.avg(self.model.rating))
-            .filter(self.model.doctor_id == doctor_id)
-        )
-        average_rating = result.scalar_one_or_none()
-        return average_rating if average_rating is not None else 0.0
-
     async def get_by_patient_and_doctor(self, db: AsyncSession, *, patient_id: int, doctor_id: int) -> Review | None:
         result = await db.execute(
             select(self.model)
@@ -45,4 +101,38 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
         )
         return result.scalars().first()
 
+    async def get_doctor_average_rating(self, db: AsyncSession, *, doctor_id: int) -> float:
+        result = await db.execute(
+            select(Doctor.rating_sum, Doctor.rating_count).filter(Doctor.id == doctor_id)
+        )
+        row = result.first()
+        return row.rating_sum / row.rating_count if row and row.rating_count else 0.0
+
+    async def reconcile_doctor_ratings(self, db: AsyncSession) -> int:
+        """
+        Recomputes every doctor's rating totals from `reviews`, fixing rows that drifted
+        (or were never backfilled). Returns the number of doctors repaired.
+        """
+        totals = (
+            select(
+                Doctor.id.label("doctor_id"),
+                func.coalesce(func.sum(self.model.rating), 0).label("rating_sum"),
+                func.count(self.model.id).label("rating_count"),
+            )
+            .outerjoin(self.model, self.model.doctor_id == Doctor.id)
+            .group_by(Doctor.id)
+            .subquery()
+        )
+        result = await db.execute(
+            update(Doctor)
+            .where(
+                Doctor.id == totals.c.doctor_id,
+                (Doctor.rating_sum != totals.c.rating_sum) | (Doctor.rating_count != totals.c.rating_count),
+            )
+            .values(rating_sum=totals.c.rating_sum, rating_count=totals.c.rating_count)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+
 crud_review = CRUDReview(Review)
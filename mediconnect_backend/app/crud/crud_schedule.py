@@ -0,0 +1,46 @@
+from datetime import date, time
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.crud_base import CRUDBase
+from app.models import Schedule
+from app.schemas.schedule import ScheduleCreate
+
+
+class CRUDSchedule(CRUDBase[Schedule, ScheduleCreate, ScheduleCreate]):
+    async def get_available_windows(
+        self, db: AsyncSession, *, doctor_id: int, start: date, end: date
+    ) -> List[Schedule]:
+        result = await db.execute(
+            select(self.model)
+            .filter(
+                self.model.doctor_id == doctor_id,
+                self.model.date >= start,
+                self.model.date <= end,
+                self.model.is_available == True,
+            )
+            .order_by(self.model.date, self.model.start_time)
+        )
+        return result.scalars().all()
+
+    async def get_windows_by_doctor(
+        self, db: AsyncSession, *, start: date, end: date, doctor_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, date, time, time]]:
+        """
+        (doctor_id, date, start_time, end_time) of the available windows in [start, end],
+        for `doctor_ids` or every doctor if None.
+        """
+        query = select(self.model.doctor_id, self.model.date, self.model.start_time, self.model.end_time).filter(
+            self.model.date >= start,
+            self.model.date <= end,
+            self.model.is_available == True,
+        )
+        if doctor_ids is not None:
+            query = query.filter(self.model.doctor_id.in_(doctor_ids))
+        result = await db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+
+crud_schedule = CRUDSchedule(Schedule)
@@ -1,15 +1,45 @@
-
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Dict, Any
-from sqlalchemy import func
-from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func, cast, Date
+from datetime import date, datetime, timedelta
 
 from app.crud.crud_base import CRUDBase
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
-from app.db.base import Transaction
+from app.db.base import Transaction, RevenueDaily, RollupWatermark
+
+REVENUE_ROLLUP = "revenue_daily"
+# days before the watermark that every rollup run recomputes, to pick up rows that raced the previous run
+REVENUE_RECOMPUTE_DAYS = 3
 
 class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate]):
+    async def create(self, db: AsyncSession, *, obj_in: TransactionCreate) -> Transaction:
+        # model_dump, not jsonable_encoder: the timestamp must stay a datetime
+        db_obj = self.model(**obj_in.model_dump())
+        db.add(db_obj)
+        # Days before the watermark are final in the rollup, so late (backdated) rows
+        # are added to them here; newer rows are covered by the realtime tail and the next rollup run.
+        # The watermark is read without a lock: a row that races a rollup run lands in a day
+        # that the next run recomputes.
+        rolled_through = await self._rolled_through(db)
+        if rolled_through is not None and db_obj.timestamp.date() < rolled_through:
+            stmt = insert(RevenueDaily).values(
+                day=db_obj.timestamp.date(), total_revenue=db_obj.amount, transaction_count=1
+            )
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[RevenueDaily.day],
+                    set_={
+                        "total_revenue": RevenueDaily.total_revenue + stmt.excluded.total_revenue,
+                        "transaction_count": RevenueDaily.transaction_count + 1,
+                    },
+                )
+            )
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
     async def get_by_user(
         self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
     ) -> List[Transaction]:
@@ -21,24 +51,66 @@ class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
         )
         return result.scalars().all()
 
-    async def get_total_revenue(self, db: AsyncSession) -> float:
-        result = await db.execute(
-            select(func.sum(self.model.amount))
-        )
+    async def get_total_revenue(self, db: AsyncSession, *, realtime: bool = True) -> float:
+        """
+        Total revenue from the daily rollup, plus the not-yet-rolled-up tail when `realtime` is set.
+        Falls back to scanning `transactions` until the rollup has run once.
+        """
+        rolled_through = await self._rolled_through(db)
+        if rolled_through is None:
+            result = await db.execute(
+                select(func.sum(self.model.amount))
+            )
+            return result.scalar_one_or_none() or 0.0
+
+        result = await db.execute(select(func.sum(RevenueDaily.total_revenue)))
         total_revenue = result.scalar_one_or_none() or 0.0
+        if realtime:
+            result = await db.execute(
+                select(func.sum(self.model.amount))
+                .filter(self.model.timestamp >= datetime.combine(rolled_through, datetime.min.time()))
+            )
+            total_revenue += result.scalar_one_or_none() or 0.0
         return total_revenue
 
-    async def get_revenue_by_month(self, db: AsyncSession) -> List[Dict[str, Any]]:
-        result = await db.execute(
+    async def get_revenue_by_month(self, db: AsyncSession, *, realtime: bool = True) -> List[Dict[str, Any]]:
+        """
+        Monthly revenue from the daily rollup, plus the not-yet-rolled-up tail when `realtime` is set.
+        Falls back to scanning `transactions` until the rollup has run once.
+        """
+        rolled_through = await self._rolled_through(db)
+        live_by_month = (
             select(
                 func.date_trunc('month', self.model.timestamp).label('month'),
                 func.sum(self.model.amount).label('total_revenue')
             )
             .group_by('month')
-            .order_by('month')
         )
-        return [{'month': row.month.strftime('%B %Y'), 'revenue': row.total_revenue} for row in result.all()]
-    
+        revenue_by_month: Dict[datetime, float] = {}
+        if rolled_through is None:
+            queries = [live_by_month]
+        else:
+            rolled_by_month = (
+                select(
+                    func.date_trunc('month', RevenueDaily.day).label('month'),
+                    func.sum(RevenueDaily.total_revenue).label('total_revenue')
+                )
+                .group_by('month')
+            )
+            queries = [rolled_by_month]
+            if realtime:
+                queries.append(
+                    live_by_month.filter(self.model.timestamp >= datetime.combine(rolled_through, datetime.min.time()))
+                )
+        for query in queries:
+            result = await db.execute(query)
+            for row in result.all():
+                revenue_by_month[row.month] = revenue_by_month.get(row.month, 0.0) + row.total_revenue
+        return [
+            {'month': month.strftime('%B %Y'), 'revenue': revenue}
+            for month, revenue in sorted(revenue_by_month.items())
+        ]
+
     async def get_transactions(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 10
     ) -> List[Transaction]:
@@ -47,4 +119,63 @@ class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
         )
         return result.scalars().all()
 
+    async def roll_up_revenue(self, db: AsyncSession, *, until: date) -> Optional[date]:
+        """
+        Rolls every complete day from the watermark up to (not including) `until` into
+        `revenue_daily` and advances the watermark. The last REVENUE_RECOMPUTE_DAYS days
+        before the watermark are recomputed as well, since transaction inserts do not lock
+        the watermark and one committed after the previous run read its day would be missing.
+        Days are overwritten, not added to, so recomputing them never double counts. The
+        watermark row is locked, so concurrent runs from several workers serialize.
+        Returns the first day that was rolled up, or None if there was nothing to do.
+        """
+        await db.execute(
+            insert(RollupWatermark).values(name=REVENUE_ROLLUP).on_conflict_do_nothing()
+        )
+        result = await db.execute(
+            select(RollupWatermark).filter(RollupWatermark.name == REVENUE_ROLLUP).with_for_update()
+        )
+        watermark = result.scalars().one()
+        rolled_through = watermark.rolled_through
+        if rolled_through is None:
+            result = await db.execute(select(func.min(self.model.timestamp)))
+            first_timestamp = result.scalar_one_or_none()
+            rolled_through = first_timestamp.date() if first_timestamp is not None else until
+            start = rolled_through
+        else:
+            start = min(rolled_through, until) - timedelta(days=REVENUE_RECOMPUTE_DAYS)
+        if start >= until:
+            watermark.rolled_through = rolled_through
+            await db.commit()
+            return None
+
+        day = cast(self.model.timestamp, Date).label('day')
+        daily = (
+            select(day, func.sum(self.model.amount), func.count(self.model.id))
+            .filter(
+                self.model.timestamp >= datetime.combine(start, datetime.min.time()),
+                self.model.timestamp < datetime.combine(until, datetime.min.time()),
+            )
+            .group_by(day)
+        )
+        stmt = insert(RevenueDaily).from_select(["day", "total_revenue", "transaction_count"], daily)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RevenueDaily.day],
+                set_={
+                    "total_revenue": stmt.excluded.total_revenue,
+                    "transaction_count": stmt.excluded.transaction_count,
+                },
+            )
+        )
+        watermark.rolled_through = max(rolled_through, until)
+        await db.commit()
+        return start
+
+    async def _rolled_through(self, db: AsyncSession) -> Optional[date]:
+        result = await db.execute(
+            select(RollupWatermark.rolled_through).filter(RollupWatermark.name == REVENUE_ROLLUP)
+        )
+        return result.scalar_one_or_none()
+
 crud_transaction = CRUDTransaction(Transaction)
@@ -1,13 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, or_, literal
 from sqlalchemy.orm import selectinload
 
 from app.core.security import get_password_hash
 from app.db.base import User
 from app.schemas.user import UserCreate, UserUpdate
 from typing import Optional, List
-from app.crud.base import CRUDBase
+from app.crud.crud_base import CRUDBase, CountMode, escape_like
 from app.models import Role
 
 
@@ -46,9 +46,55 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         )
         return result.scalars().all()
 
-    async def count(self, db: AsyncSession) -> int:
-        result = await db.execute(select(func.count()).select_from(User))
-        return result.scalar_one()
+    def _search_filters(self, *, search: Optional[str], role: Optional[str]) -> list:
+        filters = []
+        if role:
+            filters.append(User.role_id.in_(select(Role.id).filter(Role.role == role)))
+        if search:
+            pattern = f"%{escape_like(search)}%"
+            filters.append(or_(
+                User.email.ilike(pattern, escape="\\"),
+                User.full_name.ilike(pattern, escape="\\"),
+                User.phone.ilike(pattern, escape="\\"),
+                # pg_trgm word similarity: tolerates typos in names
+                literal(search).op("<%")(User.full_name),
+            ))
+        return filters
+
+    async def search_users(
+        self, db: AsyncSession, *, search: Optional[str] = None, role: Optional[str] = None,
+        skip: int = 0, limit: int = 100
+    ) -> List[User]:
+        """
+        Searches email, full name and phone through the trigram indexes. Matches are ranked
+        with exact-prefix hits first, then by trigram similarity.
+        """
+        query = select(User).filter(*self._search_filters(search=search, role=role))
+        if search:
+            prefix = f"{escape_like(search)}%"
+            is_prefix_match = func.coalesce(or_(
+                User.email.ilike(prefix, escape="\\"),
+                User.full_name.ilike(prefix, escape="\\"),
+                User.phone.ilike(prefix, escape="\\"),
+            ), False)
+            similarity = func.greatest(
+                func.similarity(User.email, search),
+                func.word_similarity(search, User.full_name),
+                func.similarity(func.coalesce(User.phone, ""), search),
+            )
+            query = query.order_by(is_prefix_match.desc(), similarity.desc(), User.id)
+        else:
+            query = query.order_by(User.id)
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
+
+    async def count_users(
+        self, db: AsyncSession, *, search: Optional[str] = None, role: Optional[str] = None,
+        count_mode: CountMode = "exact"
+    ) -> Optional[int]:
+        return await self.count_where(
+            db, *self._search_filters(search=search, role=role), count_mode=count_mode
+        )
 
 
 crud_user = CRUDUser(User)
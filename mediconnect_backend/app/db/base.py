@@ -1,3 +1,5 @@
+from sqlalchemy import DDL, event
+
 from app.db.base_class import Base
 from app.models.user import User
 from app.models.patient import Patient
@@ -5,11 +7,24 @@ from app.models.doctor import Doctor
 from app.models.appointment import Appointment
 from app.models.consultation import Consultation
 from app.models.transaction import Transaction
+from app.models.revenue import RevenueDaily, RollupWatermark
 from app.models.review import Review
 from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+from app.models.broadcast import Broadcast, BroadcastReceipt
 from app.models.medication import Medication
 from app.models.permission import Permission
 from app.models.hospital import Hospital
+from app.models.doctor_search import DoctorSearchDocument
+from app.models.import_job import ImportJob
 from app.models.subscription import Subscription
 from app.models.allergy import Allergy
 from app.models.calorie import Calorie
+
+
+# gin_trgm_ops indexes (users, doctor_search_documents) need pg_trgm before their tables exist
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
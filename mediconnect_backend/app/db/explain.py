@@ -0,0 +1,41 @@
+import json
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """
+    `EXPLAIN (<options>) <statement>` for a Core/ORM statement, keeping its bind parameters.
+    """
+    inherit_cache = False
+
+    def __init__(self, statement: Any, options: str = "FORMAT JSON"):
+        self.statement = statement
+        self.options = options
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN ({element.options}) {compiler.process(element.statement, **kw)}"
+
+
+async def explain_plan(db: AsyncSession, statement: Any) -> dict:
+    """
+    Returns the planner's top-level plan node for `statement` without executing it.
+    """
+    result = await db.execute(Explain(statement))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def estimate_rows(db: AsyncSession, statement: Any) -> int:
+    """
+    The planner's row estimate for `statement`, from table statistics rather than a scan.
+    """
+    plan = await explain_plan(db, statement)
+    return int(plan["Plan Rows"])
@@ -0,0 +1,140 @@
+"""
+Helpers for migrations that must not take the site down on large tables.
+
+Every DDL statement that needs a table lock waits at most `lock_timeout` for it, so a
+long-running transaction makes the migration fail fast instead of queueing every
+other query behind the ALTER. Indexes are built CONCURRENTLY and data is backfilled
+in short, separately committed batches.
+"""
+import logging
+import time
+from typing import Callable, Optional, Sequence
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCK_TIMEOUT = "5s"
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def set_lock_timeout(timeout: str = DEFAULT_LOCK_TIMEOUT) -> None:
+    op.execute(f"SET lock_timeout = '{timeout}'")
+
+
+def with_lock_retries(operation: Callable[[], None], *, attempts: int = 5, delay: float = 2.0) -> None:
+    """
+    Runs `operation` inside a savepoint, retrying with a growing pause when it times out
+    waiting for a lock. Other errors are raised immediately. Inside an autocommit block
+    every statement is its own transaction, so there is no savepoint to roll back to.
+    """
+    if op.get_context().as_sql:
+        operation()
+        return
+    bind = op.get_bind()
+    autocommit = bind.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+    for attempt in range(1, attempts + 1):
+        savepoint = None if autocommit else bind.begin_nested()
+        try:
+            operation()
+        except OperationalError as e:
+            if savepoint is not None:
+                savepoint.rollback()
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or attempt == attempts:
+                raise
+            logger.warning(f"Lock not available (attempt {attempt}/{attempts}), retrying")
+            time.sleep(delay * attempt)
+        else:
+            if savepoint is not None:
+                savepoint.commit()
+            return
+
+
+def _drop_if_invalid(name: str) -> None:
+    # an interrupted CONCURRENTLY build leaves an INVALID index that IF NOT EXISTS would keep
+    invalid = op.get_bind().execute(
+        text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        logger.warning(f"Dropping invalid index {name} left by an earlier build")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def create_index_concurrently(
+    name: str, table: str, columns: Sequence, *, unique: bool = False,
+    using: Optional[str] = None, where: Optional[str] = None, ops: Optional[dict] = None,
+) -> None:
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS, outside the migration's transaction.
+    Writes to `table` keep flowing while the index builds.
+    """
+    with op.get_context().autocommit_block():
+        if not op.get_context().as_sql:
+            _drop_if_invalid(name)
+        op.create_index(
+            name, table, list(columns), unique=unique, if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_using=using,
+            postgresql_where=text(where) if where else None,
+            postgresql_ops=ops or {},
+        )
+
+
+def drop_index_concurrently(name: str) -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def backfill_in_batches(
+    table: str, assignments: str, *, where: Optional[str] = None,
+    key: str = "id", batch_size: int = 10000, pause: float = 0.0,
+) -> None:
+    """
+    UPDATE `table` SET `assignments` over consecutive `key` ranges of `batch_size`, each
+    range in its own transaction, so row locks are short-lived and autovacuum keeps up.
+    `where` narrows the rows touched in every batch, e.g. "created_at IS NULL".
+    """
+    condition = f" AND ({where})" if where else ""
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            op.execute(f"UPDATE {table} SET {assignments} WHERE TRUE{condition}")
+            return
+        bind = op.get_bind()
+        low, high = bind.execute(text(f"SELECT min({key}), max({key}) FROM {table}")).one()
+        if low is None:
+            return
+        updated = 0
+        for start in range(low, high + 1, batch_size):
+            result = bind.execute(
+                text(f"UPDATE {table} SET {assignments} WHERE {key} >= :start AND {key} < :end{condition}"),
+                {"start": start, "end": start + batch_size},
+            )
+            updated += result.rowcount
+            if pause:
+                time.sleep(pause)
+        logger.info(f"Backfilled {updated} rows of {table}")
+
+
+def set_not_null(table: str, column: str) -> None:
+    """
+    SET NOT NULL without holding an exclusive lock for a full table scan: the scan runs
+    while validating a NOT VALID check constraint, which only blocks schema changes,
+    and Postgres then uses the validated constraint to skip its own scan. Every step
+    commits on its own, outside the migration's transaction, so the exclusive lock of
+    ADD CONSTRAINT is released before the scan instead of being held until the end.
+    """
+    constraint = f"ck_{table}_{column}_not_null"
+    with op.get_context().autocommit_block():
+        with_lock_retries(lambda: op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}"))
+        with_lock_retries(lambda: op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID"
+        ))
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+        with_lock_retries(lambda: op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+        with_lock_retries(lambda: op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}"))
@@ -0,0 +1,128 @@
+"""
+Per-request SQL accounting for development and tests.
+
+`instrument(engine)` hooks cursor execution; while `track_queries()` is active every
+statement is counted and timed against the current request. `QueryBudgetMiddleware`
+reports the totals as `X-DB-Queries`/`X-DB-Time` headers and flags requests that run
+more statements than the budget, or the same statement shape many times over (the
+signature of an N+1 loop).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+# "IN (%(id_1)s, %(id_2)s, ...)" and friends: expanded lists differ only in length
+_PARAMETER_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\$\d+|\?|:\w+)(?:\s*,\s*(?:%\(\w+\)s|\$\d+|\?|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAMETER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.elapsed += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def problems(self, *, budget: int, repeat_threshold: int) -> List[str]:
+        found = []
+        if self.count > budget:
+            found.append(f"{self.count} SQL statements (budget {budget})")
+        for shape, repeats in self.shapes.most_common():
+            if repeats < repeat_threshold:
+                break
+            found.append(f"possible N+1: {repeats}x {shape[:200]}")
+        return found
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument(engine) -> None:
+    """
+    Counts statements run on `engine` (sync or async) for whichever request is tracking.
+    """
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "after_cursor_execute", _after_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI middleware adding `X-DB-Queries` and `X-DB-Time` (milliseconds) to every
+    response. Budget violations are logged, or raised as QueryBudgetExceeded in
+    strict mode so the test client fails the test.
+    """
+
+    def __init__(self, app, *, budget: int, repeat_threshold: int, strict: bool = False):
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    self.check(scope, stats)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time", f"{stats.elapsed * 1000:.1f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+    def check(self, scope, stats: QueryStats) -> None:
+        problems = stats.problems(budget=self.budget, repeat_threshold=self.repeat_threshold)
+        if not problems:
+            return
+        report = f"{scope['method']} {scope['path']}: " + "; ".join(problems)
+        if self.strict:
+            raise QueryBudgetExceeded(report)
+        logger.warning(report)
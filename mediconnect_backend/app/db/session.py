@@ -12,3 +12,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def run_in_session(query, *args, **kwargs):
+    """
+    Runs `query(session, *args, **kwargs)` on its own pooled session, so independent
+    queries can be awaited concurrently with `asyncio.gather`.
+    """
+    async with SessionLocal() as session:
+        return await query(session, *args, **kwargs)
@@ -0,0 +1,199 @@
+"""
+Slow-query log.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are kept in a ring buffer with the
+route that ran them, their duration and the shapes (never the values) of their bind
+parameters. A sampled fraction of slow SELECTs is re-run in the background under
+`EXPLAIN (ANALYZE, BUFFERS)` on a separate session, and the plan is attached to the
+entry. Admins read the buffer through GET /admin/slow-queries.
+"""
+import asyncio
+import itertools
+import logging
+import random
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import route_template
+from app.db.session import run_in_session
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+EXPLAIN_QUEUE_SIZE = 20
+EXPLAIN_STATEMENT_TIMEOUT_MS = 5000
+EXPLAIN_LOCK_TIMEOUT_MS = 500
+
+# row locks, SELECT INTO and functions with side effects: replaying these is not a read
+_NOT_A_READ = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b"
+    r"|\bINTO\b"
+    r"|\b(?:nextval|setval|pg_(?:try_)?advisory_\w*|pg_notify|pg_sleep\w*|lo_\w+|dblink\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def parameter_shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, (list, tuple, set)):
+        kinds = sorted({parameter_shape(item).split("[")[0] for item in value})
+        return f"list[{len(value)}]<{'|'.join(kinds)}>"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        batch = list(parameters)
+        return {"rows": len(batch), "row": parameter_shapes(batch[0], False) if batch else None}
+    if isinstance(parameters, dict):
+        return {name: parameter_shape(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [parameter_shape(value) for value in parameters]
+    return parameter_shape(parameters)
+
+
+def is_explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so only plain reads are replayed
+    return statement.lstrip().upper().startswith("SELECT") and not _NOT_A_READ.search(statement)
+
+
+class SlowQueryLog:
+    def __init__(self, *, threshold_ms: float, sample_rate: float, size: int):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.entries: "deque[Dict[str, Any]]" = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def instrument(self, engine) -> None:
+        target = getattr(engine, "sync_engine", engine)
+        if not event.contains(target, "after_cursor_execute", self._after_cursor_execute):
+            event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def start(self) -> None:
+        """
+        Starts the EXPLAIN worker on the running loop; without it nothing is explained.
+        """
+        if self._worker is None:
+            self._loop = asyncio.get_running_loop()
+            self._pending = asyncio.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+            self._worker = self._loop.create_task(self._explain_pending())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None or conn.info.get("explaining"):
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold:
+            self.record(statement, parameters, executemany, elapsed)
+
+    def record(self, statement: str, parameters: Any, executemany: bool, elapsed: float) -> Dict[str, Any]:
+        scope = _scope.get()
+        entry = {
+            "id": next(self._ids),
+            "recorded_at": datetime.utcnow(),
+            "method": scope["method"] if scope else None,
+            "route": route_template(scope) if scope else None,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "statement": statement,
+            "parameters": parameter_shapes(parameters, executemany),
+            "plan": None,
+        }
+        self.entries.append(entry)
+        logger.warning(f"Slow query ({entry['elapsed_ms']} ms) in {entry['method']} {entry['route']}: {statement[:500]}")
+        if (self._worker is not None and not executemany and is_explainable(statement)
+                and random.random() < self.sample_rate):
+            # the values are only held until the plan is captured, never stored in the log
+            self._loop.call_soon_threadsafe(self._enqueue, entry, statement, parameters)
+        return entry
+
+    def _enqueue(self, entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+        try:
+            self._pending.put_nowait((entry, statement, parameters))
+        except asyncio.QueueFull:
+            pass
+
+    async def _explain_pending(self) -> None:
+        while True:
+            entry, statement, parameters = await self._pending.get()
+            try:
+                entry["plan"] = await run_in_session(explain_analyze, statement, parameters)
+            except Exception as e:
+                entry["plan"] = f"EXPLAIN failed: {e}"
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        return list(reversed(self.entries))[:limit]
+
+
+async def explain_analyze(db: AsyncSession, statement: str, parameters: Any) -> str:
+    """
+    Runs the statement under EXPLAIN (ANALYZE, BUFFERS) in a read-only transaction with
+    short statement and lock timeouts, then rolls it back. Postgres rejects writes, nextval()
+    and row locks in a read-only transaction, backing up the is_explainable filter.
+    """
+    connection = await db.connection()
+    connection.sync_connection.info["explaining"] = True
+    try:
+        await connection.execute(text("SET TRANSACTION READ ONLY"))
+        await connection.execute(text(f"SET LOCAL statement_timeout = {EXPLAIN_STATEMENT_TIMEOUT_MS}"))
+        await connection.execute(text(f"SET LOCAL lock_timeout = {EXPLAIN_LOCK_TIMEOUT_MS}"))
+        result = await connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        return "\n".join(row[0] for row in result)
+    finally:
+        connection.sync_connection.info.pop("explaining", None)
+        await db.rollback()
+
+
+class RequestScopeMiddleware:
+    """
+    Makes the current request's ASGI scope available to the slow-query hook.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _scope.reset(token)
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+)
@@ -0,0 +1,11 @@
+from app.db.session import SessionLocal
+from app.crud.crud_doctor_search import crud_doctor_search
+from app.availability import next_free_slots
+
+async def refresh_doctor_search_documents():
+    """
+    Rebuilds every doctor search document, so next available slots follow the clock and new bookings.
+    """
+    async with SessionLocal() as db:
+        next_available = await next_free_slots(db)
+        await crud_doctor_search.refresh(db, next_available=next_available)
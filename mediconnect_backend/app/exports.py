@@ -0,0 +1,119 @@
+import csv
+import io
+import tempfile
+from typing import AsyncIterator, Dict, List, Tuple, Type
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Time
+from sqlalchemy.future import select
+from starlette.concurrency import run_in_threadpool
+
+from app.db.base import Appointment, Hospital, Medication, Transaction, User
+from app.db.base_class import Base
+from app.db.session import SessionLocal
+
+EXPORT_BATCH_SIZE = 1000
+FILE_CHUNK_SIZE = 64 * 1024
+
+EXPORTS: Dict[str, Tuple[Type[Base], List[str]]] = {
+    "users": (User, ["id", "email", "full_name", "phone", "status", "is_active", "token_balance", "role_id"]),
+    "transactions": (Transaction, ["id", "user_id", "amount", "timestamp"]),
+    "hospitals": (Hospital, [
+        "id", "name", "address", "latitude", "longitude", "departments",
+        "website", "phone_no", "current_status", "image", "timings",
+    ]),
+    "medications": (Medication, ["id", "name", "dosage", "price"]),
+    "appointments": (Appointment, ["id", "patient_id", "doctor_id", "date", "time", "reason", "status", "notes"]),
+}
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+async def iter_batches(model: Type[Base], columns: List[str]) -> AsyncIterator[List[tuple]]:
+    """
+    Streams rows through a server-side cursor, `EXPORT_BATCH_SIZE` rows at a time.
+    Uses its own session so it can outlive the request handler.
+    """
+    async with SessionLocal() as db:
+        query = (
+            select(*[getattr(model, name) for name in columns])
+            .order_by(model.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        result = await db.stream(query)
+        async for batch in result.partitions():
+            yield [tuple(row) for row in batch]
+
+
+async def stream_csv(model: Type[Base], columns: List[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in iter_batches(model, columns):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def stream_xlsx(model: Type[Base], columns: List[str]) -> AsyncIterator[bytes]:
+    """
+    XLSX is a zip archive and cannot be emitted row by row, so the write-only workbook
+    is spooled to a temporary file and streamed from there.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(model.__tablename__)
+    sheet.append(columns)
+
+    def append_rows(batch: List[tuple]) -> None:
+        for row in batch:
+            sheet.append(row)
+
+    async for batch in iter_batches(model, columns):
+        await run_in_threadpool(append_rows, batch)
+    with tempfile.TemporaryFile() as spool:
+        await run_in_threadpool(workbook.save, spool)
+        spool.seek(0)
+        while chunk := await run_in_threadpool(spool.read, FILE_CHUNK_SIZE):
+            yield chunk
+
+
+async def stream_parquet(model: Type[Base], columns: List[str]) -> AsyncIterator[bytes]:
+    """
+    Writes one Parquet row group per batch to a temporary file and streams it once the footer is written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = [
+        (Boolean, pa.bool_()), (Integer, pa.int64()), (Float, pa.float64()),
+        (DateTime, pa.timestamp("us")), (Date, pa.date32()), (Time, pa.time64("us")),
+    ]
+    fields = []
+    for name in columns:
+        column_type = getattr(model, name).type
+        arrow_type = next((t for sql_type, t in arrow_types if isinstance(column_type, sql_type)), pa.string())
+        fields.append(pa.field(name, arrow_type))
+    schema = pa.schema(fields)
+
+    with tempfile.TemporaryFile() as spool:
+        writer = pq.ParquetWriter(spool, schema)
+        async for batch in iter_batches(model, columns):
+            table = pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)], schema=schema
+            )
+            await run_in_threadpool(writer.write_table, table)
+        await run_in_threadpool(writer.close)
+        spool.seek(0)
+        while chunk := await run_in_threadpool(spool.read, FILE_CHUNK_SIZE):
+            yield chunk
+
+
+STREAMERS = {"csv": stream_csv, "xlsx": stream_xlsx, "parquet": stream_parquet}
@@ -0,0 +1,107 @@
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_hospital import crud_hospital
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GRID_CELL_DEGREES = 0.25
+
+_earthdistance: Optional[bool] = None
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distances in km from (lat, lng) to every point in `lats`/`lngs`.
+    """
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class HospitalGrid:
+    """
+    In-process spatial index: hospital coordinates bucketed into fixed lat/lng cells.
+    A lookup only measures hospitals in the cells overlapping the search radius.
+    """
+
+    def __init__(self, ids: np.ndarray, lats: np.ndarray, lngs: np.ndarray,
+                 cell_degrees: float = GRID_CELL_DEGREES):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.cell_degrees = cell_degrees
+        self.lng_cells = math.ceil(360 / cell_degrees)
+        buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for position, cell in enumerate(zip(self._cell(self.lats), self._cell(self.lngs) % self.lng_cells)):
+            buckets[cell].append(position)
+        self.cells = {cell: np.array(positions) for cell, positions in buckets.items()}
+
+    @classmethod
+    def from_rows(cls, rows: List[Tuple[int, float, float]]) -> "HospitalGrid":
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 3)
+        return cls(columns[:, 0], columns[:, 1], columns[:, 2])
+
+    def _cell(self, degrees):
+        return np.floor(np.asarray(degrees) / self.cell_degrees).astype(np.int64)
+
+    def candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """
+        Positions of the hospitals in the cells covering the radius' bounding box.
+        """
+        lat_span = radius_km / KM_PER_DEGREE
+        lat_cells = range(int(self._cell(max(lat - lat_span, -90))), int(self._cell(min(lat + lat_span, 90))) + 1)
+        cos_lat = math.cos(math.radians(min(abs(lat) + lat_span, 90)))
+        if cos_lat < 1e-6 or lat_span / cos_lat >= 180:
+            lng_cells = range(self.lng_cells)
+        else:
+            lng_span = lat_span / cos_lat
+            lng_cells = range(int(self._cell(lng - lng_span)), int(self._cell(lng + lng_span)) + 1)
+        if len(lat_cells) * len(lng_cells) > len(self.cells):
+            return np.arange(len(self.ids))
+        hits = [
+            self.cells[cell]
+            for cell in ((y, x % self.lng_cells) for y in lat_cells for x in lng_cells)
+            if cell in self.cells
+        ]
+        return np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+
+    def nearest(self, lat: float, lng: float, radius_km: float, limit: int) -> List[Tuple[int, float]]:
+        """
+        (hospital id, distance in km) for up to `limit` hospitals within the radius, closest first.
+        """
+        positions = self.candidates(lat, lng, radius_km)
+        distances = haversine_km(lat, lng, self.lats[positions], self.lngs[positions])
+        inside = distances <= radius_km
+        positions, distances = positions[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")[:limit]
+        return [(int(self.ids[positions[i]]), float(distances[i])) for i in order]
+
+
+async def probe_earthdistance() -> bool:
+    """
+    Checks whether the earthdistance extension is installed (migration 0003 installs it
+    along with the GiST index). Without it nearby search uses the in-process grid.
+    """
+    global _earthdistance
+    async with SessionLocal() as db:
+        _earthdistance = await crud_hospital.has_extension(db, name="earthdistance")
+    if not _earthdistance:
+        logger.warning("earthdistance unavailable, using the in-process hospital grid")
+    return _earthdistance
+
+
+async def earthdistance_available(db: AsyncSession) -> bool:
+    global _earthdistance
+    if _earthdistance is None:
+        _earthdistance = await crud_hospital.has_extension(db, name="earthdistance")
+    return _earthdistance
@@ -0,0 +1,160 @@
+import asyncio
+import bisect
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.crud.crud_hospital import crud_hospital
+from app.db.session import run_in_session
+from app.geo import EARTH_RADIUS_KM, HospitalGrid, earthdistance_available, haversine_km
+from app.schemas.hospital import Hospital
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def normalize(value: str) -> str:
+    return value.strip().lower()
+
+
+class DirectorySnapshot:
+    """
+    Immutable view of every hospital with lookup indexes by department, status,
+    name prefix and location. `version` increases with every rebuild. `loaded_at` is
+    when its rows started to be read, so it reflects every write committed before then.
+    """
+
+    def __init__(
+        self, version: int, hospitals: List[Hospital], departments: List[List[str]],
+        loaded_at: Optional[float] = None,
+    ):
+        self.version = version
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+        self.hospitals = hospitals
+        self.by_id = {hospital.id: hospital for hospital in hospitals}
+
+        by_department: Dict[str, set] = defaultdict(set)
+        by_status: Dict[str, set] = defaultdict(set)
+        for position, (hospital, names) in enumerate(zip(hospitals, departments)):
+            for name in names:
+                by_department[name].add(position)
+            by_status[normalize(hospital.current_status or "")].add(position)
+        self.by_department: Dict[str, FrozenSet[int]] = {k: frozenset(v) for k, v in by_department.items()}
+        self.by_status: Dict[str, FrozenSet[int]] = {k: frozenset(v) for k, v in by_status.items()}
+        self.names = sorted((normalize(hospital.name or ""), position) for position, hospital in enumerate(hospitals))
+
+        located = [h for h in hospitals if h.latitude is not None and h.longitude is not None]
+        self.grid = HospitalGrid.from_rows([(h.id, h.latitude, h.longitude) for h in located])
+
+    def _name_prefix(self, prefix: str) -> FrozenSet[int]:
+        start = bisect.bisect_left(self.names, (prefix,))
+        end = bisect.bisect_left(self.names, (prefix + "\uffff",))
+        return frozenset(position for _, position in self.names[start:end])
+
+    def filter(
+        self, *, department: Optional[str] = None, status: Optional[str] = None,
+        name_prefix: Optional[str] = None, skip: int = 0, limit: int = 100
+    ) -> List[Hospital]:
+        matches: Optional[FrozenSet[int]] = None
+        if department:
+            matches = self.by_department.get(normalize(department), frozenset())
+        if status:
+            found = self.by_status.get(normalize(status), frozenset())
+            matches = found if matches is None else matches & found
+        if name_prefix:
+            found = self._name_prefix(normalize(name_prefix))
+            matches = found if matches is None else matches & found
+        if matches is None:
+            return self.hospitals[skip:skip + limit]
+        return [self.hospitals[position] for position in sorted(matches)[skip:skip + limit]]
+
+
+class HospitalDirectory:
+    """
+    Process-wide hospital directory. Writers call `refresh()` after committing; readers
+    get the current snapshot without touching the database. Snapshots older than
+    `ttl` are rebuilt in the background to pick up writes made by other processes.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+        # strong references: the event loop keeps only weak ones to running tasks
+        self._background: Set[asyncio.Task] = set()
+
+    def current(self) -> Optional[DirectorySnapshot]:
+        """
+        The current snapshot without waiting, or None before the first load. Missing or
+        expired snapshots are rebuilt in the background when called from a running loop.
+        """
+        snapshot = self._snapshot
+        if (snapshot is None or time.monotonic() - snapshot.loaded_at >= self.ttl) and not self._background:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return snapshot
+            task = loop.create_task(self._refresh_in_background())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return snapshot
+
+    async def snapshot(self) -> DirectorySnapshot:
+        return self.current() or await self.refresh()
+
+    async def refresh(self) -> DirectorySnapshot:
+        requested = time.monotonic()
+        async with self._lock:
+            # a rebuild whose read started after this call already reflects the caller's writes
+            if self._snapshot is not None and self._snapshot.loaded_at > requested:
+                return self._snapshot
+            started = time.monotonic()
+            rows = await run_in_session(crud_hospital.get_directory_rows)
+            self._version += 1
+            self._snapshot = DirectorySnapshot(
+                self._version,
+                [Hospital.model_validate(hospital) for hospital, _ in rows],
+                [departments or [] for _, departments in rows],
+                loaded_at=started,
+            )
+            return self._snapshot
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Hospital directory refresh failed")
+
+
+hospital_directory = HospitalDirectory(ttl=settings.HOSPITAL_DIRECTORY_TTL_SECONDS)
+
+
+async def find_nearby_hospitals(db: AsyncSession, *, lat: float, lng: float, radius_km: float, limit: int):
+    """
+    Hospitals within `radius_km` of (lat, lng) as (hospital, distance_km) pairs, closest first.
+    Uses the earthdistance GiST index when available, otherwise the directory's grid.
+    """
+    if await earthdistance_available(db):
+        hospitals = await crud_hospital.get_in_earth_box(
+            db, lat=lat, lng=lng, angle=radius_km / EARTH_RADIUS_KM, limit=limit
+        )
+        if not hospitals:
+            return []
+        distances = haversine_km(
+            lat, lng,
+            np.array([h.latitude for h in hospitals], dtype=np.float64),
+            np.array([h.longitude for h in hospitals], dtype=np.float64),
+        )
+        return [(h, float(d)) for h, d in zip(hospitals, distances) if d <= radius_km]
+
+    snapshot = await hospital_directory.snapshot()
+    return [
+        (snapshot.by_id[id], distance)
+        for id, distance in snapshot.grid.nearest(lat, lng, radius_km, limit)
+    ]
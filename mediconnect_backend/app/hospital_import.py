@@ -0,0 +1,174 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import get_settings
+from app.crud.crud_hospital import crud_hospital
+from app.crud.crud_import_job import crud_import_job
+from app.db.session import SessionLocal
+from app.hospital_directory import hospital_directory
+from app.schemas.hospital import HospitalBase
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_import_pool: Optional[ProcessPoolExecutor] = None
+
+HOSPITAL_COLUMNS = list(HospitalBase.model_fields)
+COORDINATE_RANGES = {"latitude": (-90, 90), "longitude": (-180, 180)}
+TEXT_COLUMNS = [name for name in HOSPITAL_COLUMNS if name not in COORDINATE_RANGES]
+REQUIRED_TEXT_COLUMNS = ["name", "address"]
+ERROR_COLUMNS = ["row", "field", "error"]
+DUPLICATE_IN_FILE = "duplicate of an earlier row with the same name and address"
+DUPLICATE_EXISTING = "a hospital with the same name and address already exists"
+STAGE_CHUNK_SIZE = 5000
+
+
+def read_hospital_file(contents: bytes, filename: str) -> pd.DataFrame:
+    """
+    Reads a CSV/Excel upload with every cell as text, so validation sees the raw values.
+    """
+    buffer = io.BytesIO(contents)
+    if filename.endswith('.csv'):
+        return pd.read_csv(buffer, dtype=str, keep_default_na=False)
+    if filename.endswith(('.xls', '.xlsx')):
+        return pd.read_excel(buffer, dtype=str, keep_default_na=False)
+    raise ValueError("Invalid file format. Please upload a CSV or Excel file.")
+
+
+def validate_hospitals(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Normalizes and validates hospital rows column-wise.
+
+    Returns the valid rows, deduplicated by (name, address), and a per-row error report.
+    Both are indexed by spreadsheet row number (the header is row 1).
+    """
+    df = df.rename(columns=lambda name: str(name).strip().lower())
+    missing = [name for name in HOSPITAL_COLUMNS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = df[HOSPITAL_COLUMNS].copy()
+    df.index = pd.RangeIndex(2, len(df) + 2)
+    for name in TEXT_COLUMNS:
+        df[name] = df[name].fillna("").astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    df["departments"] = df["departments"].str.replace(r"\s*,\s*", ",", regex=True).str.strip(",")
+
+    errors = []
+
+    def flag(mask, field: str, message: str) -> None:
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            errors.append(pd.DataFrame({"row": df.index[mask], "field": field, "error": message}))
+
+    for name in REQUIRED_TEXT_COLUMNS:
+        flag(df[name] == "", name, "is required")
+    for name, (low, high) in COORDINATE_RANGES.items():
+        values = pd.to_numeric(df[name].astype(str).str.strip(), errors="coerce")
+        flag(values.isna(), name, "must be a number")
+        flag(values.notna() & ~values.between(low, high), name, f"must be between {low} and {high}")
+        df[name] = values
+
+    invalid_rows = pd.concat(errors)["row"].unique() if errors else []
+    candidates = df[~df.index.isin(invalid_rows)]
+    flag(
+        df.index.isin(candidates.index[candidates.duplicated(subset=["name", "address"], keep="first")]),
+        "name",
+        DUPLICATE_IN_FILE,
+    )
+
+    report = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=ERROR_COLUMNS)
+    report = report.sort_values("row", kind="stable", ignore_index=True)
+    valid = df[~df.index.isin(report["row"])]
+    return valid, report
+
+
+def parse_hospital_file(contents: bytes, filename: str) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    Reads and validates an upload. CPU-bound, so it runs in the import process pool.
+    Returns the valid rows, the error report and the number of data rows in the file.
+    """
+    df = read_hospital_file(contents, filename)
+    valid, report = validate_hospitals(df)
+    return valid, report, len(df)
+
+
+def get_import_pool() -> ProcessPoolExecutor:
+    global _import_pool
+    if _import_pool is None:
+        _import_pool = ProcessPoolExecutor(
+            max_workers=settings.IMPORT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _import_pool
+
+
+def shutdown_import_pool() -> None:
+    global _import_pool
+    if _import_pool is not None:
+        _import_pool.shutdown(wait=False, cancel_futures=True)
+        _import_pool = None
+
+
+async def run_hospital_import(job_id: str, contents: bytes) -> None:
+    """
+    Background import: parses in the process pool, stages the valid rows in chunks while
+    reporting progress on the job, then merges them into `hospitals` in one transaction.
+    """
+    async with SessionLocal() as status_db:
+        job = await crud_import_job.get(status_db, id=job_id)
+        job = await crud_import_job.update(status_db, db_obj=job, obj_in={"status": "PARSING"})
+        try:
+            loop = asyncio.get_running_loop()
+            valid, report, total_rows = await loop.run_in_executor(
+                get_import_pool(), parse_hospital_file, contents, job.filename or ""
+            )
+            job = await crud_import_job.update(status_db, db_obj=job, obj_in={
+                "status": "LOADING", "total_rows": total_rows, "processed_rows": total_rows - len(valid)
+            })
+
+            inserted = set()
+            if not valid.empty:
+                records = list(valid.astype(object).itertuples(index=False, name=None))
+                async with SessionLocal() as db:
+                    await crud_hospital.create_staging_table(db, columns=HOSPITAL_COLUMNS)
+                    for start in range(0, len(records), STAGE_CHUNK_SIZE):
+                        chunk = records[start:start + STAGE_CHUNK_SIZE]
+                        await crud_hospital.stage(db, columns=HOSPITAL_COLUMNS, records=chunk)
+                        job = await crud_import_job.update(status_db, db_obj=job, obj_in={
+                            "processed_rows": job.processed_rows + len(chunk)
+                        })
+                    inserted = set(await crud_hospital.merge_staged(db, columns=HOSPITAL_COLUMNS))
+                    await db.commit()
+        except Exception as e:
+            logger.exception(f"Hospital import {job_id} failed")
+            await crud_import_job.update(status_db, db_obj=job, obj_in={
+                "status": "FAILED", "message": str(e), "finished_at": datetime.utcnow()
+            })
+            return
+
+        keys = pd.Series(list(zip(valid["name"], valid["address"])), index=valid.index, dtype=object)
+        existing = keys.index[~keys.isin(inserted).to_numpy()]
+        report = pd.concat(
+            [report, pd.DataFrame({"row": existing, "field": "name", "error": DUPLICATE_EXISTING})],
+            ignore_index=True,
+        ).sort_values("row", kind="stable")
+        is_duplicate = report["error"].isin([DUPLICATE_IN_FILE, DUPLICATE_EXISTING])
+
+        await crud_import_job.update(status_db, db_obj=job, obj_in={
+            "status": "COMPLETED",
+            "imported_count": len(inserted),
+            "duplicate_count": int(is_duplicate.sum()),
+            "error_count": report.loc[~is_duplicate, "row"].nunique(),
+            "error_report": report.to_csv(index=False) if not report.empty else None,
+            "message": f"Imported {len(inserted)} of {total_rows} hospitals.",
+            "finished_at": datetime.utcnow(),
+        })
+    if inserted:
+        await hospital_directory.refresh()
@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from starlette.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy.orm import Session
@@ -8,10 +9,19 @@ load_dotenv()
 
 from app.api.v1.api import api_router
 from app.core.config import get_settings
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, engine
+from app.db.query_counter import QueryBudgetMiddleware, instrument
+from app.core.metrics import MetricsMiddleware, register_pool, timed_job
+from app.core.loop_watchdog import loop_watchdog
+from app.db.slow_queries import RequestScopeMiddleware, slow_query_log
 from app.db.init_db import init_db
 from app.cleanup import cleanup_old_appointments, cleanup_old_notifications
 from app.reminders import send_appointment_reminders
+from app.reconciliation import reconcile_notification_counters, reconcile_doctor_ratings
+from app.rollups import roll_up_revenue
+from app.doctor_search import refresh_doctor_search_documents
+from app.hospital_import import shutdown_import_pool
+from app.geo import probe_earthdistance
 from app.schemas.update_forward_refs import update_forward_refs
 
 settings = get_settings()
@@ -32,13 +42,27 @@ def initialize_database():
 
 @app.on_event("startup")
 async def startup_event():
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    slow_query_log.start()
     update_forward_refs()
     initialize_database()
-    scheduler.add_job(cleanup_old_appointments, 'interval', days=1)
-    scheduler.add_job(cleanup_old_notifications, 'interval', days=1)
-    scheduler.add_job(send_appointment_reminders, 'interval', hours=1)
+    await probe_earthdistance()
+    scheduler.add_job(timed_job(cleanup_old_appointments), 'interval', days=1)
+    scheduler.add_job(timed_job(cleanup_old_notifications), 'interval', days=1)
+    scheduler.add_job(timed_job(send_appointment_reminders), 'interval', hours=1)
+    scheduler.add_job(timed_job(reconcile_notification_counters), 'interval', hours=6)
+    scheduler.add_job(timed_job(reconcile_doctor_ratings), 'interval', days=1)
+    scheduler.add_job(timed_job(roll_up_revenue), 'interval', hours=1)
+    scheduler.add_job(timed_job(refresh_doctor_search_documents), 'interval', minutes=15)
     scheduler.start()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_import_pool()
+    await loop_watchdog.stop()
+    await slow_query_log.stop()
+
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
@@ -48,4 +72,23 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+if settings.ENVIRONMENT != "production":
+    instrument(engine)
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        budget=settings.SQL_QUERY_BUDGET,
+        repeat_threshold=settings.SQL_REPEAT_THRESHOLD,
+        strict=settings.SQL_BUDGET_STRICT,
+    )
+
+slow_query_log.instrument(engine)
+app.add_middleware(RequestScopeMiddleware)
+app.add_middleware(MetricsMiddleware)
+register_pool(engine)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
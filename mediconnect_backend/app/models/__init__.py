@@ -1,12 +1,17 @@
 from .ai import AIModel
 from .appointment import Appointment
+from .broadcast import Broadcast, BroadcastReceipt
 from .consultation import Consultation
 from .doctor import Doctor
+from .doctor_search import DoctorSearchDocument
 from .hospital import Hospital
+from .import_job import ImportJob
 from .medication import Medication
 from .notification import Notification
+from .notification_counter import NotificationCounter
 from .patient import Patient
 from .permission import Permission
+from .revenue import RevenueDaily, RollupWatermark
 from .review import Review
 from .schedule import Schedule
 from .subscription import Subscription
@@ -18,14 +23,21 @@ from .vital import Vital
 __all__ = [
     "AIModel",
     "Appointment",
+    "Broadcast",
+    "BroadcastReceipt",
     "Consultation",
     "Doctor",
+    "DoctorSearchDocument",
     "Hospital",
+    "ImportJob",
     "Medication",
     "Notification",
+    "NotificationCounter",
     "Patient",
     "Permission",
+    "RevenueDaily",
     "Review",
+    "RollupWatermark",
     "Schedule",
     "Subscription",
     "Symptom",
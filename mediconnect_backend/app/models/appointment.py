@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -17,5 +17,20 @@ class Appointment(Base):
 
     patient = relationship("Patient", back_populates="appointments")
     doctor = relationship("Doctor", back_populates="appointments")
-    consultation_details = relationship("Consultation", uselist=False, back_populates="appointments", cascade="all, delete-orphan")
-    review = relationship("Review", uselist=False, back_populates="appointments", cascade="all, delete-orphan")
+    consultation_details = relationship("Consultation", uselist=False, back_populates="appointment", cascade="all, delete-orphan")
+    review = relationship("Review", uselist=False, back_populates="appointment", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # a slot can hold one appointment that is not cancelled; bookings rely on this to be race-free
+        Index(
+            "uq_appointments_active_slot", "doctor_id", "date", "time",
+            unique=True, postgresql_where=status != "CANCELLED",
+        ),
+        # doctor listings include cancelled appointments, which the partial index above leaves out
+        Index("ix_appointments_doctor_date_time", "doctor_id", "date", "time"),
+        Index("ix_appointments_patient_status", "patient_id", "status"),
+        Index(
+            "ix_appointments_reminder_due", "date", "time",
+            postgresql_where=(status == "UPCOMING") & (reminder_sent == False),
+        ),
+    )
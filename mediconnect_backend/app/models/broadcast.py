@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+from datetime import datetime
+
+class Broadcast(Base):
+    """
+    A single notification addressed to an audience (ALL users or one role).
+    It is merged into each matching user's feed at read time instead of being
+    copied into one `notifications` row per recipient.
+    """
+    __tablename__ = "broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    message = Column(String, nullable=False)
+    target_audience = Column(String, nullable=False, default="ALL")  # ALL, ROLE
+    audience_role = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    receipts = relationship("BroadcastReceipt", back_populates="broadcast", cascade="all, delete-orphan")
+
+
+class BroadcastReceipt(Base):
+    """
+    Sparse per-user read state for a broadcast: a row exists only once the user has read it.
+    """
+    __tablename__ = "broadcast_receipts"
+    __table_args__ = (UniqueConstraint("broadcast_id", "user_id", name="uq_broadcast_receipt_user"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    broadcast_id = Column(Integer, ForeignKey("broadcasts.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    read_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    broadcast = relationship("Broadcast", back_populates="receipts")
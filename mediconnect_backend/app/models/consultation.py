@@ -5,7 +5,7 @@ from app.db.base_class import Base
 class Consultation(Base):
     __tablename__ = "consultation_details"
     id = Column(Integer, primary_key=True, index=True)
-    appointment_id = Column(Integer, ForeignKey("appointment.id"))
+    appointment_id = Column(Integer, ForeignKey("appointments.id"))
     hpi = Column(Text, nullable=True)
     soap_note = Column(Text, nullable=True)
     icd_codes = Column(String, nullable=True)
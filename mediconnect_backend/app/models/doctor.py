@@ -12,8 +12,15 @@ class Doctor(Base):
     is_active = Column(Boolean(), default=True)
     photo_url = Column(String, name="photo")
     user_id = Column(Integer, ForeignKey("users.id"))
+    # running totals over `reviews`, maintained by crud_review in the review's transaction
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     user = relationship("User", back_populates="doctor_profile")
     appointments = relationship("Appointment", back_populates="doctor")
     reviews = relationship("Review", back_populates="doctor")
     schedules = relationship("Schedule", back_populates="doctor")
+
+    @property
+    def average_rating(self) -> float:
+        return self.rating_sum / self.rating_count if self.rating_count else 0.0
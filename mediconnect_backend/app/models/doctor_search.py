@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Index
+from app.db.base_class import Base
+from datetime import datetime
+
+class DoctorSearchDocument(Base):
+    """
+    Read-optimized copy of a doctor for discovery search, rebuilt from `doctor`
+    (including its rating totals) by `crud_doctor_search.refresh`. `next_available_at`
+    is the first unbooked slot at or after the last refresh, from `app.availability`.
+    """
+    __tablename__ = "doctor_search_documents"
+
+    doctor_id = Column(Integer, ForeignKey("doctor.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String)
+    specialty = Column(String)
+    specialty_key = Column(String)  # lower-cased, trimmed specialty
+    photo_url = Column(String)
+    search_text = Column(Text)  # lower-cased name and specialty
+    avg_rating = Column(Float, nullable=False, default=0.0)
+    review_count = Column(Integer, nullable=False, default=0)
+    next_available_at = Column(DateTime, nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_doctor_search_rating", avg_rating.desc(), doctor_id, postgresql_where=is_active),
+        Index(
+            "ix_doctor_search_specialty_rating", specialty_key, avg_rating.desc(), doctor_id,
+            postgresql_where=is_active,
+        ),
+        Index(
+            "ix_doctor_search_text_trgm", search_text,
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Text, Computed, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.db.base_class import Base
 
 class Hospital(Base):
@@ -10,8 +11,16 @@ class Hospital(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     departments = Column(String)
+    # lower-cased, trimmed entries of the comma-separated `departments`, maintained by Postgres
+    department_list = Column(ARRAY(Text), Computed(
+        "array_remove(regexp_split_to_array(lower(btrim(departments)), '\\s*,\\s*'), '')", persisted=True
+    ))
     website = Column(String)
     phone_no = Column(String)
     current_status = Column(String)
     image = Column(String)
     timings = Column(String)
+
+    __table_args__ = (
+        Index("ix_hospitals_department_list", "department_list", postgresql_using="gin"),
+    )
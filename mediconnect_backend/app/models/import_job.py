@@ -0,0 +1,22 @@
+import uuid
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from app.db.base_class import Base
+from datetime import datetime
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False)  # hospitals
+    filename = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="PENDING")  # PENDING, PARSING, LOADING, COMPLETED, FAILED
+    total_rows = Column(Integer, nullable=False, default=0)
+    processed_rows = Column(Integer, nullable=False, default=0)
+    imported_count = Column(Integer, nullable=False, default=0)
+    duplicate_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    error_report = Column(Text, nullable=True)  # CSV with row, field, error
+    message = Column(String, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from datetime import datetime
 
 class Notification(Base):
     __tablename__ = "notifications"  # always give a table name
@@ -8,6 +9,12 @@ class Notification(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))  # ✅ corrected table name
     message = Column(String, nullable=False)
-    timestamp = Column(DateTime, nullable=False)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    is_read = Column(Boolean, nullable=False, default=False)
 
     user = relationship("User", back_populates="notifications")  # ✅ matches User.notifications
+
+    __table_args__ = (
+        Index("ix_notifications_user_unread", "user_id", postgresql_where=is_read == False),
+    )
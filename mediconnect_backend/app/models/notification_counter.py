@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.db.base_class import Base
+
+class NotificationCounter(Base):
+    """
+    Materialized per-user count of unread direct notifications, kept in step with
+    `notifications` by the CRUD layer and repaired by the reconciliation job.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime
+from app.db.base_class import Base
+from datetime import datetime
+
+class RevenueDaily(Base):
+    """
+    One row per calendar day (UTC) summarising `transactions`, maintained by the revenue rollup.
+    """
+    __tablename__ = "revenue_daily"
+
+    day = Column(Date, primary_key=True)
+    total_revenue = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+
+class RollupWatermark(Base):
+    """
+    Progress marker for a rollup: every day before `rolled_through` has been rolled up.
+    """
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    rolled_through = Column(Date, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -10,7 +10,7 @@ class Review(Base):
     comment = Column(String, nullable=True)
     doctor_id = Column(Integer, ForeignKey("doctor.id"))
     patient_id = Column(Integer, ForeignKey("patient.id"))
-    appointment_id = Column(Integer, ForeignKey("appointment.id"))
+    appointment_id = Column(Integer, ForeignKey("appointments.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     appointment = relationship("Appointment", back_populates="review")
@@ -1,5 +1,6 @@
-from sqlalchemy import Boolean, Column, Integer, String, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from datetime import datetime
 
 from app.db.base_class import Base
 
@@ -16,6 +17,8 @@ class User(Base):
     phone = Column(String(20), nullable=True)
     status = Column(String(20), default="active")
     token_balance = Column(Integer, default=0)
+    # NULL for accounts created before sign-up times were recorded
+    created_at = Column(DateTime, nullable=True, default=datetime.utcnow)
 
     role_id = Column(Integer, ForeignKey("roles.id"))
     role = relationship("Role")
@@ -28,3 +31,10 @@ class User(Base):
 
     transactions = relationship("Transaction", back_populates="user")
     notifications = relationship("Notification", back_populates="user")
+
+    # Trigram indexes back the admin user search (substring, prefix and fuzzy matching).
+    __table_args__ = (
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("ix_users_phone_trgm", "phone", postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}),
+    )
@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+from app.db.session import SessionLocal
+from app.crud.crud_notification import crud_notification
+from app.crud.crud_review import crud_review
+
+logger = logging.getLogger(__name__)
+
+async def reconcile_notification_counters():
+    """
+    Repairs unread-notification counters that drifted from the `notifications` table,
+    e.g. after rows were written or deleted outside the CRUD layer.
+    """
+    async with SessionLocal() as db:
+        repaired = await crud_notification.reconcile_unread_counts(db)
+        if repaired:
+            logger.warning(f"Repaired {repaired} drifted unread-notification counters.")
+
+
+async def reconcile_doctor_ratings():
+    """
+    Recomputes doctors' rating totals from `reviews`. Also serves as the backfill after
+    the `rating_sum`/`rating_count` columns are added.
+    """
+    async with SessionLocal() as db:
+        repaired = await crud_review.reconcile_doctor_ratings(db)
+        if repaired:
+            logger.warning(f"Repaired rating totals of {repaired} doctors.")
+
+
+async def reconcile_all():
+    await reconcile_notification_counters()
+    await reconcile_doctor_ratings()
+
+
+if __name__ == "__main__":
+    # python -m app.reconciliation
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(reconcile_all())
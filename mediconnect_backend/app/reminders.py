@@ -2,11 +2,14 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from datetime import datetime, timedelta
+from collections import Counter
 
 from app.db.base import Appointment, Notification, User
 from app.models.patient import Patient
 from app.models.doctor import Doctor
 from app.db.session import SessionLocal
+from app.crud.crud_notification import crud_notification
+from app.crud.crud_appointment import appointment as crud_appointment
 
 async def send_appointment_reminders():
     """
@@ -17,13 +20,7 @@ async def send_appointment_reminders():
         twenty_four_hours_later = now + timedelta(hours=24)
 
         stmt = (
-            select(Appointment)
-            .where(
-                Appointment.status == 'UPCOMING',
-                Appointment.time >= now,
-                Appointment.time <= twenty_four_hours_later,
-                Appointment.reminder_sent == False
-            )
+            crud_appointment.due_reminders_query(start=now, end=twenty_four_hours_later)
             .options(
                 joinedload(Appointment.patient).joinedload(Patient.user),
                 joinedload(Appointment.doctor).joinedload(Doctor.user)
@@ -32,6 +29,7 @@ async def send_appointment_reminders():
 
         result = await db.execute(stmt)
         appointments = result.scalars().all()
+        new_unread = Counter()
 
         for appt in appointments:
             patient_user = appt.patient.user
@@ -48,6 +46,8 @@ async def send_appointment_reminders():
             )
 
             db.add_all([patient_notification, doctor_notification])
+            new_unread.update([patient_user.id, doctor_user.id])
             appt.reminder_sent = True
 
+        await crud_notification.adjust_unread_counts(db, new_unread)
         await db.commit()
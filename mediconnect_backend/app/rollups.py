@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from app.db.session import SessionLocal
+from app.crud.crud_transaction import crud_transaction
+
+async def roll_up_revenue():
+    """
+    Rolls all complete days (UTC) of transactions into the daily revenue rollup.
+    Today's transactions stay in the realtime tail until the day is over.
+    """
+    async with SessionLocal() as db:
+        await crud_transaction.roll_up_revenue(db, until=datetime.utcnow().date())
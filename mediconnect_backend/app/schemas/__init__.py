@@ -1,13 +1,14 @@
 from .user import User, UserCreate, UserUpdate
 from .patient import Patient, PatientCreate, PatientUpdate
-from .doctor import Doctor, DoctorCreate, DoctorUpdate, DoctorDashboardStats
+from .doctor import Doctor, DoctorCreate, DoctorUpdate, DoctorDashboardStats, DoctorSearchResult, DoctorSearchPage
 from .appointment import Appointment, AppointmentCreate, AppointmentUpdate
 from .token import Token, TokenPayload
 from .transaction import Transaction, TransactionCreate, TransactionUpdate
 from .review import Review, ReviewCreate, ReviewUpdate
 from .notification import Notification, NotificationCreate, NotificationUpdate
 from .medication import Medication, MedicationCreate, MedicationUpdate
-from .hospital import Hospital, HospitalCreate, HospitalUpdate
+from .hospital import Hospital, HospitalCreate, HospitalUpdate, HospitalNearby
+from .import_job import ImportJob, ImportJobCreate, ImportJobUpdate
 from .hospital_schedule import HospitalSchedule, HospitalScheduleCreate, HospitalScheduleUpdate
 from .consultation import Consultation, ConsultationCreate, ConsultationUpdate
 from .soap import SoapNote, SoapNoteCreate
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
+from datetime import datetime
 from app.schemas.user import User
 
 class DoctorBase(BaseModel):
@@ -38,3 +39,19 @@ class DoctorVerificationDocument(BaseModel):
 class DoctorWithVerificationInfo(Doctor):
     user: User
     verification_documents: List[DoctorVerificationDocument]
+
+class DoctorSearchResult(BaseModel):
+    doctor_id: int
+    name: Optional[str] = None
+    specialty: Optional[str] = None
+    photo_url: Optional[str] = None
+    avg_rating: float
+    review_count: int
+    next_available_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class DoctorSearchPage(BaseModel):
+    items: List[DoctorSearchResult]
+    next_cursor: Optional[str] = None
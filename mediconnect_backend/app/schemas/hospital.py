@@ -26,3 +26,6 @@ class HospitalInDBBase(HospitalBase):
 
 class Hospital(HospitalInDBBase):
     pass
+
+class HospitalNearby(Hospital):
+    distance_km: float
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class ImportJobCreate(BaseModel):
+    kind: str
+    filename: Optional[str] = None
+    created_by: Optional[int] = None
+
+class ImportJobUpdate(BaseModel):
+    status: Optional[str] = None
+    total_rows: Optional[int] = None
+    processed_rows: Optional[int] = None
+    imported_count: Optional[int] = None
+    duplicate_count: Optional[int] = None
+    error_count: Optional[int] = None
+    error_report: Optional[str] = None
+    message: Optional[str] = None
+    finished_at: Optional[datetime] = None
+
+class ImportJob(BaseModel):
+    id: str
+    kind: str
+    filename: Optional[str] = None
+    status: str
+    total_rows: int
+    processed_rows: int
+    imported_count: int
+    duplicate_count: int
+    error_count: int
+    message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
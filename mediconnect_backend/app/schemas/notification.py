@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class NotificationBase(BaseModel):
     user_id: int
@@ -23,3 +23,25 @@ class NotificationBroadcast(BaseModel):
     message: str
     target_audience: str
     audience_role: Optional[str] = None
+
+class Broadcast(BaseModel):
+    id: int
+    message: str
+    target_audience: str
+    audience_role: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class NotificationFeedItem(BaseModel):
+    id: int
+    message: str
+    created_at: datetime
+    is_read: bool
+    source: str  # "direct" or "broadcast"
+
+class NotificationIds(BaseModel):
+    ids: List[int]
+
+class NotificationBulkResult(BaseModel):
+    affected: int
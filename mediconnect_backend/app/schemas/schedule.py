@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import date, time
+from typing import List
 
 class ScheduleBase(BaseModel):
     doctor_id: int
@@ -16,3 +17,7 @@ class Schedule(ScheduleBase):
 
     class Config:
         from_orm = True
+
+class DayAvailability(BaseModel):
+    date: date
+    slots: List[time]
@@ -0,0 +1,4 @@
+"""
+Load tests: bulk seeding, scenario runner, stub AI provider and comparable reports.
+Run from mediconnect_backend/ with `python -m loadtest --help`; see loadtest/README.
+"""
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Dict
+
+from loadtest import report, runner, seed
+from loadtest.scenarios import DEFAULT_MIX, SCENARIOS
+from loadtest.stub_provider import StubProvider
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser("seed", help="Bulk-seed an empty database (DATABASE_URL).")
+    seed_cmd.add_argument("--scale", type=float, default=1.0, help="1.0 = 1M users, 10M appointments.")
+    seed_cmd.add_argument("--batch-size", type=int, default=seed.BATCH_SIZE)
+
+    stub_cmd = commands.add_parser("stub", help="Serve the stub AI provider.")
+    stub_cmd.add_argument("--host", default="127.0.0.1")
+    stub_cmd.add_argument("--port", type=int, default=8900)
+    stub_cmd.add_argument("--latency", type=float, default=0.5, help="Seconds added to every answer.")
+    stub_cmd.add_argument("--jitter", type=float, default=0.2)
+
+    run_cmd = commands.add_parser("run", help="Drive the scenarios against a running server.")
+    run_cmd.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run_cmd.add_argument("--users", type=int, default=50, help="Concurrent virtual users.")
+    run_cmd.add_argument("--duration", type=float, default=120, help="Measured seconds.")
+    run_cmd.add_argument("--warmup", type=float, default=15, help="Unmeasured seconds before the run.")
+    run_cmd.add_argument("--think-time", type=float, default=0.0, help="Mean pause between iterations.")
+    run_cmd.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                         help="Scenario weights, e.g. patient_booking=3,ai_checkers=1.")
+    run_cmd.add_argument("--scale", type=float, default=1.0, help="Scale the database was seeded with.")
+    run_cmd.add_argument("--seed", type=int, default=0, help="Seeds each virtual user's choices.")
+    run_cmd.add_argument("--out", help="Report path; defaults to loadtest-<commit>.json.")
+
+    compare_cmd = commands.add_parser("compare", help="Compare two reports; exits 1 on a regression.")
+    compare_cmd.add_argument("base")
+    compare_cmd.add_argument("head")
+    compare_cmd.add_argument("--tolerance", type=float, default=report.DEFAULT_TOLERANCE,
+                             help="Allowed p95/p99 slowdown, as a fraction.")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "seed":
+        seed.main(args.scale, args.batch_size)
+    elif args.command == "stub":
+        provider = StubProvider(args.host, args.port, latency=args.latency, jitter=args.jitter)
+        print(f"Stub AI provider on {provider.url}; start the app with GOOGLE_GEMINI_BASE_URL={provider.url}")
+        provider.serve_forever()
+    elif args.command == "run":
+        result = asyncio.run(runner.run(
+            args.base_url, users=args.users, mix=args.mix, volumes=seed.volumes(args.scale),
+            duration=args.duration, warmup=args.warmup, think_time=args.think_time, seed=args.seed,
+        ))
+        out = args.out or f"loadtest-{result['meta']['commit'] or 'local'}.json"
+        report.write_report(result, out)
+        print(report.format_table(result))
+        print(f"\nReport written to {out}")
+    elif args.command == "compare":
+        rows = report.compare(report.load_report(args.base), report.load_report(args.head), tolerance=args.tolerance)
+        print(report.format_comparison(rows))
+        return 1 if any(row["regressed"] for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
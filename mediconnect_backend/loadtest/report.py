@@ -0,0 +1,118 @@
+"""
+Load-test results: per-request latency percentiles, throughput and error rates,
+written as JSON so runs on two commits can be compared.
+"""
+import json
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+DEFAULT_TOLERANCE = 0.10
+
+
+class Sample(NamedTuple):
+    name: str
+    elapsed: float
+    ok: bool
+
+
+class Recorder:
+    """
+    Collects one sample per request while `measuring` is set, so warm-up traffic is left out.
+    """
+
+    def __init__(self):
+        self.samples: List[Sample] = []
+        self.measuring = False
+
+    def record(self, name: str, elapsed: float, ok: bool) -> None:
+        if self.measuring:
+            self.samples.append(Sample(name, elapsed, ok))
+
+
+def summarize(elapsed: List[float], errors: int, duration: float) -> dict:
+    latencies = np.asarray(elapsed) * 1000
+    summary = {
+        "count": len(elapsed),
+        "errors": errors,
+        "error_rate": round(errors / len(elapsed), 4) if elapsed else 0.0,
+        "rps": round(len(elapsed) / duration, 2) if duration else 0.0,
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(float(np.percentile(latencies, p)), 1) if elapsed else None
+    summary["max_ms"] = round(float(latencies.max()), 1) if elapsed else None
+    return summary
+
+
+def build_report(samples: List[Sample], duration: float, meta: dict) -> dict:
+    by_name: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_name[sample.name].append(sample)
+    requests = {
+        name: summarize([s.elapsed for s in group], sum(not s.ok for s in group), duration)
+        for name, group in sorted(by_name.items())
+    }
+    total = summarize([s.elapsed for s in samples], sum(not s.ok for s in samples), duration)
+    return {"meta": {**meta, "duration_seconds": duration}, "total": total, "requests": requests}
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(base: dict, head: dict, *, tolerance: float = DEFAULT_TOLERANCE) -> List[dict]:
+    """
+    One row per request present in both reports. A row regresses when head's p95 or p99
+    is more than `tolerance` slower than base's, or its error rate went up.
+    """
+    rows = []
+    for name in sorted(set(base["requests"]) & set(head["requests"])):
+        before, after = base["requests"][name], head["requests"][name]
+        row = {"name": name, "regressed": after["error_rate"] > before["error_rate"]}
+        for key in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            row[key] = (before[key], after[key])
+            if key in ("p95_ms", "p99_ms") and before[key] and after[key] is not None:
+                row["regressed"] |= after[key] > before[key] * (1 + tolerance)
+        row["error_rate"] = (before["error_rate"], after["error_rate"])
+        rows.append(row)
+    return rows
+
+
+def format_table(report: dict) -> str:
+    lines = [f"{'request':<42}{'count':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}"]
+    for name, s in [*report["requests"].items(), ("TOTAL", report["total"])]:
+        lines.append(
+            f"{name:<42}{s['count']:>8}{s['rps']:>9}{_ms(s['p50_ms']):>9}{_ms(s['p95_ms']):>9}"
+            f"{_ms(s['p99_ms']):>9}{s['errors']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = [f"{'request':<42}{'p50 ms':>18}{'p95 ms':>18}{'p99 ms':>18}{'rps':>18}"]
+    for row in rows:
+        cells = "".join(f"{_ms(row[key][0]) + ' -> ' + _ms(row[key][1]):>18}" for key in ("p50_ms", "p95_ms", "p99_ms", "rps"))
+        lines.append(f"{row['name']:<42}{cells}{'  REGRESSED' if row['regressed'] else ''}")
+    return "\n".join(lines)
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value:g}"
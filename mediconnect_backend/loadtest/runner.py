@@ -0,0 +1,137 @@
+"""
+Closed-loop load runner: a fixed number of virtual users, split across scenarios by
+weight, each running its scenario back to back (plus optional think time) until the
+run ends. Requests during the warm-up are sent but not measured.
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import httpx
+
+from app.core.config import get_settings
+from loadtest.report import Recorder, build_report, current_commit
+from loadtest.scenarios import SCENARIOS
+from loadtest.seed import PASSWORD, Volumes, email
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+class Result(NamedTuple):
+    status: int
+    body: Any
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, scenario: str, volumes: Volumes, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.scenario = scenario
+        self.volumes = volumes
+        self.rng = rng
+        self.user_id: Optional[int] = None
+        self.token: Optional[str] = None
+
+    async def login(self) -> None:
+        role = SCENARIOS[self.scenario].role
+        if role is None:
+            return
+        v = self.volumes
+        first, last = {
+            "admin": (1, v.admins),
+            "doctor": (v.first_doctor, v.first_patient - 1),
+            "patient": (v.first_patient, v.users),
+        }[role]
+        self.user_id = self.rng.randint(first, last)
+        response = await self.client.post(
+            f"{settings.API_V1_STR}/login/access-token",
+            data={"username": email(self.user_id, v), "password": PASSWORD},
+        )
+        body = response.json()
+        if response.status_code != 200 or not body.get("success", True):
+            logger.warning(f"Login failed for {email(self.user_id, v)}: {body.get('message')}")
+            return
+        self.token = body["data"]["token"]["access_token"]
+
+    async def request(self, name: str, method: str, path: str, *, expect: Tuple[int, ...] = (200,), **kwargs) -> Optional[Result]:
+        """
+        Sends and times one request. It counts as an error on an unexpected status, on a
+        200 whose envelope says `success: false`, or on a transport failure (None is returned).
+        """
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, f"{settings.API_V1_STR}{path}", headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(f"{self.scenario}:{name}", time.perf_counter() - started, False)
+            return None
+        elapsed = time.perf_counter() - started
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        ok = response.status_code in expect and not (
+            response.status_code == 200 and isinstance(body, dict) and body.get("success") is False
+        )
+        self.recorder.record(f"{self.scenario}:{name}", elapsed, ok)
+        return Result(response.status_code, body)
+
+
+def split_users(users: int, mix: Dict[str, int]) -> Dict[str, int]:
+    """
+    Distributes `users` over the scenarios in proportion to their weights, largest remainders first.
+    """
+    total = sum(mix.values())
+    exact = {name: users * weight / total for name, weight in mix.items()}
+    counts = {name: int(share) for name, share in exact.items()}
+    for name in sorted(exact, key=lambda n: exact[n] - counts[n], reverse=True)[:users - sum(counts.values())]:
+        counts[name] += 1
+    return {name: count for name, count in counts.items() if count}
+
+
+async def run(base_url: str, *, users: int, mix: Dict[str, int], volumes: Volumes, duration: float,
+              warmup: float = 10.0, think_time: float = 0.0, seed: int = 0) -> dict:
+    recorder = Recorder()
+    counts = split_users(users, mix)
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=REQUEST_TIMEOUT_SECONDS, limits=limits) as client:
+        virtual_users = [
+            VirtualUser(client, recorder, scenario, volumes, random.Random(f"{seed}-{scenario}-{i}"))
+            for scenario, count in counts.items() for i in range(count)
+        ]
+        await asyncio.gather(*(user.login() for user in virtual_users))
+
+        started = time.perf_counter()
+        deadline = started + warmup + duration
+
+        async def drive(user: VirtualUser) -> None:
+            iteration = SCENARIOS[user.scenario].iteration
+            while time.perf_counter() < deadline:
+                await iteration(user)
+                if think_time:
+                    await asyncio.sleep(user.rng.expovariate(1 / think_time))
+
+        drivers = asyncio.gather(*(drive(user) for user in virtual_users))
+        await asyncio.sleep(warmup)
+        recorder.measuring = True
+        measured_from = time.perf_counter()
+        await drivers
+        measured = time.perf_counter() - measured_from
+
+    meta = {
+        "commit": current_commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "users": counts,
+        "volumes": volumes._asdict(),
+        "warmup_seconds": warmup,
+        "think_time_seconds": think_time,
+        "seed": seed,
+    }
+    return build_report(recorder.samples, measured, meta)
@@ -0,0 +1,112 @@
+"""
+User journeys driven by the load runner. One call of a scenario's `iteration` is one
+pass through the journey; every request in it is timed under `<scenario>:<name>`.
+Scenarios log in as a seeded user of their `role` (see loadtest.seed) before the clock starts.
+"""
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+from loadtest.seed import REASONS, SPECIALTIES
+
+BOOKING_WINDOW_DAYS = 7
+SYMPTOMS = [["cough", "sore throat"], ["headache", "fever"], ["rash", "itching"], ["nausea", "fatigue"]]
+HISTORIES = [["hay fever"], ["asthma"], [], ["eczema", "penicillin allergy"]]
+MEALS = ["two slices of toast with butter", "chicken caesar salad", "bowl of ramen", "banana and yoghurt"]
+
+
+class Scenario(NamedTuple):
+    role: Optional[str]
+    iteration: Callable[..., Awaitable[None]]
+
+
+def _data(result):
+    body = result.body if result is not None else None
+    return body.get("data") if isinstance(body, dict) else None
+
+
+async def patient_booking(user) -> None:
+    """
+    Search doctors, open one's availability, book a free slot, check the list, cancel.
+    """
+    rng, v = user.rng, user.volumes
+    page = _data(await user.request(
+        "search doctors", "GET", "/doctors/search", params={"specialty": rng.choice(SPECIALTIES), "limit": 20}
+    ))
+    items = page.get("items") if page else None
+    doctor_id = rng.choice(items)["doctor_id"] if items else rng.randint(v.first_doctor, v.first_patient - 1)
+
+    start = date.today() + timedelta(days=1)
+    days = _data(await user.request(
+        "doctor availability", "GET", f"/doctors/{doctor_id}/availability",
+        params={"from": start.isoformat(), "to": (start + timedelta(days=BOOKING_WINDOW_DAYS - 1)).isoformat()},
+    )) or []
+    free = [(day["date"], slot) for day in days for slot in day["slots"]]
+
+    booked = None
+    if free:
+        day, slot = rng.choice(free)
+        # 409 is the expected answer when another user took the slot first
+        booked = _data(await user.request(
+            "book appointment", "POST", "/appointments/patients/me/appointments", expect=(200, 409),
+            json={"patient_id": user.user_id, "doctor_id": doctor_id, "date": day, "time": slot,
+                  "reason": rng.choice(REASONS)},
+        ))
+
+    await user.request("my appointments", "GET", "/appointments/patients/me/appointments", params={"status": "UPCOMING"})
+    if booked and "id" in booked:
+        await user.request("cancel appointment", "PATCH", f"/appointments/patients/me/appointments/{booked['id']}")
+
+
+async def doctor_day_view(user) -> None:
+    """
+    Today's appointments, one of them in detail, and the unread notification badge.
+    """
+    today = date.today().isoformat()
+    appointments = _data(await user.request(
+        "day appointments", "GET", "/appointments/doctors/me/appointments",
+        params={"startDate": today, "endDate": today},
+    ))
+    if appointments:
+        appointment = user.rng.choice(appointments)
+        await user.request("appointment detail", "GET", f"/appointments/doctors/me/appointments/{appointment['id']}")
+    await user.request("unread count", "GET", "/notifications/notifications/unread-count")
+
+
+async def admin_dashboard(user) -> None:
+    """
+    Dashboard KPIs, income, a page of transactions and a user search.
+    """
+    rng = user.rng
+    await user.request("dashboard stats", "GET", "/admin/dashboard-stats")
+    await user.request("income stats", "GET", "/admin/income/stats")
+    await user.request(
+        "income transactions", "GET", "/admin/income/transactions",
+        params={"page": rng.randint(1, 50), "size": 20, "count_mode": "estimated"},
+    )
+    await user.request(
+        "user search", "GET", "/admin/users",
+        params={"search": f"patient{rng.randint(1, user.volumes.users)}", "count_mode": "estimated"},
+    )
+
+
+async def ai_checkers(user) -> None:
+    """
+    The three checker endpoints, answered by the stub provider (loadtest.stub_provider).
+    """
+    rng = user.rng
+    await user.request("symptom checker", "POST", "/ai/symptom-checker", json={"symptoms": rng.choice(SYMPTOMS)})
+    await user.request(
+        "allergy checker", "POST", "/ai/allergy-checker",
+        json={"symptoms": rng.choice(SYMPTOMS), "medical_history": rng.choice(HISTORIES)},
+    )
+    await user.request("calorie checker", "POST", "/ai/calorie-checker", json={"meal_description": rng.choice(MEALS)})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "patient_booking": Scenario("patient", patient_booking),
+    "doctor_day_view": Scenario("doctor", doctor_day_view),
+    "admin_dashboard": Scenario("admin", admin_dashboard),
+    "ai_checkers": Scenario(None, ai_checkers),
+}
+
+DEFAULT_MIX = {"patient_booking": 60, "doctor_day_view": 25, "admin_dashboard": 5, "ai_checkers": 10}
@@ -0,0 +1,259 @@
+"""
+Bulk seeding of a disposable load-test database.
+
+Rows are generated inside Postgres with generate_series, in id ranges committed one
+batch at a time, so seeding millions of rows needs no client-side data and can be
+resumed by hand after a failure. Every value is derived from the row id, never from
+random(), so two seeds at the same scale hold the same data and runs against
+different commits stay comparable.
+
+Layout by user id: admins first, then doctors, then patients. Doctor and patient
+rows reuse the id of their user, as the `/me` endpoints expect.
+"""
+import asyncio
+import logging
+import math
+import time
+from datetime import date, datetime
+from typing import NamedTuple
+
+from sqlalchemy import create_engine, pool, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash
+
+logger = logging.getLogger(__name__)
+
+PASSWORD = "loadtest-password"
+EMAIL_DOMAIN = "loadtest.invalid"
+BATCH_SIZE = 250_000
+
+# appointments fill 09:00-17:00; schedules run 08:00-18:00, so every day keeps free slots
+SLOTS_PER_DAY = 16
+SCHEDULE_START, SCHEDULE_END = "08:00", "18:00"
+FUTURE_SCHEDULE_DAYS = 30
+HISTORY_DAYS = 365
+
+FIRST_NAMES = ["Amina", "Ben", "Chen", "Dara", "Elif", "Femi", "Grace", "Hugo", "Ines", "Jonas",
+               "Kavya", "Liam", "Mei", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sami", "Tariq"]
+LAST_NAMES = ["Okafor", "Silva", "Nguyen", "Muller", "Khan", "Rossi", "Haddad", "Kim", "Novak", "Mensah",
+              "Garcia", "Ivanova", "Sato", "Dubois", "Adeyemi", "Larsen", "Costa", "Patel", "Cohen", "Ali"]
+SPECIALTIES = ["Cardiology", "Dermatology", "General Practice", "Neurology", "Oncology",
+               "Orthopedics", "Pediatrics", "Psychiatry", "Radiology", "Urology"]
+REASONS = ["Routine check-up", "Follow-up visit", "Persistent headache", "Skin rash",
+           "Back pain", "Blood test results"]
+MESSAGES = ["Your appointment is confirmed.", "Reminder: you have an appointment tomorrow.",
+            "Your doctor has added consultation notes.", "A payment was received."]
+
+
+class Volumes(NamedTuple):
+    admins: int
+    doctors: int
+    patients: int
+    appointments: int
+    notifications: int
+    transactions: int
+
+    @property
+    def users(self) -> int:
+        return self.admins + self.doctors + self.patients
+
+    @property
+    def first_doctor(self) -> int:
+        return self.admins + 1
+
+    @property
+    def first_patient(self) -> int:
+        return self.admins + self.doctors + 1
+
+    @property
+    def appointment_days(self) -> int:
+        return math.ceil(self.appointments / (self.doctors * SLOTS_PER_DAY))
+
+
+def volumes(scale: float = 1.0) -> Volumes:
+    """
+    Seed sizes; scale 1.0 is 1M users, 10M appointments and notifications, 5M transactions.
+    """
+    users = max(int(1_000_000 * scale), 100)
+    doctors = max(users // 100, 1)
+    return Volumes(
+        admins=10,
+        doctors=doctors,
+        patients=users - doctors - 10,
+        appointments=int(10_000_000 * scale),
+        notifications=int(10_000_000 * scale),
+        transactions=int(5_000_000 * scale),
+    )
+
+
+def email(user_id: int, v: Volumes) -> str:
+    if user_id < v.first_doctor:
+        return f"admin{user_id}@{EMAIL_DOMAIN}"
+    if user_id < v.first_patient:
+        return f"doctor{user_id}@{EMAIL_DOMAIN}"
+    return f"patient{user_id}@{EMAIL_DOMAIN}"
+
+
+def first_day(v: Volumes, today: date) -> date:
+    # three quarters of the appointments are history, the rest are upcoming
+    return date.fromordinal(today.toordinal() - v.appointment_days * 3 // 4)
+
+
+def _array(values) -> str:
+    return "ARRAY[" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + "]"
+
+
+USERS = f"""
+INSERT INTO users (id, full_name, email, hashed_password, is_active, is_superuser, phone, status, token_balance, role_id)
+SELECT g,
+       ({_array(FIRST_NAMES)})[1 + g % {len(FIRST_NAMES)}] || ' ' || ({_array(LAST_NAMES)})[1 + (g / {len(FIRST_NAMES)}) % {len(LAST_NAMES)}],
+       CASE WHEN g < :first_doctor THEN 'admin' WHEN g < :first_patient THEN 'doctor' ELSE 'patient' END || g || '@{EMAIL_DOMAIN}',
+       :password, true, g < :first_doctor, '+1555' || lpad(g::text, 7, '0'), 'active', 0,
+       CASE WHEN g < :first_doctor THEN :admin_role WHEN g < :first_patient THEN :doctor_role ELSE :patient_role END
+FROM generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS g
+"""
+
+DOCTORS = f"""
+INSERT INTO doctor (id, name, email, specialty, phone_number, is_active, user_id, rating_sum, rating_count)
+SELECT id, full_name, email, ({_array(SPECIALTIES)})[1 + id % {len(SPECIALTIES)}], phone, true, id, 0, 0
+FROM users WHERE id BETWEEN :start AND :end
+"""
+
+PATIENTS = """
+INSERT INTO patient (id, name, email, phone_number, date_of_birth, gender, address, user_id)
+SELECT id, full_name, email, phone, DATE '1940-01-01' + CAST(id::bigint * 7919 % 29000 AS integer),
+       CASE WHEN id % 2 = 0 THEN 'female' ELSE 'male' END, id || ' Load Test Street', id
+FROM users WHERE id BETWEEN :start AND :end
+"""
+
+SCHEDULES = f"""
+INSERT INTO schedules (doctor_id, date, start_time, end_time, is_available)
+SELECT doctor_id, CAST(:first_day AS date) + day_offset, TIME '{SCHEDULE_START}', TIME '{SCHEDULE_END}', true
+FROM generate_series(:start, :end) AS doctor_id CROSS JOIN generate_series(0, :days - 1) AS day_offset
+"""
+
+# appointment g takes the next free 09:00-17:00 slot of doctor (g - 1) % doctors, so slots never collide
+APPOINTMENTS = f"""
+INSERT INTO appointments (id, patient_id, doctor_id, date, time, reason, status, review_given, reminder_sent)
+SELECT g,
+       :first_patient + (g * 7919) % :patients,
+       :first_doctor + (g - 1) % :doctors,
+       slot.day,
+       TIME '09:00' + ((g - 1) / :doctors) % {SLOTS_PER_DAY} * INTERVAL '30 minutes',
+       ({_array(REASONS)})[1 + g % {len(REASONS)}],
+       CASE WHEN slot.day >= :today THEN 'UPCOMING' WHEN g % 12 = 0 THEN 'CANCELLED' ELSE 'COMPLETED' END,
+       0,
+       slot.day < :today
+FROM generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS g
+CROSS JOIN LATERAL (SELECT CAST(:first_day AS date) + CAST((g - 1) / :doctors / {SLOTS_PER_DAY} AS integer) AS day) AS slot
+"""
+
+NOTIFICATIONS = f"""
+INSERT INTO notifications (id, user_id, message, timestamp, created_at, is_read)
+SELECT g, 1 + (g * 104729) % :users, ({_array(MESSAGES)})[1 + g % {len(MESSAGES)}], sent.ts, sent.ts, g % 10 < 7
+FROM generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS g
+CROSS JOIN LATERAL (SELECT CAST(:now AS timestamp) - (g * 7919) % :history_seconds * INTERVAL '1 second' AS ts) AS sent
+"""
+
+TRANSACTIONS = """
+INSERT INTO transactions (id, user_id, amount, timestamp)
+SELECT g, :first_patient + (g * 15485863) % :patients, 20 + (g * 37) % 28000 / 100.0,
+       CAST(:now AS timestamp) - (g * 7919) % :history_seconds * INTERVAL '1 second'
+FROM generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS g
+"""
+
+SEQUENCES = ["users", "doctor", "patient", "schedules", "appointments", "notifications", "transactions"]
+
+
+def insert_batches(connection: Connection, table: str, statement: str, first: int, last: int,
+                   batch_size: int = BATCH_SIZE, **params) -> None:
+    """
+    Runs `statement` over consecutive [start, end] id ranges, committing each range.
+    """
+    started = time.perf_counter()
+    for start in range(first, last + 1, batch_size):
+        end = min(start + batch_size - 1, last)
+        connection.execute(text(statement), {**params, "start": start, "end": end})
+        connection.commit()
+        logger.info(f"{table}: {end - first + 1}/{last - first + 1} rows")
+    logger.info(f"{table}: seeded in {time.perf_counter() - started:.0f}s")
+
+
+def role_ids(connection: Connection) -> dict:
+    connection.execute(text(
+        "INSERT INTO roles (role) VALUES ('admin'), ('doctor'), ('patient') ON CONFLICT (role) DO NOTHING"
+    ))
+    connection.commit()
+    return dict(connection.execute(text("SELECT role, id FROM roles")).all())
+
+
+def seed(database_url: str, v: Volumes, *, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Seeds an empty schema (create it with alembic first). Refuses to touch a database
+    that already has users.
+    """
+    today = datetime.utcnow().date()
+    now = datetime.utcnow().replace(microsecond=0)
+    engine = create_engine(database_url, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        if connection.execute(text("SELECT EXISTS (SELECT 1 FROM users)")).scalar():
+            raise RuntimeError("The users table is not empty; seed a fresh database")
+        roles = role_ids(connection)
+        history_seconds = HISTORY_DAYS * 24 * 3600
+        start_day = first_day(v, today)
+
+        insert_batches(
+            connection, "users", USERS, 1, v.users, batch_size,
+            password=get_password_hash(PASSWORD), first_doctor=v.first_doctor, first_patient=v.first_patient,
+            admin_role=roles["admin"], doctor_role=roles["doctor"], patient_role=roles["patient"],
+        )
+        insert_batches(connection, "doctor", DOCTORS, v.first_doctor, v.first_patient - 1, batch_size)
+        insert_batches(connection, "patient", PATIENTS, v.first_patient, v.users, batch_size)
+        insert_batches(
+            connection, "schedules", SCHEDULES, v.first_doctor, v.first_patient - 1,
+            max(batch_size // (v.appointment_days + FUTURE_SCHEDULE_DAYS), 1),
+            first_day=start_day, days=v.appointment_days + FUTURE_SCHEDULE_DAYS,
+        )
+        insert_batches(
+            connection, "appointments", APPOINTMENTS, 1, v.appointments, batch_size,
+            first_patient=v.first_patient, patients=v.patients, first_doctor=v.first_doctor,
+            doctors=v.doctors, first_day=start_day, today=today,
+        )
+        insert_batches(
+            connection, "notifications", NOTIFICATIONS, 1, v.notifications, batch_size,
+            users=v.users, now=now, history_seconds=history_seconds,
+        )
+        insert_batches(
+            connection, "transactions", TRANSACTIONS, 1, v.transactions, batch_size,
+            first_patient=v.first_patient, patients=v.patients, now=now, history_seconds=history_seconds,
+        )
+
+        for table in SEQUENCES:
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            ))
+        connection.commit()
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+
+
+async def refresh_read_models() -> None:
+    """
+    Brings counters, rating totals, revenue rollups and search documents in line with
+    the seeded rows, using the same jobs the scheduler runs.
+    """
+    from app.doctor_search import refresh_doctor_search_documents
+    from app.reconciliation import reconcile_all
+    from app.rollups import roll_up_revenue
+
+    await reconcile_all()
+    await roll_up_revenue()
+    await refresh_doctor_search_documents()
+
+
+def main(scale: float, batch_size: int = BATCH_SIZE) -> None:
+    v = volumes(scale)
+    logger.info(f"Seeding {v}")
+    seed(get_settings().DATABASE_URL, v, batch_size=batch_size)
+    asyncio.run(refresh_read_models())
@@ -0,0 +1,108 @@
+"""
+Stand-in for the Gemini API during load tests.
+
+Answers `POST /v1beta/models/{model}:generateContent` with a canned JSON answer for
+the checker the prompt came from, after a configurable delay, so AI endpoints can be
+loaded without quota or cost. Point the app at it with
+`GOOGLE_GEMINI_BASE_URL=http://<host>:<port>`, which google-genai reads on every
+`genai.Client()`.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+ANSWERS = {
+    "symptoms and return JSON": {"assessment": "Likely a common cold", "recommended_action": "Rest and drink fluids"},
+    "allergic reaction": {"is_allergy": True, "confidence": 0.8, "potential_allergens": ["pollen", "dust mites"]},
+    "calorie count": {"calories": 420, "breakdown": {"protein": 20, "carbohydrates": 55, "fat": 12}},
+}
+FALLBACK_ANSWER = {"summary": "Stub response"}
+
+
+def answer_for(prompt: str) -> dict:
+    for marker, answer in ANSWERS.items():
+        if marker in prompt:
+            return answer
+    return FALLBACK_ANSWER
+
+
+def prompt_text(body: dict) -> str:
+    return " ".join(
+        part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])
+    )
+
+
+class StubProvider:
+    """
+    Threaded HTTP server; `latency` seconds (plus up to `jitter`) are added to every answer.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, latency: float = 0.5, jitter: float = 0.2):
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self.send_error(400, "Invalid JSON")
+                    return
+                if not self.path.split("?")[0].endswith(":generateContent"):
+                    self.send_error(404, "Only generateContent is stubbed")
+                    return
+                with provider._lock:
+                    provider.requests += 1
+                time.sleep(provider.latency + random.uniform(0, provider.jitter))
+
+                model = self.path.split("/models/")[-1].split(":")[0]
+                payload = json.dumps({
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"text": json.dumps(answer_for(prompt_text(body)))}]},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }],
+                    "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": 0, "totalTokenCount": 0},
+                    "modelVersion": model,
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubProvider":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-provider", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
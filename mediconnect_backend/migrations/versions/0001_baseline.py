@@ -0,0 +1,23 @@
+"""baseline
+
+The schema as it stood when migrations were introduced. Databases built before then
+are stamped with this revision (`alembic stamp 0001_baseline`) and upgraded from here.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 09:00:00
+"""
+from typing import Sequence, Union
+
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
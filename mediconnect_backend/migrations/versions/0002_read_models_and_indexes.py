@@ -0,0 +1,230 @@
+"""read models and performance indexes
+
+Brings databases stamped at the baseline up to the models: the broadcast, counter,
+rollup, import-job and doctor-search tables, the doctor rating totals, notification
+read state, hospital department lists and the indexes behind them. Every step is
+idempotent so databases that already carry part of it by hand upgrade cleanly.
+
+Revision ID: 0002_read_models_and_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19 09:30:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db import migration_ops
+
+revision: str = "0002_read_models_and_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEPARTMENT_LIST = "array_remove(regexp_split_to_array(lower(btrim(departments)), '\\s*,\\s*'), '')"
+
+
+def create_tables() -> None:
+    op.create_table(
+        "broadcasts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("target_audience", sa.String(), nullable=False),
+        sa.Column("audience_role", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_broadcasts_id", "broadcasts", ["id"], if_not_exists=True)
+    op.create_index("ix_broadcasts_audience_role", "broadcasts", ["audience_role"], if_not_exists=True)
+    op.create_index("ix_broadcasts_created_at", "broadcasts", ["created_at"], if_not_exists=True)
+
+    op.create_table(
+        "broadcast_receipts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("broadcast_id", sa.Integer(), sa.ForeignKey("broadcasts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("read_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("broadcast_id", "user_id", name="uq_broadcast_receipt_user"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_broadcast_receipts_id", "broadcast_receipts", ["id"], if_not_exists=True)
+    op.create_index("ix_broadcast_receipts_user_id", "broadcast_receipts", ["user_id"], if_not_exists=True)
+
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("unread_count", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "revenue_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("total_revenue", sa.Float(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("rolled_through", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total_rows", sa.Integer(), nullable=False),
+        sa.Column("processed_rows", sa.Integer(), nullable=False),
+        sa.Column("imported_count", sa.Integer(), nullable=False),
+        sa.Column("duplicate_count", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("error_report", sa.Text(), nullable=True),
+        sa.Column("message", sa.String(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "doctor_search_documents",
+        sa.Column("doctor_id", sa.Integer(), sa.ForeignKey("doctor.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("specialty", sa.String()),
+        sa.Column("specialty_key", sa.String()),
+        sa.Column("photo_url", sa.String()),
+        sa.Column("search_text", sa.Text()),
+        sa.Column("avg_rating", sa.Float(), nullable=False),
+        sa.Column("review_count", sa.Integer(), nullable=False),
+        sa.Column("next_available_at", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_doctor_search_rating", "doctor_search_documents",
+        [sa.text("avg_rating DESC"), "doctor_id"], postgresql_where=sa.text("is_active"), if_not_exists=True,
+    )
+    op.create_index(
+        "ix_doctor_search_specialty_rating", "doctor_search_documents",
+        ["specialty_key", sa.text("avg_rating DESC"), "doctor_id"],
+        postgresql_where=sa.text("is_active"), if_not_exists=True,
+    )
+    op.create_index(
+        "ix_doctor_search_text_trgm", "doctor_search_documents", ["search_text"],
+        postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}, if_not_exists=True,
+    )
+
+
+def add_columns() -> None:
+    # constant defaults are metadata-only changes: no table rewrite, only a brief lock
+    migration_ops.with_lock_retries(lambda: op.add_column(
+        "doctor", sa.Column("rating_sum", sa.Integer(), nullable=False, server_default="0"), if_not_exists=True,
+    ))
+    migration_ops.with_lock_retries(lambda: op.add_column(
+        "doctor", sa.Column("rating_count", sa.Integer(), nullable=False, server_default="0"), if_not_exists=True,
+    ))
+    migration_ops.with_lock_retries(lambda: op.add_column(
+        "notifications", sa.Column("is_read", sa.Boolean(), nullable=False, server_default=sa.false()),
+        if_not_exists=True,
+    ))
+    migration_ops.with_lock_retries(lambda: op.add_column(
+        "notifications", sa.Column("created_at", sa.DateTime(), nullable=True), if_not_exists=True,
+    ))
+    # a stored generated column rewrites the table; hospitals is small enough for that
+    migration_ops.with_lock_retries(lambda: op.add_column(
+        "hospitals",
+        sa.Column("department_list", postgresql.ARRAY(sa.Text()), sa.Computed(DEPARTMENT_LIST, persisted=True)),
+        if_not_exists=True,
+    ))
+
+
+def backfill() -> None:
+    migration_ops.backfill_in_batches("notifications", "created_at = timestamp", where="created_at IS NULL")
+    migration_ops.set_not_null("notifications", "created_at")
+    migration_ops.backfill_in_batches(
+        "doctor",
+        "rating_sum = totals.rating_sum, rating_count = totals.rating_count "
+        "FROM (SELECT doctor_id, sum(rating) AS rating_sum, count(*) AS rating_count "
+        "FROM reviews GROUP BY doctor_id) AS totals",
+        where="totals.doctor_id = doctor.id",
+        key="doctor.id",
+    )
+    op.execute(
+        "INSERT INTO notification_counters (user_id, unread_count) "
+        "SELECT user_id, count(*) FROM notifications WHERE user_id IS NOT NULL AND NOT is_read "
+        "GROUP BY user_id ON CONFLICT (user_id) DO NOTHING"
+    )
+
+
+def create_indexes() -> None:
+    duplicates = None if op.get_context().as_sql else op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM (SELECT 1 FROM appointments WHERE status != 'CANCELLED' "
+        "GROUP BY doctor_id, date, time HAVING count(*) > 1) AS taken"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} appointment slots are double-booked; cancel the extra bookings "
+            "before creating uq_appointments_active_slot"
+        )
+    migration_ops.create_index_concurrently(
+        "uq_appointments_active_slot", "appointments", ["doctor_id", "date", "time"],
+        unique=True, where="status != 'CANCELLED'",
+    )
+    migration_ops.create_index_concurrently(
+        "ix_appointments_doctor_date_time", "appointments", ["doctor_id", "date", "time"]
+    )
+    migration_ops.create_index_concurrently(
+        "ix_appointments_patient_status", "appointments", ["patient_id", "status"]
+    )
+    migration_ops.create_index_concurrently(
+        "ix_appointments_reminder_due", "appointments", ["date", "time"],
+        where="status = 'UPCOMING' AND reminder_sent = false",
+    )
+    migration_ops.create_index_concurrently("ix_notifications_created_at", "notifications", ["created_at"])
+    migration_ops.create_index_concurrently(
+        "ix_notifications_user_unread", "notifications", ["user_id"], where="is_read = false"
+    )
+    migration_ops.create_index_concurrently("ix_transactions_timestamp", "transactions", ["timestamp"])
+    migration_ops.create_index_concurrently(
+        "ix_hospitals_department_list", "hospitals", ["department_list"], using="gin"
+    )
+    for column in ("email", "full_name", "phone"):
+        migration_ops.create_index_concurrently(
+            f"ix_users_{column}_trgm", "users", [column], using="gin", ops={column: "gin_trgm_ops"}
+        )
+
+
+def upgrade() -> None:
+    create_tables()
+    add_columns()
+    backfill()
+    create_indexes()
+
+
+def downgrade() -> None:
+    for name in (
+        "ix_users_phone_trgm", "ix_users_full_name_trgm", "ix_users_email_trgm",
+        "ix_hospitals_department_list", "ix_transactions_timestamp",
+        "ix_notifications_user_unread", "ix_notifications_created_at",
+        "ix_appointments_reminder_due", "ix_appointments_patient_status",
+        "ix_appointments_doctor_date_time", "uq_appointments_active_slot",
+    ):
+        migration_ops.drop_index_concurrently(name)
+    op.drop_column("hospitals", "department_list")
+    op.drop_column("notifications", "created_at")
+    op.drop_column("notifications", "is_read")
+    op.drop_column("doctor", "rating_count")
+    op.drop_column("doctor", "rating_sum")
+    for table in (
+        "doctor_search_documents", "import_jobs", "rollup_watermarks", "revenue_daily",
+        "notification_counters", "broadcast_receipts", "broadcasts",
+    ):
+        op.drop_table(table)
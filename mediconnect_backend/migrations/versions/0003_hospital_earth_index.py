@@ -0,0 +1,34 @@
+"""earthdistance index for nearby hospitals
+
+Installs cube/earthdistance and builds the GiST index behind /hospitals/nearby.
+Creating the extensions needs a role allowed to do so; databases where that is not
+possible can skip this revision (`alembic stamp 0003_hospital_earth_index`) and
+nearby search keeps using the in-process grid.
+
+Revision ID: 0003_hospital_earth_index
+Revises: 0002_read_models_and_indexes
+Create Date: 2026-10-20 09:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db import migration_ops
+
+revision: str = "0003_hospital_earth_index"
+down_revision: Union[str, Sequence[str], None] = "0002_read_models_and_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+    migration_ops.create_index_concurrently(
+        "ix_hospitals_earth", "hospitals", [sa.text("ll_to_earth(latitude, longitude)")], using="gist"
+    )
+
+
+def downgrade() -> None:
+    migration_ops.drop_index_concurrently("ix_hospitals_earth")
@@ -0,0 +1,32 @@
+"""sign-up time on users
+
+Broadcasts are matched to users at read time; users.created_at keeps a new account
+from inheriting every earlier broadcast as unread. Existing accounts stay NULL and
+keep seeing every broadcast, as they existed when each was sent.
+
+Revision ID: 0004_user_created_at
+Revises: 0003_hospital_earth_index
+Create Date: 2026-10-20 11:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db import migration_ops
+
+revision: str = "0004_user_created_at"
+down_revision: Union[str, Sequence[str], None] = "0003_hospital_earth_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # nullable without a default: metadata-only, no table rewrite
+    migration_ops.with_lock_retries(lambda: op.add_column(
+        "users", sa.Column("created_at", sa.DateTime(), nullable=True), if_not_exists=True,
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "created_at")
@@ -6,13 +6,19 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# fail any request that exceeds the SQL budget or repeats a statement N+1 style
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("SQL_BUDGET_STRICT", "true")
 
 from app.main import app, initialize_database
 from app.core.config import get_settings
 from app.db.session import get_db
 from app.db.base import Base
+from app.db.query_counter import instrument
+from app.core.loop_watchdog import loop_watchdog
 
 engine = create_engine(get_settings().DATABASE_URL, pool_pre_ping=True)
+instrument(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_test_db():
@@ -31,3 +37,20 @@ def client():
     with TestClient(app) as c:
         yield c
     Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def db(client):
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+@pytest.fixture(autouse=True)
+def event_loop_not_blocked():
+    # opt in with LOOP_WATCHDOG_STRICT=true to fail tests whose requests block the loop
+    loop_watchdog.drain()
+    yield
+    if get_settings().LOOP_WATCHDOG_STRICT:
+        loop_watchdog.raise_if_blocked()
@@ -8,3 +8,59 @@ def test_get_doctors_pending_verification(client: TestClient, db: Session) -> No
     response = client.get(f"{settings.API_V1_STR}/admin/doctors/pending-verification")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+def test_import_hospitals_loads_valid_rows(client: TestClient, db: Session) -> None:
+    contents = (
+        "name,address,latitude,longitude,departments,website,phone_no,current_status,image,timings\n"
+        "Import General,1 Main St,10,20,ER,w,p,open,i,t\n"
+        "Broken,2 Main St,not-a-number,20,ER,w,p,open,i,t\n"
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/admin/hospitals/import",
+        files={"file": ("hospitals.csv", contents, "text/csv")},
+    )
+    assert response.status_code == 200
+    import_id = response.json()["data"]["id"]
+
+    status = client.get(f"{settings.API_V1_STR}/admin/imports/{import_id}")
+    assert status.status_code == 200
+    job = status.json()["data"]
+    assert job["status"] == "COMPLETED"
+    assert job["processed_rows"] == job["total_rows"] == 2
+    assert job["imported_count"] == 1
+    assert job["error_count"] == 1
+
+    report = client.get(f"{settings.API_V1_STR}/admin/imports/{import_id}/errors")
+    assert report.status_code == 200
+    assert "not-a-number" not in report.text
+    assert "latitude" in report.text
+
+
+def test_export_users_csv(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/admin/export/users", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("id,email,full_name")
+
+
+def test_export_unknown_resource(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/admin/export/passwords")
+    assert response.status_code == 404
+
+
+def test_user_search_total_respects_filter(client: TestClient, db: Session) -> None:
+    everyone = client.get(f"{settings.API_V1_STR}/admin/users").json()["data"]
+    matches = client.get(
+        f"{settings.API_V1_STR}/admin/users", params={"search": "no-such-user-zzzz@example.invalid"}
+    ).json()["data"]
+    assert matches["total"] == len(matches["users"]) == 0
+    assert everyone["total"] >= matches["total"]
+
+
+def test_user_list_count_modes(client: TestClient, db: Session) -> None:
+    url = f"{settings.API_V1_STR}/admin/users"
+    skipped = client.get(url, params={"count_mode": "none"}).json()["data"]
+    assert skipped["total"] is None and skipped["count_mode"] == "none"
+    estimated = client.get(url, params={"count_mode": "estimated"}).json()["data"]
+    assert isinstance(estimated["total"], int) and estimated["total"] >= 0
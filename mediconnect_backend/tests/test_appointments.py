@@ -1,7 +1,45 @@
 import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from app.api.v1 import deps
 from app.core.config import settings
+from app.main import app
+from app.models import Appointment, Consultation, Doctor, Patient, Review, Schedule
+
+BOOKING_DAY = datetime.date(2030, 1, 7)
+
+
+@pytest.fixture
+def doctor(db: Session) -> Doctor:
+    """A doctor seeing patients 09:00-12:00 on BOOKING_DAY."""
+    doctor = Doctor(name="Dr. Test", email=f"doctor-{uuid4().hex}@example.com", specialty="General")
+    db.add(doctor)
+    db.flush()
+    db.add(Schedule(
+        doctor_id=doctor.id, date=BOOKING_DAY,
+        start_time=datetime.time(9), end_time=datetime.time(12), is_available=True,
+    ))
+    db.commit()
+    return doctor
+
+
+@pytest.fixture
+def patient(db: Session):
+    """A patient the /patients/me endpoints see as the signed-in user."""
+    patient = Patient(name="Test Patient", email=f"patient-{uuid4().hex}@example.com")
+    db.add(patient)
+    db.commit()
+    # the patient endpoints check role 5 and book under the user's id
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(
+        id=patient.id, role=5, is_active=True
+    )
+    yield patient
+    del app.dependency_overrides[deps.get_current_active_user]
 
 def test_create_appointment(client: TestClient, db: Session) -> None:
     data = {
@@ -21,3 +59,60 @@ def test_read_appointments(client: TestClient, db: Session) -> None:
     response = client.get(f"{settings.API_V1_STR}/appointments/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+def test_double_booking_returns_suggestions(client: TestClient, doctor: Doctor, patient: Patient) -> None:
+    data = {
+        "doctor_id": doctor.id, "patient_id": patient.id,
+        "date": BOOKING_DAY.isoformat(), "time": "10:00:00", "reason": "Check-up",
+    }
+    url = f"{settings.API_V1_STR}/appointments/patients/me/appointments"
+    first = client.post(url, json=data)
+    assert first.status_code == 200
+    assert first.json()["success"] is True
+    second = client.post(url, json=data)
+    assert second.status_code == 409
+    assert second.json()["success"] is False
+    suggested = second.json()["data"]["suggested_slots"]
+    assert suggested
+    assert f"{BOOKING_DAY.isoformat()}T10:00:00" not in suggested
+
+
+def test_listing_appointments_runs_constant_queries(
+    client: TestClient, db: Session, doctor: Doctor, patient: Patient
+) -> None:
+    url = f"{settings.API_V1_STR}/appointments/patients/me/appointments"
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    def list_queries(expected: int):
+        statements.clear()
+        event.listen(db.get_bind(), "before_cursor_execute", count)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", count)
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == expected
+        return len(statements)
+
+    def seed(hour: int) -> None:
+        appointment = Appointment(
+            doctor_id=doctor.id, patient_id=patient.id, date=BOOKING_DAY,
+            time=datetime.time(hour), reason="Check-up", status="COMPLETED",
+        )
+        db.add(appointment)
+        db.flush()
+        db.add(Consultation(appointment_id=appointment.id, hpi="Headache"))
+        db.add(Review(
+            appointment_id=appointment.id, doctor_id=doctor.id, patient_id=patient.id, rating=4,
+        ))
+        db.commit()
+
+    seed(9)
+    few = list_queries(1)
+    for hour in range(10, 16):
+        seed(hour)
+    assert list_queries(7) == few
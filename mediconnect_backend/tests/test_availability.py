@@ -0,0 +1,34 @@
+from datetime import date, datetime, time
+
+from app.availability import bitmap_times, day_bitmap, first_free_slot
+
+
+def test_slots_fill_windows_and_skip_bookings() -> None:
+    bitmap = day_bitmap(
+        windows=[(time(9, 0), time(11, 0)), (time(14, 10), time(15, 30))],
+        booked=[time(9, 30), time(10, 45)],
+        slot_minutes=30,
+    )
+    assert bitmap_times(bitmap, 30) == [time(9, 0), time(10, 0), time(14, 30), time(15, 0)]
+
+
+def test_no_windows_means_no_slots() -> None:
+    assert bitmap_times(day_bitmap([], [time(9, 0)], 30), 30) == []
+
+
+def test_not_before_hides_past_slots() -> None:
+    bitmap = day_bitmap([(time(9, 0), time(10, 30))], [], 30)
+    assert bitmap_times(bitmap, 30, not_before=9 * 60 + 1) == [time(9, 30), time(10, 0)]
+
+
+def test_first_free_slot_skips_past_and_booked_slots() -> None:
+    windows = {
+        date(2026, 3, 1): [(time(9, 0), time(12, 0))],
+        date(2026, 3, 2): [(time(9, 0), time(10, 0))],
+        date(2026, 3, 3): [(time(14, 0), time(15, 0))],
+    }
+    booked = {date(2026, 3, 2): [time(9, 0), time(9, 30)]}
+    now = datetime(2026, 3, 2, 8, 0)
+    assert first_free_slot(windows, booked, 30, now) == datetime(2026, 3, 3, 14, 0)
+    assert first_free_slot(windows, {}, 30, datetime(2026, 3, 1, 10, 10)) == datetime(2026, 3, 1, 10, 30)
+    assert first_free_slot(windows, {}, 30, datetime(2026, 3, 4)) is None
@@ -0,0 +1,52 @@
+import asyncio
+
+from app.core.cache import StaleWhileRevalidateCache
+
+
+def test_concurrent_misses_share_one_load() -> None:
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def run():
+        cache = StaleWhileRevalidateCache(ttl=60)
+        return await asyncio.gather(*[cache.get_or_load("key", loader) for _ in range(5)])
+
+    assert asyncio.run(run()) == [1, 1, 1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_while_refreshing() -> None:
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        cache = StaleWhileRevalidateCache(ttl=0.01, stale_ttl=60)
+        first = await cache.get_or_load("key", loader)
+        await asyncio.sleep(0.02)
+        stale = await cache.get_or_load("key", loader)
+        await asyncio.sleep(0)
+        refreshed = await cache.get_or_load("key", loader)
+        return first, stale, refreshed
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+
+def test_peek_loads_in_background() -> None:
+    async def loader():
+        return 42
+
+    async def run():
+        cache = StaleWhileRevalidateCache(ttl=60)
+        miss = cache.peek("key", loader)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return miss, cache.peek("key", loader)
+
+    assert asyncio.run(run()) == (None, 42)
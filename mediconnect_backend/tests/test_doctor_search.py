@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.crud_doctor_search import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    document = SimpleNamespace(avg_rating=4.333333333333333, doctor_id=17)
+    assert decode_cursor(encode_cursor(document)) == (4.333333333333333, 17)
+
+
+def test_malformed_cursor_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_search_rejects_bad_cursor(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/doctors/search", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_search_returns_page(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/doctors/search", params={"min_rating": 0, "limit": 5})
+    assert response.status_code == 200
+    page = response.json()["data"]
+    assert len(page["items"]) <= 5
+    ratings = [item["avg_rating"] for item in page["items"]]
+    assert ratings == sorted(ratings, reverse=True)
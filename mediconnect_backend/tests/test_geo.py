@@ -0,0 +1,24 @@
+import numpy as np
+
+from app.geo import HospitalGrid, haversine_km
+
+
+def test_haversine_known_distance() -> None:
+    # Mumbai CST to Pune station is roughly 120 km as the crow flies
+    distance = haversine_km(18.9398, 72.8355, np.array([18.5286]), np.array([73.8743]))[0]
+    assert 118 < distance < 122
+
+
+def test_grid_matches_brute_force() -> None:
+    rng = np.random.default_rng(7)
+    lats = rng.uniform(-60, 60, 2000)
+    lngs = rng.uniform(-180, 180, 2000)
+    grid = HospitalGrid(np.arange(2000), lats, lngs)
+    for lat, lng, radius in [(10.0, 179.9, 800), (-45.0, 0.0, 300), (0.0, 0.0, 20000)]:
+        distances = haversine_km(lat, lng, lats, lngs)
+        expected = [int(i) for i in np.argsort(distances, kind="stable") if distances[i] <= radius][:10]
+        assert [id for id, _ in grid.nearest(lat, lng, radius, 10)] == expected
+
+
+def test_grid_empty() -> None:
+    assert HospitalGrid.from_rows([]).nearest(0.0, 0.0, 50, 5) == []
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import app.hospital_directory as hospital_directory_module
+from app.hospital_directory import DirectorySnapshot, HospitalDirectory
+from app.schemas.hospital import Hospital
+
+
+def make_hospital(id: int, name: str, status: str, latitude: float = 19.0, longitude: float = 72.8) -> Hospital:
+    return Hospital(
+        id=id, name=name, address=f"{id} Main Road", latitude=latitude, longitude=longitude,
+        departments="", website="", phone_no="", current_status=status, image="", timings="",
+    )
+
+
+def test_snapshot_filters() -> None:
+    snapshot = DirectorySnapshot(
+        1,
+        [
+            make_hospital(1, "City General", "Open"),
+            make_hospital(2, "City Heart Centre", "Closed"),
+            make_hospital(3, "Lakeside Clinic", "open"),
+        ],
+        [["cardiology", "emergency"], ["cardiology"], ["pediatrics"]],
+    )
+    assert [h.id for h in snapshot.filter(department="Cardiology")] == [1, 2]
+    assert [h.id for h in snapshot.filter(status="OPEN")] == [1, 3]
+    assert [h.id for h in snapshot.filter(name_prefix="city", status="open")] == [1]
+    assert [h.id for h in snapshot.filter(department="cardiology", skip=1)] == [2]
+    assert snapshot.filter(department="oncology") == []
+    assert [h.id for h in snapshot.filter(limit=2)] == [1, 2]
+    assert [id for id, _ in snapshot.grid.nearest(19.0, 72.8, 1, 10)] == [1, 2, 3]
+
+
+def test_current_without_a_running_loop() -> None:
+    directory = HospitalDirectory(ttl=60)
+    assert directory.current() is None
+    assert not directory._background
+
+
+def test_refresh_rereads_when_a_running_rebuild_started_before_the_write(monkeypatch) -> None:
+    directory = HospitalDirectory(ttl=60)
+    release = asyncio.Event()
+    reads = []
+
+    async def read_rows(_loader):
+        reads.append(time.monotonic())
+        if len(reads) == 1:
+            await release.wait()  # the first rebuild read its rows before the write committed
+        return []
+
+    monkeypatch.setattr(hospital_directory_module, "run_in_session", read_rows)
+
+    async def race():
+        rebuild = asyncio.ensure_future(directory.refresh())
+        await asyncio.sleep(0)
+        writer = asyncio.ensure_future(directory.refresh())
+        await asyncio.sleep(0)
+        release.set()
+        await rebuild
+        return await writer
+
+    snapshot = asyncio.run(race())
+    assert len(reads) == 2 and snapshot.version == 2
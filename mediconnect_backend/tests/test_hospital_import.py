@@ -0,0 +1,28 @@
+import pytest
+
+from app.hospital_import import read_hospital_file, validate_hospitals, DUPLICATE_IN_FILE
+
+HEADER = b"name,address,latitude,longitude,departments,website,phone_no,current_status,image,timings\n"
+
+
+def test_validate_hospitals_keeps_valid_rows_and_reports_bad_ones() -> None:
+    contents = HEADER + (
+        b" City  Hospital ,Main St,10.5,20,\"Cardiology , Neurology,\",w,p,open,i,t\n"
+        b"City Hospital,Main St,10.5,20,Cardiology,w,p,open,i,t\n"
+        b",Nowhere,abc,500,ER,w,p,open,i,t\n"
+        b"General,Road,1,2,ER,w,p,open,i,t\n"
+    )
+    valid, report = validate_hospitals(read_hospital_file(contents, "hospitals.csv"))
+
+    assert list(valid.index) == [2, 5]
+    assert valid.loc[2, "name"] == "City Hospital"
+    assert valid.loc[2, "departments"] == "Cardiology,Neurology"
+    assert set(zip(report["row"], report["field"])) == {
+        (3, "name"), (4, "name"), (4, "latitude"), (4, "longitude")
+    }
+    assert report.loc[report["row"] == 3, "error"].item() == DUPLICATE_IN_FILE
+
+
+def test_validate_hospitals_rejects_missing_columns() -> None:
+    with pytest.raises(ValueError):
+        validate_hospitals(read_hospital_file(b"name,address\nA,B\n", "hospitals.csv"))
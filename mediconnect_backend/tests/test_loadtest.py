@@ -0,0 +1,50 @@
+import json
+import urllib.request
+
+from loadtest.report import Sample, build_report, compare
+from loadtest.runner import split_users
+from loadtest.seed import volumes
+from loadtest.stub_provider import StubProvider
+
+
+def test_report_percentiles_and_regressions():
+    samples = [Sample("booking:book", (i + 1) / 1000, i != 0) for i in range(100)]
+    base = build_report(samples, duration=10, meta={})
+    book = base["requests"]["booking:book"]
+    assert (book["count"], book["errors"], book["rps"]) == (100, 1, 10.0)
+    assert book["p50_ms"] == 50.5 and book["p99_ms"] == 99.0
+
+    slower = build_report([s._replace(elapsed=s.elapsed * 1.5) for s in samples], duration=10, meta={})
+    assert not compare(base, base)[0]["regressed"]
+    assert compare(base, slower)[0]["regressed"]
+    assert not compare(base, slower, tolerance=0.6)[0]["regressed"]
+
+
+def test_users_split_by_weight():
+    assert split_users(10, {"patient_booking": 60, "doctor_day_view": 25, "admin_dashboard": 5, "ai_checkers": 10}) == {
+        "patient_booking": 6, "doctor_day_view": 3, "ai_checkers": 1,
+    }
+
+
+def test_full_scale_volumes():
+    v = volumes(1.0)
+    assert (v.users, v.appointments, v.notifications, v.transactions) == (1_000_000, 10_000_000, 10_000_000, 5_000_000)
+    assert v.first_patient == v.admins + v.doctors + 1
+
+
+def test_stub_provider_answers_generate_content():
+    provider = StubProvider(latency=0, jitter=0).start()
+    try:
+        request = urllib.request.Request(
+            f"{provider.url}/v1beta/models/gemini-1.5-flash:generateContent",
+            data=json.dumps({"contents": [{"role": "user", "parts": [
+                {"text": "Provide calorie count and macronutrient breakdown in JSON."}
+            ]}]}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            body = json.load(response)
+    finally:
+        provider.stop()
+    answer = json.loads(body["candidates"][0]["content"]["parts"][0]["text"])
+    assert answer["calories"] == 420 and provider.requests == 1
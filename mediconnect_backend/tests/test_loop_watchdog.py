@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.loop_watchdog import EventLoopBlocked, LoopWatchdog
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+def test_blocking_call_is_reported_with_its_stack():
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+
+    async def run():
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+    asyncio.run(run())
+    reports = watchdog.drain()
+    assert len(reports) == 1
+    assert reports[0].location.endswith("test_loop_watchdog.py:blocking_handler")
+    assert "time.sleep(0.3)" in reports[0].stack
+
+
+def test_strict_mode_raises_once_per_block():
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+
+    async def run():
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await watchdog.stop()
+
+    asyncio.run(run())
+    with pytest.raises(EventLoopBlocked, match="blocking_handler"):
+        watchdog.raise_if_blocked()
+    watchdog.raise_if_blocked()
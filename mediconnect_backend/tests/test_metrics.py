@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+from prometheus_client.registry import REGISTRY
+
+from app.core.config import settings
+from app.core.metrics import observed_ai_call
+
+
+def test_metrics_are_labelled_by_route_template(client: TestClient):
+    client.get(f"{settings.API_V1_STR}/doctors/12345/availability", params={"from": "2030-01-07", "to": "2030-01-08"})
+    body = client.get("/metrics").text
+    assert f'route="{settings.API_V1_STR}/doctors/{{doctor_id}}/availability"' in body
+    assert "/doctors/12345/" not in body
+    assert "http_requests_in_flight" in body
+    assert "db_pool_connections" in body
+
+
+def test_observed_ai_call_runs_off_the_event_loop():
+    loop_thread = threading.get_ident()
+
+    @observed_ai_call("generate_content")
+    def call(*, model: str):
+        return threading.get_ident()
+
+    assert asyncio.run(call(model="test-model")) != loop_thread
+    assert REGISTRY.get_sample_value(
+        "ai_upstream_request_duration_seconds_count",
+        {"operation": "generate_content", "model": "test-model", "outcome": "success"},
+    ) == 1
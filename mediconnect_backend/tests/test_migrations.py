@@ -0,0 +1,39 @@
+import io
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def alembic_config(output=None):
+    return Config(os.path.join(BACKEND_DIR, "alembic.ini"), output_buffer=output)
+
+
+def test_migrations_have_a_single_head():
+    assert len(ScriptDirectory.from_config(alembic_config()).get_heads()) == 1
+
+
+def offline_upgrade_sql() -> str:
+    output = io.StringIO()
+    command.upgrade(alembic_config(output), "0001_baseline:head", sql=True)
+    return output.getvalue()
+
+
+def test_indexes_on_existing_tables_build_concurrently():
+    sql = offline_upgrade_sql()
+    for table in ("appointments", "notifications", "transactions", "users"):
+        assert f"CREATE INDEX ix_{table}" not in sql
+        assert f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}" in sql
+    assert "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_appointments_active_slot" in sql
+    assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_hospitals_earth ON hospitals USING gist" in sql
+
+
+def test_not_null_check_is_validated_outside_the_transaction_that_added_it():
+    sql = offline_upgrade_sql()
+    added = sql.index("ADD CONSTRAINT ck_notifications_created_at_not_null")
+    validated = sql.index("VALIDATE CONSTRAINT ck_notifications_created_at_not_null")
+    # no BEGIN opened since the last COMMIT before ADD CONSTRAINT: both run in autocommit
+    assert sql.rfind("BEGIN;", 0, validated) < sql.rfind("COMMIT;", 0, added)
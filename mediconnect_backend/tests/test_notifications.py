@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Update, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.crud_broadcast import crud_broadcast
+from app.crud.crud_notification import crud_notification
+from app.models import Broadcast
+
+
+def test_broadcast_requires_role_for_role_audience(client: TestClient, db: Session) -> None:
+    data = {"message": "Scheduled maintenance tonight", "target_audience": "ROLE"}
+    response = client.post(f"{settings.API_V1_STR}/admin/broadcast-notification", json=data)
+    assert response.status_code == 200
+    assert response.json()["success"] is False
+
+
+def test_broadcast_creates_single_row(client: TestClient, db: Session) -> None:
+    data = {"message": "Scheduled maintenance tonight", "target_audience": "ALL"}
+    response = client.post(f"{settings.API_V1_STR}/admin/broadcast-notification", json=data)
+    assert response.status_code == 200
+    broadcast = response.json()["data"]
+    assert broadcast["message"] == data["message"]
+    assert broadcast["target_audience"] == "ALL"
+
+
+def test_unread_count_is_integer(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/notifications/notifications/unread-count")
+    assert response.status_code == 200
+    assert isinstance(response.json()["data"], int)
+
+
+def test_bulk_mark_read_returns_affected_count(client: TestClient, db: Session) -> None:
+    response = client.post(f"{settings.API_V1_STR}/notifications/notifications/read", json={"ids": []})
+    assert response.status_code == 200
+    assert response.json()["data"]["affected"] == 0
+
+
+def test_mark_all_read_returns_affected_count(client: TestClient, db: Session) -> None:
+    response = client.post(f"{settings.API_V1_STR}/notifications/notifications/read-all")
+    assert response.status_code == 200
+    assert isinstance(response.json()["data"]["affected"], int)
+
+
+def test_broadcasts_are_bounded_by_sign_up_time() -> None:
+    sql = str(
+        select(Broadcast.id).where(crud_broadcast.audience_filter(7))
+        .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert "broadcasts.created_at >= (SELECT users.created_at" in sql
+    assert "users.id = 7" in sql
+
+
+class MarkReadSession:
+    """Just enough of AsyncSession for mark_as_read; `owner` is what the UPDATE returns."""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(
+            scalar_one_or_none=lambda: self.owner,
+            scalars=lambda: SimpleNamespace(first=lambda: None),
+        )
+
+    async def commit(self) -> None:
+        pass
+
+
+def test_mark_as_read_decrements_only_when_the_update_flips_the_row(monkeypatch) -> None:
+    adjusted = []
+
+    async def adjust(db, deltas):
+        adjusted.append(deltas)
+
+    monkeypatch.setattr(crud_notification, "adjust_unread_counts", adjust)
+
+    first = MarkReadSession(owner=7)
+    asyncio.run(crud_notification.mark_as_read(first, notification_id=1, user_id=7))
+    update_sql = str(first.statements[0].compile(dialect=postgresql.dialect()))
+    assert isinstance(first.statements[0], Update)
+    assert "notifications.is_read = false" in update_sql
+    assert "RETURNING notifications.user_id" in update_sql
+
+    # a concurrent call that lost the race finds the row already read
+    asyncio.run(crud_notification.mark_as_read(MarkReadSession(owner=None), notification_id=1, user_id=7))
+    assert adjusted == [{7: -1}]
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiler import Profiler, ProfilerBusy
+
+
+def busy_worker(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_collapses_sampled_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,), name="busy")
+    worker.start()
+    try:
+        collapsed = asyncio.run(Profiler().profile(0.2, 0.005))
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = collapsed.splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    busy = [line for line in lines if line.startswith("busy;")]
+    assert busy and "busy_worker (test_profiler.py" in busy[0]
+    assert any(line.startswith("event-loop;") for line in lines)
+
+
+def test_one_profile_at_a_time():
+    profiler = Profiler()
+
+    async def run_two():
+        first = asyncio.ensure_future(profiler.profile(0.1, 0.01))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfilerBusy):
+            await profiler.profile(0.1, 0.01)
+        await first
+
+    asyncio.run(run_two())
+
+
+def test_cancelled_profile_stops_the_sampler():
+    profiler = Profiler()
+
+    async def cancel_one():
+        task = asyncio.ensure_future(profiler.profile(30, 0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_one())
+    assert not profiler._running
+    assert not any(thread.name == "profiler" for thread in threading.enumerate())
+
+
+def test_profile_requires_admin(client: TestClient):
+    response = client.get(f"{settings.API_V1_STR}/admin/profile", params={"seconds": 1})
+    assert response.status_code == 401
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.query_counter import instrument, statement_shape, track_queries
+
+
+def test_repeated_statements_are_flagged():
+    engine = create_engine("sqlite://")
+    instrument(engine)
+    with engine.connect() as connection, track_queries() as stats:
+        for id in range(12):
+            connection.execute(text("SELECT :id"), {"id": id})
+        connection.execute(text("SELECT 1"))
+    assert stats.count == 13
+    problems = stats.problems(budget=10, repeat_threshold=10)
+    assert problems[0] == "13 SQL statements (budget 10)"
+    assert problems[1].startswith("possible N+1: 12x SELECT")
+    assert stats.problems(budget=20, repeat_threshold=20) == []
+
+
+def test_expanded_in_lists_share_a_shape():
+    assert statement_shape("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == statement_shape(
+        "SELECT * FROM t\n WHERE id IN (%(id_1)s)"
+    )
+
+
+def test_responses_report_query_totals(client: TestClient):
+    response = client.get(f"{settings.API_V1_STR}/doctors/search")
+    assert int(response.headers["x-db-queries"]) >= 1
+    assert float(response.headers["x-db-time"]) >= 0
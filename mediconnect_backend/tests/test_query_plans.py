@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.crud.crud_appointment import appointment as crud_appointment
+from app.db.explain import Explain
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def assert_uses_index(db, statement, index_name):
+    # an empty test table is always cheapest to scan, so take that option away
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = db.execute(Explain(statement)).scalar_one()[0]["Plan"]
+    nodes = list(plan_nodes(plan))
+    assert not [
+        node for node in nodes
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "appointments"
+    ]
+    assert index_name in {node.get("Index Name") for node in nodes}
+
+
+def test_doctor_range_query_uses_index(db):
+    statement = crud_appointment.by_doctor_query(
+        doctor_id=1, start_date="2026-01-01", end_date="2026-01-31"
+    ).limit(100)
+    assert_uses_index(db, statement, "ix_appointments_doctor_date_time")
+
+
+def test_patient_status_query_uses_index(db):
+    statement = crud_appointment.by_patient_query(patient_id=1, status="UPCOMING").limit(100)
+    assert_uses_index(db, statement, "ix_appointments_patient_status")
+
+
+def test_due_reminders_query_uses_partial_index(db):
+    now = datetime(2026, 1, 1, 12, 0)
+    statement = crud_appointment.due_reminders_query(start=now, end=now + timedelta(hours=24))
+    assert_uses_index(db, statement, "ix_appointments_reminder_due")
@@ -0,0 +1,108 @@
+import asyncio
+from collections import defaultdict
+from types import SimpleNamespace
+
+import pytest
+
+from app.crud.crud_review import crud_review
+from app.models.doctor import Doctor
+from app.models.review import Review
+from app.schemas.review import ReviewCreate, ReviewUpdate
+
+
+def test_average_rating_reads_totals() -> None:
+    assert Doctor(rating_sum=9, rating_count=2).average_rating == 4.5
+    assert Doctor(rating_sum=0, rating_count=0).average_rating == 0.0
+
+
+class ReviewSession:
+    """Just enough of AsyncSession for CRUDReview's writes; `reviews` is the table."""
+
+    def __init__(self):
+        self.reviews = {}
+
+    def add(self, obj) -> None:
+        if obj.id is None:
+            obj.id = len(self.reviews) + 1
+        self.reviews[obj.id] = obj
+
+    async def execute(self, statement):
+        review_id = statement.whereclause.right.value
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: self.reviews.get(review_id)))
+
+    async def delete(self, obj) -> None:
+        del self.reviews[obj.id]
+
+    async def commit(self) -> None:
+        pass
+
+    async def refresh(self, obj) -> None:
+        pass
+
+
+@pytest.fixture
+def totals(monkeypatch):
+    """Doctor rating totals as CRUDReview maintains them, keyed by doctor id."""
+    kept = defaultdict(lambda: [0, 0])
+
+    async def adjust(db, *, doctor_id, rating_delta, count_delta):
+        kept[doctor_id][0] += rating_delta
+        kept[doctor_id][1] += count_delta
+
+    monkeypatch.setattr(crud_review, "_adjust_doctor_rating", adjust)
+    return kept
+
+
+def recomputed(session: ReviewSession):
+    expected = defaultdict(lambda: [0, 0])
+    for review in session.reviews.values():
+        expected[review.doctor_id][0] += review.rating
+        expected[review.doctor_id][1] += 1
+    return expected
+
+
+def in_step(totals, session: ReviewSession) -> bool:
+    expected = recomputed(session)
+    return all(totals[d] == expected[d] for d in set(totals) | set(expected))
+
+
+def write(coro):
+    return asyncio.run(coro)
+
+
+def test_create_and_delete_keep_totals_in_step(totals) -> None:
+    session = ReviewSession()
+    first = write(crud_review.create(session, obj_in=ReviewCreate(rating=4, doctor_id=1, patient_id=1)))
+    write(crud_review.create(session, obj_in=ReviewCreate(rating=2, doctor_id=1, patient_id=2)))
+    assert totals[1] == [6, 2]
+    assert in_step(totals, session)
+
+    write(crud_review.remove(session, id=first.id))
+    assert totals[1] == [2, 1]
+    assert in_step(totals, session)
+
+
+def test_rating_change_keeps_totals_in_step(totals) -> None:
+    session = ReviewSession()
+    review = write(crud_review.create(session, obj_in=ReviewCreate(rating=4, doctor_id=1, patient_id=1)))
+    write(crud_review.update(session, db_obj=review, obj_in=ReviewUpdate(rating=1)))
+    assert totals[1] == [1, 1]
+    assert in_step(totals, session)
+
+
+def test_doctor_change_moves_the_rating(totals) -> None:
+    session = ReviewSession()
+    review = write(crud_review.create(session, obj_in=ReviewCreate(rating=5, doctor_id=1, patient_id=1)))
+    write(crud_review.update(session, db_obj=review, obj_in=ReviewUpdate(doctor_id=2, rating=3)))
+    assert totals[1] == [0, 0]
+    assert totals[2] == [3, 1]
+    assert in_step(totals, session)
+
+
+def test_explicit_nulls_leave_rating_and_doctor_unchanged(totals) -> None:
+    session = ReviewSession()
+    review = write(crud_review.create(session, obj_in=ReviewCreate(rating=4, doctor_id=1, patient_id=1)))
+    write(crud_review.update(session, db_obj=review, obj_in={"rating": None, "doctor_id": None, "comment": "ok"}))
+    assert (review.rating, review.doctor_id, review.comment) == (4, 1, "ok")
+    assert totals[1] == [4, 1]
+    assert in_step(totals, session)
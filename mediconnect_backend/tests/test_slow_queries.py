@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.slow_queries import SlowQueryLog, is_explainable, parameter_shapes
+
+
+def test_slow_statements_keep_parameter_shapes_not_values():
+    log = SlowQueryLog(threshold_ms=0, sample_rate=1.0, size=3)
+    engine = create_engine("sqlite://")
+    log.instrument(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT :email, :age"), {"email": "jane@example.com", "age": 42})
+        connection.execute(text("SELECT 2"))
+        connection.execute(text("SELECT 3"))
+
+    entries = log.recent(10)
+    assert [entry["statement"] for entry in entries] == ["SELECT 3", "SELECT 2", "SELECT ?, ?"]
+    assert entries[2]["parameters"] == ["str[16]", "int"]
+    assert entries[0]["route"] is None and entries[0]["plan"] is None
+
+    shapes = parameter_shapes({"email": "jane@example.com", "ids": [1, 2, None]}, False)
+    assert shapes == {"email": "str[16]", "ids": "list[3]<int|null>"}
+    assert parameter_shapes([("a",), ("bb",)], True) == {"rows": 2, "row": ["str[1]"]}
+
+
+def test_fast_statements_are_not_logged():
+    log = SlowQueryLog(threshold_ms=10_000, sample_rate=1.0, size=10)
+    engine = create_engine("sqlite://")
+    log.instrument(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert log.recent(10) == []
+
+
+def test_only_reads_are_explained():
+    assert is_explainable("\n  select * from appointments")
+    assert not is_explainable("UPDATE appointments SET status = 'CANCELLED'")
+    assert not is_explainable("WITH d AS (DELETE FROM notifications RETURNING id) SELECT count(*) FROM d")
+    assert not is_explainable("SELECT * FROM appointments WHERE id = $1 FOR UPDATE")
+    assert not is_explainable("SELECT * FROM appointments FOR NO KEY UPDATE SKIP LOCKED")
+    assert not is_explainable("SELECT id FROM users for share")
+    assert not is_explainable("SELECT * INTO archived FROM notifications")
+    assert not is_explainable("SELECT nextval('users_id_seq')")
+    assert not is_explainable("SELECT pg_advisory_lock(42)")
+
+
+def test_slow_queries_require_admin(client: TestClient):
+    response = client.get(f"{settings.API_V1_STR}/admin/slow-queries")
+    assert response.status_code == 401
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.crud_transaction import crud_transaction
+from app.models import RevenueDaily
+
+
+def test_total_revenue(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/transactions/revenue")
+    assert response.status_code == 200
+    assert isinstance(response.json()["data"], float)
+
+
+def test_revenue_by_month_without_realtime_tail(client: TestClient, db: Session) -> None:
+    response = client.get(f"{settings.API_V1_STR}/transactions/revenue/by-month", params={"realtime": False})
+    assert response.status_code == 200
+    assert isinstance(response.json()["data"], list)
+
+
+class RecordingSession:
+    """Just enough of AsyncSession for CRUDTransaction.create, with a watermark in place."""
+
+    def __init__(self, rolled_through: date):
+        self.rolled_through = rolled_through
+        self.statements = []
+
+    def add(self, obj) -> None:
+        self.added = obj
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar_one_or_none=lambda: self.rolled_through)
+
+    async def commit(self) -> None:
+        pass
+
+    async def refresh(self, obj) -> None:
+        pass
+
+
+class TransactionRow(BaseModel):
+    user_id: int
+    amount: float
+    timestamp: datetime
+
+
+def test_backdated_insert_updates_its_rolled_up_day() -> None:
+    session = RecordingSession(rolled_through=date(2026, 3, 10))
+    row = TransactionRow(user_id=1, amount=250.0, timestamp=datetime(2026, 3, 2, 14, 30))
+    created = asyncio.run(crud_transaction.create(session, obj_in=row))
+
+    assert created.timestamp == datetime(2026, 3, 2, 14, 30)
+    upserts = [s for s in session.statements if isinstance(s, Insert) and s.table.name == RevenueDaily.__tablename__]
+    assert len(upserts) == 1
+    params = upserts[0].compile(dialect=postgresql.dialect()).params
+    assert (params["day"], params["total_revenue"], params["transaction_count"]) == (date(2026, 3, 2), 250.0, 1)
+
+
+def test_insert_after_the_watermark_leaves_the_rollup_alone() -> None:
+    session = RecordingSession(rolled_through=date(2026, 3, 10))
+    row = TransactionRow(user_id=1, amount=250.0, timestamp=datetime(2026, 3, 10, 9, 0))
+    asyncio.run(crud_transaction.create(session, obj_in=row))
+    assert not [s for s in session.statements if isinstance(s, Insert)]